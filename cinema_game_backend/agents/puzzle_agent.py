@@ -6,10 +6,29 @@ No LLM needed here — pure TMDb API calls.
 
 import random
 import asyncio
+import inspect
+import logging
 from langsmith import traceable
 from art_graph.cinema_data_providers.filters import MovieFilter
 from art_graph.cinema_data_providers.tmdb.client import TMDbClient
-from ..config import DIFFICULTY_HOPS, MIN_ACTOR_POPULARITY, MOVIE_FILTERS
+from ..config import (
+    DIFFICULTY_HOPS,
+    END_ACTOR_DETAILS_CONCURRENCY,
+    MAX_PUZZLE_ATTEMPTS,
+    MIN_ACTOR_POPULARITY,
+    MOVIE_FILTERS,
+    PATH_SEARCH_ON_TMDB,
+    PATH_SEARCH_TMDB_MAX_FRONTIER,
+    POPULAR_PEOPLE_PAGES,
+    PUZZLE_ATTEMPT_FANOUT,
+    PUZZLE_ATTEMPT_TMDB_CONCURRENCY,
+    PUZZLE_WALK_MOVIES_PER_ACTOR,
+)
+from ..graph_snapshot import GraphSnapshot, generate_puzzle_from_snapshot
+from ..pathfinding import MIN_FALLBACK_MOVES, TMDbGraph, min_moves_between
+from ..popularity_cache import PopularityCache
+
+logger = logging.getLogger(__name__)
 
 
 @traceable(run_type="tool", name="shortcut_check")
@@ -58,16 +77,48 @@ async def _has_short_path(
 
 
 @traceable(run_type="tool", name="pick_start_actor")
-async def _pick_popular_actor(tmdb: TMDbClient, min_popularity: float):
+async def _pick_popular_actor(
+    tmdb: TMDbClient,
+    min_popularity: float,
+    popularity_cache: PopularityCache | None = None,
+):
     """Pick a random actor from TMDb's popular people list above a popularity threshold."""
-    page = random.randint(1, 5)
+    page = random.randint(1, POPULAR_PEOPLE_PAGES)
     people = await tmdb.get_popular_people(page=page)
+    if popularity_cache is not None:
+        popularity_cache.record_people(people)
     eligible = [p for p in people if p.popularity >= min_popularity]
     if not eligible:
         eligible = people
     return random.choice(eligible)
 
 
+async def _candidate_popularity(
+    tmdb: TMDbClient, candidates, popularity_cache: PopularityCache | None = None
+) -> list[float]:
+    """TMDb popularity of each candidate, in order.
+
+    Cached scores are used as-is; the rest are fetched concurrently, at most
+    END_ACTOR_DETAILS_CONCURRENCY at a time, and added to the cache.
+    """
+    semaphore = asyncio.Semaphore(END_ACTOR_DETAILS_CONCURRENCY)
+
+    async def popularity(candidate) -> float:
+        if popularity_cache is not None:
+            cached = popularity_cache.get(candidate.id)
+            if cached is not None:
+                return cached
+        async with semaphore:
+            person = await tmdb.get_person_details(candidate.id)
+        if person is None:
+            return 0
+        if popularity_cache is not None:
+            popularity_cache.put(person.id, person.popularity)
+        return person.popularity
+
+    return list(await asyncio.gather(*(popularity(c) for c in candidates)))
+
+
 @traceable(run_type="chain", name="random_walk")
 async def _random_walk(
     tmdb: TMDbClient,
@@ -76,6 +127,7 @@ async def _random_walk(
     min_popularity: float,
     no_repeat_movies: bool = False,
     movie_filter: MovieFilter | None = None,
+    popularity_cache: PopularityCache | None = None,
 ) -> list[dict] | None:
     """
     Build a path of length `hops` via random walk:
@@ -86,6 +138,7 @@ async def _random_walk(
 
     When no_repeat_movies=True, the same movie cannot appear twice in the path.
     When movie_filter is provided, only movies passing the filter are considered.
+    popularity_cache supplies (and collects) end-actor popularity scores.
     """
     path = [
         {
@@ -100,7 +153,9 @@ async def _random_walk(
 
     for hop in range(hops):
         # Get movies for current actor, sorted by popularity
-        movies = await tmdb.get_person_movies(current_actor_id, limit=20)
+        movies = await tmdb.get_person_movies(
+            current_actor_id, limit=PUZZLE_WALK_MOVIES_PER_ACTOR
+        )
         if movie_filter:
             filtered = [m for m in movies if movie_filter.accepts(m)]
             movies = filtered or movies
@@ -135,13 +190,9 @@ async def _random_walk(
         is_last_hop = hop == hops - 1
         if is_last_hop:
             # Prefer end actor above the popularity floor; fall back to most popular available.
-            scored = []
-            for candidate in cast[:20]:
-                person = await tmdb.get_person_details(candidate.id)
-                pop = person.popularity if person else 0
-                scored.append((candidate, pop))
-                if len(scored) >= 10:
-                    break
+            candidates = cast[:10]
+            popularity = await _candidate_popularity(tmdb, candidates, popularity_cache)
+            scored = list(zip(candidates, popularity))
 
             eligible = [c for c, pop in scored if pop >= min_popularity]
             if eligible:
@@ -167,29 +218,119 @@ async def _random_walk(
     return path
 
 
+class _ConcurrencyLimitedTMDb:
+    """Proxy for a TMDb client that caps how many calls run at once."""
+
+    def __init__(self, tmdb: TMDbClient, limit: int):
+        self._tmdb = tmdb
+        self._semaphore = asyncio.Semaphore(limit)
+
+    def __getattr__(self, name):
+        attr = getattr(self._tmdb, name)
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+
+        async def limited(*args, **kwargs):
+            async with self._semaphore:
+                return await attr(*args, **kwargs)
+
+        return limited
+
+
+async def _first_successful_attempt(
+    attempt, fanout: int, min_moves_floor: int
+) -> tuple[list[dict], int] | None:
+    """Run up to MAX_PUZZLE_ATTEMPTS attempts, fanout at a time.
+
+    Each attempt returns (path, min_moves) or None. Returns the first result
+    whose min_moves reaches min_moves_floor and cancels the attempts still
+    running; once every attempt has finished without one, returns the result
+    with the most moves, or None if there is none. An exception from any
+    attempt propagates, as it would from a sequential retry loop.
+    """
+    pending: set[asyncio.Task] = set()
+    launched = 0
+    best = None
+    try:
+        while launched < MAX_PUZZLE_ATTEMPTS or pending:
+            while launched < MAX_PUZZLE_ATTEMPTS and len(pending) < fanout:
+                pending.add(asyncio.ensure_future(attempt()))
+                launched += 1
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                result = task.result()
+                if not result:
+                    continue
+                if result[1] >= min_moves_floor:
+                    return result
+                if best is None or result[1] > best[1]:
+                    best = result
+        return best
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
 @traceable(run_type="chain", name="generate_puzzle")
-async def generate_puzzle(tmdb: TMDbClient, difficulty: str = "medium") -> dict:
+async def generate_puzzle(
+    tmdb: TMDbClient,
+    difficulty: str = "medium",
+    popularity_cache: PopularityCache | None = None,
+    fanout: int = PUZZLE_ATTEMPT_FANOUT,
+    snapshot: GraphSnapshot | None = None,
+) -> dict:
     """
     Generate a puzzle for the given difficulty tier.
     Returns: start_actor, end_actor, difficulty, min_moves, known_solution.
 
+    Pass a shared popularity_cache to skip TMDb person lookups for end-actor
+    candidates already seen by earlier puzzles.
+
+    Up to MAX_PUZZLE_ATTEMPTS walks are tried. With fanout > 1, that many run
+    at once and the first to pass the distance check wins; the others are
+    cancelled.
+
+    Walks whose two actors share a movie are always rejected. With
+    PATH_SEARCH_ON_TMDB, each walk also gets a bidirectional shortest-path
+    search over TMDb: min_moves is the real distance, and walks below the
+    difficulty's DIFFICULTY_HOPS floor are retried (the most distant one is
+    used if none reaches it). Otherwise min_moves is the walk length.
+
+    With a local graph snapshot the walk and the distance check run
+    in-process against it instead, falling back to TMDb only if the snapshot
+    cannot produce a puzzle.
+
     Hop counts:
       easy:   exactly 2 hops, no movie repeated
       medium: 3-5 hops (random)
       hard:   6-8 hops (random)
     """
+    if snapshot is not None:
+        try:
+            return await generate_puzzle_from_snapshot(snapshot, difficulty)
+        except RuntimeError:
+            logger.warning(
+                "Graph snapshot could not produce a %s puzzle; walking TMDb",
+                difficulty,
+                exc_info=True,
+            )
+
     hop_range = DIFFICULTY_HOPS.get(difficulty, (3, 5))
     hops = random.randint(*hop_range)
     min_pop = MIN_ACTOR_POPULARITY.get(difficulty, 4)
     no_repeat = difficulty == "easy"
     movie_filter = MOVIE_FILTERS.get(difficulty)
-    # Reject only trivially easy puzzles where the two actors share a direct movie.
-    # The 2-hop check was too aggressive — popular actors are almost always 2 hops
-    # apart, causing medium/hard generation to exhaust all retries.
+    # Without the path search, reject only trivially easy puzzles where the two
+    # actors share a direct movie. The 2-hop check was too aggressive — popular
+    # actors are almost always 2 hops apart, causing medium/hard generation to
+    # exhaust all retries.
     shortcut_threshold = 1
 
-    for _ in range(15):
-        start_actor = await _pick_popular_actor(tmdb, min_pop)
+    async def attempt() -> tuple[list[dict], int] | None:
+        start_actor = await _pick_popular_actor(tmdb, min_pop, popularity_cache)
         path = await _random_walk(
             tmdb,
             start_actor,
@@ -197,18 +338,37 @@ async def generate_puzzle(tmdb: TMDbClient, difficulty: str = "medium") -> dict:
             min_pop,
             no_repeat_movies=no_repeat,
             movie_filter=movie_filter,
+            popularity_cache=popularity_cache,
         )
         if not path or len(path) < 3:
-            continue
+            return None
+        if PATH_SEARCH_ON_TMDB:
+            min_moves = await min_moves_between(
+                TMDbGraph(tmdb),
+                path[0]["id"],
+                path[-1]["id"],
+                hops,
+                max_frontier=PATH_SEARCH_TMDB_MAX_FRONTIER,
+            )
+            return (path, min_moves) if min_moves >= MIN_FALLBACK_MOVES else None
         if await _has_short_path(
             tmdb, path[0]["id"], path[-1]["id"], shortcut_threshold
         ):
-            continue
-        break
-    else:
+            return None
+        return path, hops
+
+    if fanout > 1:
+        # Every attempt's TMDb calls draw on one shared budget, so K walks
+        # cost no more concurrent requests than PUZZLE_ATTEMPT_TMDB_CONCURRENCY.
+        tmdb = _ConcurrencyLimitedTMDb(tmdb, PUZZLE_ATTEMPT_TMDB_CONCURRENCY)
+    result = await _first_successful_attempt(attempt, max(fanout, 1), hop_range[0])
+
+    if not result:
         raise RuntimeError(
-            f"Failed to generate a valid {difficulty} puzzle after 15 attempts."
+            f"Failed to generate a valid {difficulty} puzzle "
+            f"after {MAX_PUZZLE_ATTEMPTS} attempts."
         )
+    path, min_moves = result
 
     start = path[0]
     end = path[-1]
@@ -225,6 +385,6 @@ async def generate_puzzle(tmdb: TMDbClient, difficulty: str = "medium") -> dict:
             "profile_url": end.get("profile_url"),
         },
         "difficulty": difficulty,
-        "min_moves": hops,
+        "min_moves": min_moves,
         "known_solution": path,
     }
@@ -6,13 +6,25 @@ call (via reusable-llm-provider) when fuzzy matching cannot resolve a name,
 e.g. nicknames like "Larry" for "Laurence".
 """
 
+import asyncio
 import logging
+from functools import lru_cache
 from langsmith import traceable
 from langsmith.run_helpers import get_current_run_tree
 from art_graph.cinema_data_providers.tmdb.client import TMDbClient
-from ..config import MAX_MOVIE_SEARCH_CANDIDATES
-from ..matching import find_actor_in_cast, ActorMatch
+from ..config import (
+    CANDIDATE_CAST_CONCURRENCY,
+    CAST_INDEX_CACHE_SIZE,
+    CONCURRENT_CANDIDATE_FETCH,
+    FILMOGRAPHY_MATCH_MOVIES,
+    LLM_TIMEOUT_SECONDS,
+    MAX_MOVIE_SEARCH_CANDIDATES,
+)
+from ..database import run_db
+from ..llm import invoke_json_async
+from ..matching import CastIndex, ActorMatch, match_title
 from ..models.game import Confidence, ValidationResult
+from ..name_match_cache import NameMatchCache
 
 logger = logging.getLogger(__name__)
 
@@ -32,63 +44,170 @@ LLM_NAME_MATCH_PROMPT = (
 )
 
 
-@traceable(run_type="tool", name="llm_name_match")
-def _llm_name_match(llm, query: str, cast_names: list[str]) -> ActorMatch | None:
-    """Ask the LLM to resolve a name that fuzzy matching could not."""
-    prompt = LLM_NAME_MATCH_PROMPT.format(
-        cast_names="\n".join(f"- {n}" for n in cast_names),
-        query=query,
-    )
+LLM_BATCH_NAME_MATCH_PROMPT = (
+    "You are matching player-typed actor names against a movie cast list.\n"
+    "The player is playing a cinema connections game where they name actors\n"
+    "and movies to build a chain. They may use nicknames, abbreviations,\n"
+    "or informal names (e.g. 'Larry' for 'Laurence', 'Dick' for 'Richard').\n\n"
+    "Cast list:\n{cast_names}\n\n"
+    "Player typed:\n{queries}\n\n"
+    "For each numbered name, give the cast member the player clearly means,\n"
+    "or null if no cast member matches. Return a JSON object:\n"
+    '  {{"matches": {{"1": "Exact Name From Cast List", "2": null}}}}\n\n'
+    "Return ONLY the JSON object, nothing else."
+)
+
+# Returned by _invoke_llm when the call failed or timed out, so the caller can
+# tell "no answer" (not cached) from an answer of "no match" (cached).
+_LLM_FAILED = object()
+
+
+async def _invoke_llm(llm, prompt: str, queries: list[str]):
+    """invoke_json off the event loop, or _LLM_FAILED on error or timeout."""
     try:
-        result = llm.invoke_json(prompt)
+        return await invoke_json_async(llm, prompt, timeout=LLM_TIMEOUT_SECONDS)
+    except TimeoutError:
+        logger.warning(
+            "LLM name match for %r timed out after %ss", queries, LLM_TIMEOUT_SECONDS
+        )
+        rt = get_current_run_tree()
+        if rt:
+            rt.metadata["llm_timed_out"] = True
     except Exception:
-        logger.warning("LLM name match failed for %r", query, exc_info=True)
-        return None
+        logger.warning("LLM name match failed for %r", queries, exc_info=True)
+    return _LLM_FAILED
 
-    matched = result.get("matched_name") if isinstance(result, dict) else None
-    if matched and matched in cast_names:
-        return ActorMatch(matched_name=matched)
-    return None
 
+@traceable(run_type="tool", name="llm_name_match")
+async def _llm_name_match(
+    llm,
+    queries: list[str],
+    cast_names: list[str],
+    name_cache: NameMatchCache | None = None,
+) -> dict[str, ActorMatch | None]:
+    """Ask the LLM to resolve names that fuzzy matching could not.
 
-@traceable(run_type="tool", name="resolve_actor")
-def _resolve_actor(query: str, cast_names: list[str], llm=None) -> ActorMatch | None:
-    """Try fuzzy matching first, then LLM fallback if available."""
-    match = find_actor_in_cast(query, cast_names)
-    if match is not None:
-        return match
+    All queries are resolved against the same cast in a single LLM call (a
+    lone query uses the simpler single-name prompt). The call runs off the
+    event loop and is abandoned after LLM_TIMEOUT_SECONDS, in which case the
+    names are treated as unresolved. Only names that appear verbatim in
+    cast_names are accepted.
+
+    With a name_cache, a previous answer for the same query and cast (including
+    "no match") is reused without asking the LLM. Failed or timed-out LLM
+    calls are not cached.
+    """
+    answers: dict[str, str | None] = {}
+    pending = list(dict.fromkeys(queries))
+    if name_cache is not None:
+        for query in list(pending):
+            cached = await run_db(name_cache.lookup, query, cast_names)
+            if cached is not None:
+                answers[query] = cached.matched_name
+                pending.remove(query)
+        rt = get_current_run_tree()
+        if rt:
+            rt.metadata["name_cache_hit"] = not pending
+
+    if pending:
+        cast_list = "\n".join(f"- {n}" for n in cast_names)
+        if len(pending) == 1:
+            prompt = LLM_NAME_MATCH_PROMPT.format(
+                cast_names=cast_list, query=pending[0]
+            )
+        else:
+            prompt = LLM_BATCH_NAME_MATCH_PROMPT.format(
+                cast_names=cast_list,
+                queries="\n".join(f'{i}. "{q}"' for i, q in enumerate(pending, 1)),
+            )
+        result = await _invoke_llm(llm, prompt, pending)
+        if result is not _LLM_FAILED:
+            if not isinstance(result, dict):
+                result = {}
+            if len(pending) == 1:
+                matched = {pending[0]: result.get("matched_name")}
+            else:
+                by_number = result.get("matches")
+                if not isinstance(by_number, dict):
+                    by_number = {}
+                matched = {q: by_number.get(str(i)) for i, q in enumerate(pending, 1)}
+            for query, name in matched.items():
+                if not (isinstance(name, str) and name in cast_names):
+                    name = None
+                answers[query] = name
+                if name_cache is not None:
+                    await run_db(name_cache.store, query, cast_names, name)
+
+    return {
+        q: ActorMatch(matched_name=answers[q]) if answers.get(q) else None
+        for q in queries
+    }
+
+
+@lru_cache(maxsize=CAST_INDEX_CACHE_SIZE)
+def _cast_index(cast_names: tuple[str, ...]) -> CastIndex:
+    """CastIndex for a cast, shared by every lookup against the same names."""
+    return CastIndex(cast_names)
+
+
+@traceable(run_type="tool", name="resolve_actors")
+async def _resolve_actors(
+    queries: list[str],
+    index: CastIndex,
+    llm=None,
+    name_cache: NameMatchCache | None = None,
+) -> list[ActorMatch | None]:
+    """Fuzzy-match each query, then send the misses to the LLM in one call."""
+    matches = [index.match(q) for q in queries]
+    unresolved = [q for q, m in zip(queries, matches) if m is None]
+    if not unresolved:
+        return matches
     if llm is not None:
-        return _llm_name_match(llm, query, cast_names)
+        llm_matches = await _llm_name_match(llm, unresolved, index.names, name_cache)
+        return [
+            m if m is not None else llm_matches[q] for q, m in zip(queries, matches)
+        ]
     logger.warning(
-        "Fuzzy matching failed for %r and no LLM fallback is available", query
+        "Fuzzy matching failed for %r and no LLM fallback is available", unresolved
     )
     rt = get_current_run_tree()
     if rt:
         rt.metadata["llm_fallback_skipped"] = True
-        rt.metadata["unresolved_query"] = query
-    return None
+        rt.metadata["unresolved_queries"] = unresolved
+    return matches
 
 
 @traceable(run_type="tool", name="check_movie_candidate")
 async def _check_candidate(
-    tmdb: TMDbClient, movie, from_actor: str, from_actor_id: int, to_actor: str, llm
+    tmdb: TMDbClient,
+    movie,
+    from_actor: str,
+    from_actor_id: int,
+    to_actor: str,
+    llm,
+    cast=None,
+    name_cache: NameMatchCache | None = None,
 ):
     """Fetch a candidate movie's cast and try to resolve both actors against it.
 
     from_actor is anchored by TMDb id: a fuzzy name match is only accepted if
     some cast member with that exact matched name also has the anchored id,
     since a cast member who merely shares a name is a different person.
+
+    Pass cast when it has already been fetched (see _walk_candidates_concurrently).
     """
-    cast = await tmdb.get_movie_cast(movie.id)
-    cast_names = [c.name for c in cast]
+    if cast is None:
+        cast = await tmdb.get_movie_cast(movie.id)
+    index = _cast_index(tuple(c.name for c in cast))
 
-    from_match = _resolve_actor(from_actor, cast_names, llm)
+    from_match, to_match = await _resolve_actors(
+        [from_actor, to_actor], index, llm, name_cache
+    )
     if from_match is not None and not any(
         c.id == from_actor_id and c.name == from_match.matched_name for c in cast
     ):
         from_match = None
 
-    to_match = _resolve_actor(to_actor, cast_names, llm)
     to_member = None
     if to_match is not None:
         to_member = next(c for c in cast if c.name == to_match.matched_name)
@@ -96,6 +215,68 @@ async def _check_candidate(
     return from_match, to_match, to_member
 
 
+async def _walk_candidates_concurrently(
+    tmdb: TMDbClient,
+    candidates,
+    from_actor,
+    from_actor_id,
+    to_actor,
+    llm,
+    name_cache: NameMatchCache | None = None,
+):
+    """Check candidates in order, with their casts fetched concurrently.
+
+    Returns the first matching (movie, from_match, to_match, to_member) in
+    TMDb's rank order, or None. Cast fetches still outstanding once a winner
+    is known are cancelled.
+    """
+    semaphore = asyncio.Semaphore(CANDIDATE_CAST_CONCURRENCY)
+
+    async def fetch_cast(movie):
+        async with semaphore:
+            return await tmdb.get_movie_cast(movie.id)
+
+    fetches = [asyncio.ensure_future(fetch_cast(c)) for c in candidates]
+    try:
+        for candidate, fetch in zip(candidates, fetches):
+            cast = await fetch
+            from_match, to_match, to_member = await _check_candidate(
+                tmdb,
+                candidate,
+                from_actor,
+                from_actor_id,
+                to_actor,
+                llm,
+                cast=cast,
+                name_cache=name_cache,
+            )
+            if from_match is not None and to_match is not None:
+                return candidate, from_match, to_match, to_member
+        return None
+    finally:
+        for fetch in fetches:
+            fetch.cancel()
+        # Reap cancelled/failed fetches so none is left unretrieved.
+        await asyncio.gather(*fetches, return_exceptions=True)
+
+
+async def _from_actor_filmography(tmdb: TMDbClient, from_actor_id: int) -> list:
+    """The from-actor's top films, or [] if disabled or the lookup fails.
+
+    Only an optimisation: the search path still runs whenever this misses.
+    """
+    if not FILMOGRAPHY_MATCH_MOVIES or not from_actor_id:
+        return []
+    try:
+        movies = await tmdb.get_person_movies(
+            from_actor_id, limit=FILMOGRAPHY_MATCH_MOVIES
+        )
+    except Exception:
+        logger.warning("Filmography lookup for %s failed", from_actor_id, exc_info=True)
+        return []
+    return list(movies or [])
+
+
 @traceable(run_type="chain", name="validate_move")
 async def validate_move(
     tmdb: TMDbClient,
@@ -105,39 +286,94 @@ async def validate_move(
     *,
     from_actor_id: int,
     llm=None,
+    concurrent_candidates: bool = CONCURRENT_CANDIDATE_FETCH,
+    name_cache: NameMatchCache | None = None,
 ) -> ValidationResult:
     """
     Verify that from_actor and to_actor both appeared in a movie titled movie_title.
 
-    1. Search TMDb for movies matching the title (TMDb handles fuzzy title
-       matching and ranks results by its own relevance/recency signal).
-    2. Check the top-ranked candidate's cast for both actors first. from_actor
+    1. Match the title against from_actor's filmography (usually cached). If
+       one of their films matches, check its cast first; if both actors are
+       in it, the move is valid without any TMDb search.
+    2. Otherwise search TMDb for movies matching the title (TMDb handles fuzzy
+       title matching and ranks results by its own relevance/recency signal).
+       Candidates in from_actor's filmography are moved ahead of the rest,
+       which otherwise keep TMDb's order.
+    3. Check the first candidate's cast for both actors first. from_actor
        is anchored by TMDb id, not name: a cast member who merely shares
        from_actor's name is not accepted unless their id also matches.
-    3. If a title is ambiguous (shared by multiple films) and the top-ranked
+    4. If a title is ambiguous (shared by multiple films) and the first
        candidate doesn't have both actors, walk the remaining candidates in
-       TMDb's order, up to MAX_MOVIE_SEARCH_CANDIDATES, stopping at the first
-       one that does.
-    4. If none of the checked candidates have both actors, report the
-       failure against the top-ranked candidate, as before.
+       order, up to MAX_MOVIE_SEARCH_CANDIDATES, stopping at the first one
+       that does.
+       With concurrent_candidates, the remaining candidates' casts are
+       fetched concurrently but still judged in order.
+    5. If none of the checked candidates have both actors, report the
+       failure against the film matched in step 1, or else the first
+       candidate.
     """
+    filmography = await _from_actor_filmography(tmdb, from_actor_id)
+    guess_index = match_title(movie_title, [m.title for m in filmography])
+    guess = filmography[guess_index] if guess_index is not None else None
+    rt = get_current_run_tree()
+    if rt:
+        rt.metadata["filmography_match"] = guess is not None
+    if guess is not None:
+        guess_check = await _check_candidate(
+            tmdb,
+            guess,
+            from_actor,
+            from_actor_id,
+            to_actor,
+            llm,
+            name_cache=name_cache,
+        )
+        if guess_check[0] is not None and guess_check[1] is not None:
+            return _move_result(guess, *guess_check, from_actor, to_actor)
+
     candidates = await tmdb.search_movies(movie_title)
+    if guess is not None:
+        candidates = [c for c in candidates if c.id != guess.id]
     if not candidates:
+        if guess is not None:
+            return _move_result(guess, *guess_check, from_actor, to_actor)
         return ValidationResult(
             valid=False,
             explanation=f"Movie '{movie_title}' not found on TMDb.",
             confidence=Confidence.high,
         )
+    in_filmography = {m.id for m in filmography}
+    # sorted(), not sort(): the search result may be a cached list shared
+    # with other callers.
+    candidates = sorted(candidates, key=lambda c: c.id not in in_filmography)
 
     movie = candidates[0]
     from_match, to_match, to_member = await _check_candidate(
-        tmdb, movie, from_actor, from_actor_id, to_actor, llm
+        tmdb, movie, from_actor, from_actor_id, to_actor, llm, name_cache=name_cache
     )
 
-    if from_match is None or to_match is None:
+    if (from_match is None or to_match is None) and concurrent_candidates:
+        winner = await _walk_candidates_concurrently(
+            tmdb,
+            candidates[1:MAX_MOVIE_SEARCH_CANDIDATES],
+            from_actor,
+            from_actor_id,
+            to_actor,
+            llm,
+            name_cache,
+        )
+        if winner is not None:
+            movie, from_match, to_match, to_member = winner
+    elif from_match is None or to_match is None:
         for candidate in candidates[1:MAX_MOVIE_SEARCH_CANDIDATES]:
             candidate_from, candidate_to, candidate_to_member = await _check_candidate(
-                tmdb, candidate, from_actor, from_actor_id, to_actor, llm
+                tmdb,
+                candidate,
+                from_actor,
+                from_actor_id,
+                to_actor,
+                llm,
+                name_cache=name_cache,
             )
             if candidate_from is not None and candidate_to is not None:
                 movie, from_match, to_match, to_member = (
@@ -148,6 +384,15 @@ async def validate_move(
                 )
                 break
 
+    if (from_match is None or to_match is None) and guess is not None:
+        return _move_result(guess, *guess_check, from_actor, to_actor)
+    return _move_result(movie, from_match, to_match, to_member, from_actor, to_actor)
+
+
+def _move_result(
+    movie, from_match, to_match, to_member, from_actor: str, to_actor: str
+) -> ValidationResult:
+    """The ValidationResult for a move checked against movie's cast."""
     valid = from_match is not None and to_match is not None
 
     if valid:
@@ -8,6 +8,9 @@ from art_graph.cinema_data_providers.tmdb.config import TMDbConfig
 from art_graph.cinema_data_providers.filters import MovieFilter
 
 from . import directories
+from .tmdb_coalescing import CoalescingTMDbClient
+from .tmdb_memory_cache import MemoryCachedTMDbClient
+from .tmdb_scheduler import ScheduledTMDbClient
 from .env import load_cinema_game_env
 
 load_cinema_game_env()
@@ -37,8 +40,52 @@ TMDB_BASE_URL = "https://api.themoviedb.org/3"
 TMDB_IMAGE_BASE = "https://image.tmdb.org/t/p/w500"
 TMDB_BACKDROP_BASE = "https://image.tmdb.org/t/p/w1280"
 
+# With TMDB_CACHE_PATH set, recent TMDb results are also kept in an in-process
+# LRU (tmdb_memory_cache.py) so hot lookups skip the SQLite cache entirely.
+# It holds at most TMDB_MEMORY_CACHE_SIZE results and roughly
+# TMDB_MEMORY_CACHE_MAX_BYTES of them (0 for no byte cap, which also skips
+# estimating result sizes); TMDB_MEMORY_CACHE_SIZE=0 disables it.
+TMDB_MEMORY_CACHE_SIZE = int(os.getenv("TMDB_MEMORY_CACHE_SIZE", "20000"))
+TMDB_MEMORY_CACHE_MAX_BYTES = int(
+    os.getenv("TMDB_MEMORY_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
+# How long each kind of result stays in the memory tier. Credits change
+# rarely; searches and the popular-people list drift faster.
+TMDB_MEMORY_CACHE_TTL_SECONDS = {
+    "get_movie_cast": 6 * 3600,
+    "get_person_movies": 6 * 3600,
+    "get_person_details": 6 * 3600,
+    "search_movies": 3600,
+    "search_person": 3600,
+    "get_popular_people": 1800,
+}
+
+
+# All TMDb calls share one budget (tmdb_scheduler.py): a token bucket refilled
+# at TMDB_RATE_LIMIT_PER_SECOND up to TMDB_RATE_LIMIT_BURST, and at most
+# TMDB_MAX_CONCURRENCY calls in flight. Waiting calls are admitted in priority
+# order, move validation before game creation before background work. Calls
+# failing with 429 or 5xx are retried up to TMDB_MAX_RETRIES times, backing off
+# from TMDB_RETRY_BACKOFF_SECONDS (with jitter) or as Retry-After asks.
+#
+# CachedTMDbClient makes its HTTP calls internally, so the budget has to sit
+# in front of it and its persistent-cache hits spend tokens too (hits in the
+# memory tier don't). The defaults are sized for that: TMDb allows about 50
+# requests a second, so counting hits keeps cold traffic safely under it while
+# the burst lets a run of cache hits (warm-up, snapshot builds) through
+# quickly. Raise both for cache-heavy batch jobs; 429s are retried anyway.
+TMDB_RATE_LIMIT_PER_SECOND = float(os.getenv("TMDB_RATE_LIMIT_PER_SECOND", "50"))
+TMDB_RATE_LIMIT_BURST = int(os.getenv("TMDB_RATE_LIMIT_BURST", "100"))
+TMDB_MAX_CONCURRENCY = int(os.getenv("TMDB_MAX_CONCURRENCY", "20"))
+TMDB_MAX_RETRIES = int(os.getenv("TMDB_MAX_RETRIES", "3"))
+TMDB_RETRY_BACKOFF_SECONDS = float(os.getenv("TMDB_RETRY_BACKOFF_SECONDS", "0.5"))
+
 
 def create_tmdb_client() -> TMDbClient:
+    """The app's TMDb client: scheduled, then coalescing identical requests.
+
+    A persistent cache also gets the in-memory tier in front of it.
+    """
     config = TMDbConfig(
         api_key=TMDB_API_KEY,
         image_base=TMDB_IMAGE_BASE,
@@ -46,19 +93,62 @@ def create_tmdb_client() -> TMDbClient:
     )
 
     if TMDB_CACHE_DISABLE:
-        return TMDbClient(config)
+        client = TMDbClient(config)
     elif TMDB_CACHE_PATH:
         engine = create_engine(f"sqlite:///{TMDB_CACHE_PATH}")
-        return CachedTMDbClient(config, engine=engine)
+        client = CachedTMDbClient(config, engine=engine)
     else:
         raise RuntimeError(
             "TMDB_CACHE_PATH must be set to a writable file path for the TMDb cache, "
             "or set TMDB_CACHE_DISABLE=true to run without caching."
         )
 
+    # Coalescing sits outside the scheduler, so callers sharing one request
+    # also share its place in the queue. Callers only join a request made at
+    # their own priority or a more urgent one.
+    client = CoalescingTMDbClient(
+        ScheduledTMDbClient(
+            client,
+            rate_per_second=TMDB_RATE_LIMIT_PER_SECOND,
+            burst=TMDB_RATE_LIMIT_BURST,
+            max_concurrency=TMDB_MAX_CONCURRENCY,
+            max_retries=TMDB_MAX_RETRIES,
+            backoff_seconds=TMDB_RETRY_BACKOFF_SECONDS,
+        )
+    )
+    if not TMDB_CACHE_DISABLE and TMDB_MEMORY_CACHE_SIZE > 0:
+        # Outside the coalescing wrapper, so a memory hit costs no task.
+        client = MemoryCachedTMDbClient(
+            client,
+            ttl_seconds=TMDB_MEMORY_CACHE_TTL_SECONDS,
+            max_entries=TMDB_MEMORY_CACHE_SIZE,
+            max_bytes=TMDB_MEMORY_CACHE_MAX_BYTES or None,
+        )
+    return client
+
 
 DB_PATH = os.getenv("DB_PATH", directories.base("cinema_game.db"))
 
+# Game-database access runs on a dedicated thread pool, one long-lived SQLite
+# connection per thread, so route handlers never block the event loop on
+# connection setup or lock waits. Size the pool to the expected number of
+# concurrent requests per worker; WAL mode lets readers run alongside a writer.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+
+# Games in active play are kept in an in-process LRU (game_cache.py) so moves,
+# undos and polls don't re-read the database; writes go through to SQLite.
+# Each hit is checked against the game's version in the database, so writes
+# made by another worker process are seen on the next read. Entries expire
+# after GAME_CACHE_TTL_SECONDS. GAME_CACHE_SIZE=0 disables the cache.
+GAME_CACHE_SIZE = int(os.getenv("GAME_CACHE_SIZE", "1024"))
+GAME_CACHE_TTL_SECONDS = float(os.getenv("GAME_CACHE_TTL_SECONDS", "60"))
+
+# POST /game/{id}/move honours an Idempotency-Key header: the response to the
+# first request with a given key is stored alongside the move and replayed to
+# retries for IDEMPOTENCY_TTL_SECONDS, without validating the move again.
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+
 
 def create_llm_provider():
     """Create an LLM provider for fallback name matching.
@@ -79,6 +169,14 @@ def create_llm_provider():
     return create_provider(config)
 
 
+# LLM calls run on their own thread pool (LLM_POOL_SIZE threads) so a slow
+# provider never blocks the event loop. A name-match call that has not
+# answered within LLM_TIMEOUT_SECONDS is abandoned and the move is judged on
+# fuzzy matching alone.
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "4"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "5"))
+
+
 # Hops = number of actor→movie→actor steps.
 # Easy: exactly 2 hops (no movie may repeat).
 # Medium: 3–5 hops (random within range).
@@ -96,6 +194,108 @@ DIFFICULTY_HOPS = {
 # live TMDb request when caching is disabled).
 MAX_MOVIE_SEARCH_CANDIDATES = 10
 
+# Before searching TMDb, validate_move matches the typed title against the
+# from-actor's top FILMOGRAPHY_MATCH_MOVIES films (by TMDb popularity) and, on
+# a match, checks that film first without a search. Search results found in
+# the filmography are also checked ahead of the rest. 0 disables both.
+FILMOGRAPHY_MATCH_MOVIES = int(os.getenv("FILMOGRAPHY_MATCH_MOVIES", "100"))
+
+# When the top-ranked candidate fails, fetch the casts of the remaining
+# candidates concurrently (at most CANDIDATE_CAST_CONCURRENCY in flight) instead
+# of one after another. Candidates are still judged in TMDb's order, and fetches
+# still in flight are cancelled as soon as one matches. Off by default: on a
+# cached deployment the serial walk is already cheap, and the concurrent walk
+# may fetch casts the serial walk would never have reached.
+CONCURRENT_CANDIDATE_FETCH = (
+    os.getenv("CONCURRENT_CANDIDATE_FETCH", "").lower() == "true"
+)
+CANDIDATE_CAST_CONCURRENCY = int(os.getenv("CANDIDATE_CAST_CONCURRENCY", "4"))
+
+# Number of preprocessed cast lists (matching.CastIndex) kept in memory, so
+# repeat moves through popular movies skip re-normalizing the cast.
+CAST_INDEX_CACHE_SIZE = int(os.getenv("CAST_INDEX_CACHE_SIZE", "512"))
+
+# LLM name-match cache: answers from the LLM fallback (including "no match")
+# are stored per (normalized query, cast list) in the game database and in an
+# in-process LRU of LLM_NAME_CACHE_MEMORY_SIZE entries. Rows older than the TTL
+# are ignored and pruned; past LLM_NAME_CACHE_MAX_ROWS the least recently used
+# rows are evicted, down to a tenth below the cap so eviction runs in batches.
+LLM_NAME_CACHE_TTL_SECONDS = float(
+    os.getenv("LLM_NAME_CACHE_TTL_SECONDS", str(30 * 24 * 3600))
+)
+LLM_NAME_CACHE_MAX_ROWS = int(os.getenv("LLM_NAME_CACHE_MAX_ROWS", "100000"))
+LLM_NAME_CACHE_MEMORY_SIZE = int(os.getenv("LLM_NAME_CACHE_MEMORY_SIZE", "2048"))
+
+# Puzzle pool: background workers keep up to PUZZLE_POOL_SIZE ready puzzles
+# per difficulty in the game database, so /game/new can hand one out
+# immediately and only falls back to live generation when the pool is empty.
+# A difficulty is refilled once its stock drops to PUZZLE_POOL_LOW_WATER;
+# PUZZLE_POOL_CONCURRENCY caps how many puzzles are generated at once across
+# all difficulties. Set PUZZLE_POOL_SIZE=0 to disable the pool.
+PUZZLE_POOL_SIZE = int(os.getenv("PUZZLE_POOL_SIZE", "10"))
+PUZZLE_POOL_LOW_WATER = int(os.getenv("PUZZLE_POOL_LOW_WATER", "3"))
+PUZZLE_POOL_CONCURRENCY = int(os.getenv("PUZZLE_POOL_CONCURRENCY", "2"))
+# How often an idle refill worker re-checks its stock, and how long it backs
+# off after a failed generation.
+PUZZLE_POOL_RECHECK_SECONDS = float(os.getenv("PUZZLE_POOL_RECHECK_SECONDS", "60"))
+
+# Directory of a local actor–movie graph snapshot (see graph_snapshot.py and
+# scripts/build_graph_snapshot.py). When set and present, puzzles are generated
+# by walking the snapshot in-process instead of calling TMDb per hop.
+GRAPH_SNAPSHOT_PATH = os.getenv("GRAPH_SNAPSHOT_PATH")
+
+# Random walks tried per puzzle before generate_puzzle gives up.
+MAX_PUZZLE_ATTEMPTS = 15
+
+# generate_puzzle tries its walks one at a time. With PUZZLE_ATTEMPT_FANOUT > 1
+# it runs that many walks at once and keeps the first one that passes the
+# shortcut check, which cuts tail latency for hard puzzles (long walks that
+# often dead-end) at the price of some wasted TMDb calls. All concurrent walks
+# share a budget of PUZZLE_ATTEMPT_TMDB_CONCURRENCY in-flight TMDb requests.
+PUZZLE_ATTEMPT_FANOUT = int(os.getenv("PUZZLE_ATTEMPT_FANOUT", "1"))
+PUZZLE_ATTEMPT_TMDB_CONCURRENCY = int(os.getenv("PUZZLE_ATTEMPT_TMDB_CONCURRENCY", "8"))
+
+# Every generated puzzle gets a bidirectional shortest-path search (see
+# pathfinding.py) between its two actors: puzzles whose real distance is below
+# the difficulty's DIFFICULTY_HOPS floor are rejected, and min_moves reports the
+# real distance rather than the walk length. The search rules out paths of up
+# to PATH_SEARCH_MAX_HOPS hops and stops early once a frontier grows past
+# PATH_SEARCH_MAX_FRONTIER nodes (snapshot) or PATH_SEARCH_TMDB_MAX_FRONTIER
+# nodes (TMDb, where each node costs a request). Without a graph snapshot the
+# search runs against TMDb only when PATH_SEARCH_ON_TMDB=true; otherwise live
+# generation keeps the cheap shared-movie check and reports the walk length.
+PATH_SEARCH_MAX_HOPS = int(os.getenv("PATH_SEARCH_MAX_HOPS", "4"))
+PATH_SEARCH_MAX_FRONTIER = int(os.getenv("PATH_SEARCH_MAX_FRONTIER", "20000"))
+PATH_SEARCH_TMDB_MAX_FRONTIER = int(os.getenv("PATH_SEARCH_TMDB_MAX_FRONTIER", "50"))
+PATH_SEARCH_ON_TMDB = os.getenv("PATH_SEARCH_ON_TMDB", "").lower() == "true"
+
+# Hints (GET /game/{id}/hint) search for a shortest path of up to
+# HINT_MAX_HOPS hops from the current actor to the end actor, through movies
+# the difficulty's MOVIE_FILTERS accept. Paths are memoized per (difficulty,
+# actor, target), HINT_CACHE_SIZE entries at most. A search against TMDb stops
+# early once a frontier grows past HINT_TMDB_MAX_FRONTIER nodes: larger than
+# the puzzle-generation limit, since a player is asking for this one path and
+# PATH_SEARCH_TMDB_MAX_FRONTIER only reaches about two hops. A search that
+# stops early is not memoized, so a later hint searches again.
+HINT_MAX_HOPS = int(os.getenv("HINT_MAX_HOPS", "8"))
+HINT_TMDB_MAX_FRONTIER = int(os.getenv("HINT_TMDB_MAX_FRONTIER", "500"))
+HINT_CACHE_SIZE = int(os.getenv("HINT_CACHE_SIZE", "4096"))
+
+# Puzzle start actors are drawn from the first POPULAR_PEOPLE_PAGES pages of
+# TMDb's popular people, and each hop of a walk picks from the actor's top
+# PUZZLE_WALK_MOVIES_PER_ACTOR films.
+POPULAR_PEOPLE_PAGES = 5
+PUZZLE_WALK_MOVIES_PER_ACTOR = 20
+
+# With TMDB_WARMUP=true, a background task started with the app preloads the
+# TMDb cache with what new puzzles need first: the popular-people pages, each
+# person's filmography, and the casts of their top TMDB_WARMUP_MOVIES_PER_PERSON
+# films, at most TMDB_WARMUP_CONCURRENCY requests at a time. Without it, the
+# first games after a deploy pay for those lookups against TMDb directly.
+TMDB_WARMUP = os.getenv("TMDB_WARMUP", "").lower() == "true"
+TMDB_WARMUP_MOVIES_PER_PERSON = int(os.getenv("TMDB_WARMUP_MOVIES_PER_PERSON", "10"))
+TMDB_WARMUP_CONCURRENCY = int(os.getenv("TMDB_WARMUP_CONCURRENCY", "8"))
+
 # Minimum TMDb popularity score for actors selected in puzzles.
 # TMDb popularity is a daily trending score — even major stars typically score 5–20.
 MIN_ACTOR_POPULARITY = {
@@ -104,6 +304,17 @@ MIN_ACTOR_POPULARITY = {
     "hard": 1,
 }
 
+# On the last hop of a puzzle walk, the popularity of up to ten end-actor
+# candidates is looked up concurrently, at most END_ACTOR_DETAILS_CONCURRENCY
+# TMDb requests at a time. Scores already seen (popular-people pages, earlier
+# walks) come from an in-memory cache of POPULARITY_CACHE_SIZE people; TMDb
+# popularity is recomputed daily, so cached scores expire after a day.
+END_ACTOR_DETAILS_CONCURRENCY = int(os.getenv("END_ACTOR_DETAILS_CONCURRENCY", "5"))
+POPULARITY_CACHE_SIZE = int(os.getenv("POPULARITY_CACHE_SIZE", "20000"))
+POPULARITY_CACHE_TTL_SECONDS = float(
+    os.getenv("POPULARITY_CACHE_TTL_SECONDS", str(24 * 3600))
+)
+
 # Movie quality filters per difficulty. vote_count is the strongest signal for
 # whether a film is widely recognised (see docs/tmdb_fields.md in artist-graph).
 MOVIE_FILTERS = {
@@ -1,14 +1,100 @@
-import sqlite3
+import asyncio
+import functools
 import json
-from .config import DB_PATH
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from .config import (
+    DB_PATH,
+    DB_POOL_SIZE,
+    DB_BUSY_TIMEOUT_MS,
+    IDEMPOTENCY_TTL_SECONDS,
+)
 
+# Pragmas applied once per pooled connection, when it is first opened. WAL
+# lets the pool's readers proceed while a writer commits; synchronous=NORMAL
+# is durable under WAL except across an OS crash, which is an acceptable
+# trade for game state.
+_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    f"PRAGMA busy_timeout = {int(DB_BUSY_TIMEOUT_MS)}",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA foreign_keys = ON",
+)
 
-def get_db() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
+# One long-lived connection per thread. Route handlers only ever touch the
+# database through run_db, so in the server the pool is bounded by the
+# executor's DB_POOL_SIZE worker threads.
+_local = threading.local()
+_pool_lock = threading.Lock()
+_pool: list[sqlite3.Connection] = []
+_pool_generation = 0
+_executor = ThreadPoolExecutor(max_workers=DB_POOL_SIZE, thread_name_prefix="db")
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    # check_same_thread=False only so close_db_pool can close connections
+    # owned by executor threads; each connection is otherwise used by the
+    # single thread that opened it.
+    conn = sqlite3.connect(path, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    for pragma in _PRAGMAS:
+        conn.execute(pragma)
     return conn
 
 
+def get_db() -> sqlite3.Connection:
+    """Return this thread's pooled connection, opening it on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.generation != _pool_generation:
+        conn = _connect(DB_PATH)
+        with _pool_lock:
+            _pool.append(conn)
+            _local.conn, _local.generation = conn, _pool_generation
+    return conn
+
+
+def close_db_pool():
+    """Close every pooled connection. Threads reconnect lazily on next use."""
+    global _pool_generation
+    with _pool_lock:
+        conns = list(_pool)
+        _pool.clear()
+        _pool_generation += 1
+    for conn in conns:
+        conn.close()
+
+
+@contextmanager
+def _transaction():
+    """Yield the pooled connection, committing on success.
+
+    Connections are long-lived, so a failed write must be rolled back
+    rather than left holding the write lock until the next commit.
+    """
+    conn = get_db()
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+async def run_db(fn, /, *args, **kwargs):
+    """Run a blocking database function on the DB executor and await it.
+
+    Keeps SQLite I/O (and lock waits) off the event loop, and reuses the
+    executor thread's pooled connection instead of opening a new one.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+
+
 def init_db():
     conn = get_db()
     conn.execute("""
@@ -31,18 +117,142 @@ def init_db():
             current_actor_id INTEGER NOT NULL,
             status TEXT NOT NULL DEFAULT 'in_progress',
             strikes INTEGER NOT NULL DEFAULT 0,
+            min_moves INTEGER,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """)
+    # Game listings (list_games, list_game_summaries) page newest-first by
+    # (created_at, id), optionally filtered by status or difficulty.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_games_created ON games (created_at, id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_games_status ON games (status, created_at, id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_games_difficulty "
+        "ON games (difficulty, created_at, id)"
+    )
+    # Append-only move log. games.moves is kept only so older databases can be
+    # migrated; new games always leave it as '[]'.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS game_moves (
+            game_id TEXT NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+            seq INTEGER NOT NULL,
+            from_actor TEXT NOT NULL,
+            from_actor_id INTEGER,
+            movie TEXT NOT NULL,
+            movie_id INTEGER,
+            movie_title TEXT,
+            movie_year TEXT,
+            poster_url TEXT,
+            backdrop_url TEXT,
+            to_actor TEXT NOT NULL,
+            to_actor_id INTEGER,
+            from_actor_profile_url TEXT,
+            to_actor_profile_url TEXT,
+            PRIMARY KEY (game_id, seq)
+        )
+    """)
+    # Ready-made puzzles, topped up in the background by puzzle_pool.PuzzlePool
+    # so /game/new doesn't have to wait on a TMDb random walk.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS puzzle_pool (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            difficulty TEXT NOT NULL,
+            puzzle TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_puzzle_pool_difficulty "
+        "ON puzzle_pool (difficulty, id)"
+    )
+    # Durable tier of name_match_cache.NameMatchCache: LLM name-resolution
+    # results (including "no match", stored as NULL) per query and cast.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS llm_name_matches (
+            query TEXT NOT NULL,
+            cast_hash TEXT NOT NULL,
+            matched_name TEXT,
+            created_at REAL NOT NULL,
+            last_used_at REAL NOT NULL,
+            PRIMARY KEY (query, cast_hash)
+        )
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_llm_name_matches_last_used "
+        "ON llm_name_matches (last_used_at)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_llm_name_matches_created "
+        "ON llm_name_matches (created_at)"
+    )
+    # Responses to moves submitted with an Idempotency-Key, so a retried
+    # request gets the original answer instead of being played again.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS idempotent_responses (
+            game_id TEXT NOT NULL,
+            key TEXT NOT NULL,
+            request_hash TEXT NOT NULL,
+            response TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (game_id, key)
+        )
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_idempotent_responses_created "
+        "ON idempotent_responses (created_at)"
+    )
     # Migration: add strikes column to existing databases
     try:
         conn.execute("ALTER TABLE games ADD COLUMN strikes INTEGER NOT NULL DEFAULT 0")
         conn.commit()
     except Exception:
         pass  # Column already exists
+    # Migration: add version column, bumped by every state write, so cached
+    # copies of a game (game_cache.GameStateCache) can tell which is newer.
+    try:
+        conn.execute("ALTER TABLE games ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+        conn.commit()
+    except Exception:
+        pass  # Column already exists
+    # Migration: add min_moves, the puzzle's measured shortest distance. Games
+    # created before it was stored fall back to their known solution's length.
+    try:
+        conn.execute("ALTER TABLE games ADD COLUMN min_moves INTEGER")
+        conn.commit()
+    except Exception:
+        pass  # Column already exists
+    conn.execute("""
+        UPDATE games SET min_moves = (
+            SELECT COUNT(*) FROM json_each(games.known_solution)
+            WHERE json_extract(value, '$.type') = 'movie'
+        )
+        WHERE min_moves IS NULL
+    """)
+    # Migration: add per-move actor profile URLs, so undo can restore the
+    # previous actor from the move log alone.
+    for column in ("from_actor_profile_url", "to_actor_profile_url"):
+        try:
+            conn.execute(f"ALTER TABLE game_moves ADD COLUMN {column} TEXT")
+            conn.commit()
+        except Exception:
+            pass  # Column already exists
     conn.commit()
-    conn.close()
+    _migrate_moves_to_log()
+
+
+def _migrate_moves_to_log():
+    """Move any moves still stored as a JSON blob on games into game_moves."""
+    with _transaction() as conn:
+        rows = conn.execute(
+            "SELECT id, moves FROM games WHERE moves != '[]'"
+        ).fetchall()
+        for row in rows:
+            _insert_moves(conn, row["id"], json.loads(row["moves"]))
+            conn.execute("UPDATE games SET moves = '[]' WHERE id = ?", (row["id"],))
 
 
 def is_beta_user(email: str) -> bool:
@@ -50,17 +260,14 @@ def is_beta_user(email: str) -> bool:
     row = conn.execute(
         "SELECT 1 FROM beta_users WHERE email = ?", (email.lower(),)
     ).fetchone()
-    conn.close()
     return row is not None
 
 
 def add_beta_user(email: str):
-    conn = get_db()
-    conn.execute(
-        "INSERT OR IGNORE INTO beta_users (email) VALUES (?)", (email.lower(),)
-    )
-    conn.commit()
-    conn.close()
+    with _transaction() as conn:
+        conn.execute(
+            "INSERT OR IGNORE INTO beta_users (email) VALUES (?)", (email.lower(),)
+        )
 
 
 def seed_beta_users(emails: list[str]):
@@ -69,105 +276,561 @@ def seed_beta_users(emails: list[str]):
 
 
 def remove_beta_user(email: str):
-    conn = get_db()
-    conn.execute("DELETE FROM beta_users WHERE email = ?", (email.lower(),))
-    conn.commit()
-    conn.close()
+    with _transaction() as conn:
+        conn.execute("DELETE FROM beta_users WHERE email = ?", (email.lower(),))
 
 
 def list_beta_users() -> list[str]:
     conn = get_db()
     rows = conn.execute("SELECT email FROM beta_users ORDER BY created_at").fetchall()
-    conn.close()
     return [row["email"] for row in rows]
 
 
 def save_game(game: dict):
-    conn = get_db()
-    conn.execute(
-        """
-        INSERT INTO games (
-            id, start_actor_name, start_actor_id,
-            end_actor_name, end_actor_id, difficulty,
-            known_solution, moves, current_actor_name,
-            current_actor_id, status, strikes
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """,
-        (
-            game["id"],
-            game["start_actor"]["name"],
-            game["start_actor"]["id"],
-            game["end_actor"]["name"],
-            game["end_actor"]["id"],
-            game["difficulty"],
-            json.dumps(game["known_solution"]),
-            json.dumps(game["moves"]),
-            game["current_actor"]["name"],
-            game["current_actor"]["id"],
-            game["status"],
-            game.get("strikes", 0),
-        ),
-    )
-    conn.commit()
-    conn.close()
+    with _transaction() as conn:
+        conn.execute(
+            """
+            INSERT INTO games (
+                id, start_actor_name, start_actor_id,
+                end_actor_name, end_actor_id, difficulty,
+                known_solution, moves, current_actor_name,
+                current_actor_id, status, strikes, min_moves
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+            (
+                game["id"],
+                game["start_actor"]["name"],
+                game["start_actor"]["id"],
+                game["end_actor"]["name"],
+                game["end_actor"]["id"],
+                game["difficulty"],
+                json.dumps(game["known_solution"]),
+                "[]",
+                game["current_actor"]["name"],
+                game["current_actor"]["id"],
+                game["status"],
+                game.get("strikes", 0),
+                game.get("min_moves", _solution_length(game["known_solution"])),
+            ),
+        )
+        _insert_moves(conn, game["id"], game["moves"])
+
+
+def _solution_length(known_solution: list[dict]) -> int:
+    return sum(1 for step in known_solution if step["type"] == "movie")
 
 
 def load_game(game_id: str) -> dict | None:
     conn = get_db()
     row = conn.execute("SELECT * FROM games WHERE id = ?", (game_id,)).fetchone()
-    conn.close()
     if not row:
         return None
-    return _row_to_game(row)
+    return _row_to_game(row, _load_moves(conn, [game_id])[game_id])
+
+
+def get_game_version(game_id: str) -> int | None:
+    """The game's current version, or None if there is no such game."""
+    conn = get_db()
+    row = conn.execute("SELECT version FROM games WHERE id = ?", (game_id,)).fetchone()
+    return row[0] if row else None
+
+
+class VersionConflict(Exception):
+    """A compare-and-swap write found the game at a different version."""
+
+    def __init__(self, game_id: str, expected_version: int):
+        super().__init__(f"Game {game_id} is no longer at version {expected_version}")
+        self.game_id = game_id
+        self.expected_version = expected_version
+
+
+# The write functions below return the game's new version (None if there is
+# no such game). Given expected_version, they only apply if the game is still
+# at that version and raise VersionConflict otherwise, leaving it untouched.
+# update_game_state and append_move also take an idempotency record,
+# (key, request_hash, response), stored in the same transaction as the write
+# so a retried request can never see the write without its response.
 
 
 def update_game(
-    game_id: str, moves: list, current_actor: dict, status: str, strikes: int = 0
-):
+    game_id: str,
+    moves: list,
+    current_actor: dict,
+    status: str,
+    strikes: int = 0,
+    *,
+    expected_version: int | None = None,
+) -> int | None:
+    """Replace a game's whole move log and state.
+
+    Costs one write per move; the routes use append_move, pop_moves and
+    update_game_state instead, which touch a single row each.
+    """
+    with _transaction() as conn:
+        version = _update_state(
+            conn, game_id, current_actor, status, strikes, expected_version
+        )
+        if version is None:
+            return None
+        conn.execute("DELETE FROM game_moves WHERE game_id = ?", (game_id,))
+        _insert_moves(conn, game_id, moves)
+        return version
+
+
+def update_game_state(
+    game_id: str,
+    current_actor: dict,
+    status: str,
+    strikes: int,
+    *,
+    expected_version: int | None = None,
+    idempotency: tuple[str, str, dict] | None = None,
+) -> int | None:
+    """Update a game's current actor, status and strikes, leaving its moves."""
+    with _transaction() as conn:
+        version = _update_state(
+            conn, game_id, current_actor, status, strikes, expected_version
+        )
+        if idempotency is not None:
+            _put_idempotent_response(conn, game_id, *idempotency)
+        return version
+
+
+def append_move(
+    game_id: str,
+    move: dict,
+    current_actor: dict,
+    status: str,
+    strikes: int,
+    *,
+    expected_version: int | None = None,
+    idempotency: tuple[str, str, dict] | None = None,
+) -> int | None:
+    """Append one move to a game's log and update its state."""
+    with _transaction() as conn:
+        version = _update_state(
+            conn, game_id, current_actor, status, strikes, expected_version
+        )
+        if version is None:
+            return None
+        seq = conn.execute(
+            "SELECT COALESCE(MAX(seq) + 1, 0) FROM game_moves WHERE game_id = ?",
+            (game_id,),
+        ).fetchone()[0]
+        _insert_moves(conn, game_id, [move], start_seq=seq)
+        if idempotency is not None:
+            _put_idempotent_response(conn, game_id, *idempotency)
+        return version
+
+
+def pop_moves(
+    game_id: str,
+    count: int,
+    current_actor: dict,
+    status: str,
+    strikes: int,
+    *,
+    expected_version: int | None = None,
+) -> int | None:
+    """Delete a game's count most recent moves and update its state.
+
+    Raises ValueError, writing nothing, if count is below 1 or the game has
+    fewer than count moves.
+    """
+    if count < 1:
+        raise ValueError(f"count must be at least 1, not {count}")
+    with _transaction() as conn:
+        version = _update_state(
+            conn, game_id, current_actor, status, strikes, expected_version
+        )
+        deleted = conn.execute(
+            """
+            DELETE FROM game_moves
+            WHERE game_id = ?
+              AND seq >= (
+                  SELECT seq FROM game_moves
+                  WHERE game_id = ?
+                  ORDER BY seq DESC
+                  LIMIT 1 OFFSET ?
+              )
+        """,
+            (game_id, game_id, count - 1),
+        ).rowcount
+        if version is not None and deleted < count:
+            raise ValueError(f"Game {game_id} has fewer than {count} moves to undo")
+        return version
+
+
+def pop_move(
+    game_id: str,
+    current_actor: dict,
+    status: str,
+    strikes: int,
+    *,
+    expected_version: int | None = None,
+) -> int | None:
+    """Delete a game's most recent move and update its state."""
+    return pop_moves(
+        game_id,
+        1,
+        current_actor,
+        status,
+        strikes,
+        expected_version=expected_version,
+    )
+
+
+def add_pooled_puzzle(difficulty: str, puzzle: dict):
+    with _transaction() as conn:
+        conn.execute(
+            "INSERT INTO puzzle_pool (difficulty, puzzle) VALUES (?, ?)",
+            (difficulty, json.dumps(puzzle)),
+        )
+
+
+def take_pooled_puzzle(difficulty: str) -> dict | None:
+    """Remove and return the oldest pooled puzzle for a difficulty, if any."""
+    with _transaction() as conn:
+        row = conn.execute(
+            """
+            DELETE FROM puzzle_pool
+            WHERE id = (
+                SELECT id FROM puzzle_pool
+                WHERE difficulty = ?
+                ORDER BY id
+                LIMIT 1
+            )
+            RETURNING puzzle
+        """,
+            (difficulty,),
+        ).fetchone()
+    return json.loads(row["puzzle"]) if row else None
+
+
+def count_pooled_puzzles(difficulty: str) -> int:
     conn = get_db()
+    return conn.execute(
+        "SELECT COUNT(*) FROM puzzle_pool WHERE difficulty = ?", (difficulty,)
+    ).fetchone()[0]
+
+
+def get_name_match(
+    query: str, cast_hash: str, min_created_at: float, now: float
+) -> sqlite3.Row | None:
+    """Return a cached LLM name match no older than min_created_at.
+
+    A hit refreshes last_used_at, which is what LRU eviction orders by.
+    """
+    with _transaction() as conn:
+        row = conn.execute(
+            """
+            SELECT matched_name, created_at FROM llm_name_matches
+            WHERE query = ? AND cast_hash = ? AND created_at >= ?
+        """,
+            (query, cast_hash, min_created_at),
+        ).fetchone()
+        if row is not None:
+            conn.execute(
+                "UPDATE llm_name_matches SET last_used_at = ? "
+                "WHERE query = ? AND cast_hash = ?",
+                (now, query, cast_hash),
+            )
+    return row
+
+
+def put_name_match(
+    query: str,
+    cast_hash: str,
+    matched_name: str | None,
+    now: float,
+    min_created_at: float,
+    max_rows: int,
+    trim: bool = True,
+):
+    """Store an LLM name match and drop expired rows.
+
+    Expired rows are found through the created_at index. With trim, the
+    table is also counted (a scan of one index), and if it is over max_rows
+    the least recently used rows are deleted through the last_used_at index,
+    down to a tenth below max_rows. Callers pass trim only every so many
+    stores (see NameMatchCache).
+    """
+    with _transaction() as conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO llm_name_matches
+                (query, cast_hash, matched_name, created_at, last_used_at)
+            VALUES (?, ?, ?, ?, ?)
+        """,
+            (query, cast_hash, matched_name, now, now),
+        )
+        conn.execute(
+            "DELETE FROM llm_name_matches WHERE created_at < ?", (min_created_at,)
+        )
+        if not trim:
+            return
+        rows = conn.execute("SELECT COUNT(*) FROM llm_name_matches").fetchone()[0]
+        if rows > max_rows:
+            conn.execute(
+                """
+                DELETE FROM llm_name_matches
+                WHERE rowid IN (
+                    SELECT rowid FROM llm_name_matches
+                    ORDER BY last_used_at
+                    LIMIT ?
+                )
+            """,
+                (rows - max_rows + max_rows // 10,),
+            )
+
+
+def get_idempotent_response(game_id: str, key: str) -> tuple[str, dict] | None:
+    """The (request_hash, response) stored for an Idempotency-Key, if unexpired."""
+    row = (
+        get_db()
+        .execute(
+            """
+            SELECT request_hash, response FROM idempotent_responses
+            WHERE game_id = ? AND key = ? AND created_at >= ?
+        """,
+            (game_id, key, time.time() - IDEMPOTENCY_TTL_SECONDS),
+        )
+        .fetchone()
+    )
+    return (row[0], json.loads(row[1])) if row else None
+
+
+def _put_idempotent_response(
+    conn, game_id: str, key: str, request_hash: str, response: dict
+):
+    now = time.time()
     conn.execute(
         """
-        UPDATE games
-        SET moves = ?, current_actor_name = ?, current_actor_id = ?,
-            status = ?, strikes = ?, updated_at = CURRENT_TIMESTAMP
-        WHERE id = ?
+        INSERT OR REPLACE INTO idempotent_responses
+            (game_id, key, request_hash, response, created_at)
+        VALUES (?, ?, ?, ?, ?)
     """,
-        (
-            json.dumps(moves),
-            current_actor["name"],
-            current_actor["id"],
-            status,
-            strikes,
-            game_id,
-        ),
+        (game_id, key, request_hash, json.dumps(response), now),
+    )
+    conn.execute(
+        "DELETE FROM idempotent_responses WHERE created_at < ?",
+        (now - IDEMPOTENCY_TTL_SECONDS,),
     )
-    conn.commit()
-    conn.close()
 
 
-def list_games(limit: int | None = None) -> list[dict]:
-    conn = get_db()
-    query = "SELECT * FROM games ORDER BY created_at DESC"
+def _list_query(
+    columns: str,
+    limit: int | None,
+    status: str | None,
+    difficulty: str | None,
+    before: tuple[str, str] | None,
+    since: str | None = None,
+    until: str | None = None,
+    min_moves_played: int | None = None,
+) -> tuple[str, list]:
+    """A newest-first games query with the listing filters applied."""
+    where, params = [], []
+    if status is not None:
+        where.append("status = ?")
+        params.append(status)
+    if difficulty is not None:
+        where.append("difficulty = ?")
+        params.append(difficulty)
+    if before is not None:
+        where.append("(created_at, id) < (?, ?)")
+        params.extend(before)
+    if since is not None:
+        where.append("created_at >= ?")
+        params.append(since)
+    if until is not None:
+        where.append("created_at < ?")
+        params.append(until)
+    if min_moves_played:
+        where.append("(SELECT COUNT(*) FROM game_moves WHERE game_id = games.id) >= ?")
+        params.append(min_moves_played)
+    query = f"SELECT {columns} FROM games"
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    query += " ORDER BY created_at DESC, id DESC"
     if limit is not None:
         query += f" LIMIT {int(limit)}"
-    rows = conn.execute(query).fetchall()
-    conn.close()
-    return [_row_to_game(row) for row in rows]
+    return query, params
+
+
+def list_games(
+    limit: int | None = None,
+    *,
+    status: str | None = None,
+    difficulty: str | None = None,
+    before: tuple[str, str] | None = None,
+) -> list[dict]:
+    """Return full games, newest first.
+
+    before is a (created_at, id) cursor, normally the last game of the
+    previous page: only games listed after it are returned.
+    """
+    conn = get_db()
+    query, params = _list_query("*", limit, status, difficulty, before)
+    rows = conn.execute(query, params).fetchall()
+    moves = _load_moves(conn, [row["id"] for row in rows])
+    return [_row_to_game(row, moves[row["id"]]) for row in rows]
+
+
+def list_game_summaries(
+    limit: int | None = None,
+    *,
+    status: str | None = None,
+    difficulty: str | None = None,
+    before: tuple[str, str] | None = None,
+) -> list[dict]:
+    """Like list_games, but only summary fields and a move count.
+
+    Reads no JSON columns and no move rows beyond counting them, so it stays
+    cheap on large databases.
+    """
+    query, params = _list_query(
+        """
+        id, difficulty, start_actor_name, end_actor_name, status, created_at,
+        (SELECT COUNT(*) FROM game_moves WHERE game_id = games.id) AS moves
+        """,
+        limit,
+        status,
+        difficulty,
+        before,
+    )
+    return [
+        {
+            "game_id": row["id"],
+            "difficulty": row["difficulty"],
+            "start_actor": row["start_actor_name"],
+            "end_actor": row["end_actor_name"],
+            "status": row["status"],
+            "moves": row["moves"],
+            "created_at": row["created_at"],
+        }
+        for row in get_db().execute(query, params).fetchall()
+    ]
+
+
+def iter_games(
+    *,
+    status: str | None = None,
+    difficulty: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    min_moves_played: int | None = None,
+    batch_size: int = 500,
+) -> Iterator[dict]:
+    """Yield full games, newest first, reading batch_size rows at a time.
+
+    since and until bound created_at ("YYYY-MM-DD" or a full timestamp;
+    until is exclusive), and min_moves_played skips games with fewer moves
+    played (not the puzzle's min_moves). A single query
+    is stepped through, so memory stays flat however many games match.
+    """
+    conn = get_db()
+    query, params = _list_query(
+        "*", None, status, difficulty, None, since, until, min_moves_played
+    )
+    cursor = conn.execute(query, params)
+    while rows := cursor.fetchmany(batch_size):
+        moves = _load_moves(conn, [row["id"] for row in rows])
+        for row in rows:
+            yield _row_to_game(row, moves[row["id"]])
+
+
+_MOVE_COLUMNS = (
+    "from_actor",
+    "from_actor_id",
+    "movie",
+    "movie_id",
+    "movie_title",
+    "movie_year",
+    "poster_url",
+    "backdrop_url",
+    "to_actor",
+    "to_actor_id",
+    "from_actor_profile_url",
+    "to_actor_profile_url",
+)
+
+# Keeps IN (...) lists well under SQLite's bound-parameter limit.
+_IN_CHUNK = 500
+
+
+def _insert_moves(conn, game_id: str, moves: list[dict], start_seq: int = 0):
+    columns = ", ".join(_MOVE_COLUMNS)
+    placeholders = ", ".join("?" for _ in _MOVE_COLUMNS)
+    conn.executemany(
+        f"INSERT INTO game_moves (game_id, seq, {columns}) "
+        f"VALUES (?, ?, {placeholders})",
+        [
+            (game_id, start_seq + i, *(move.get(c) for c in _MOVE_COLUMNS))
+            for i, move in enumerate(moves)
+        ],
+    )
+
+
+def _load_moves(conn, game_ids: list[str]) -> dict[str, list[dict]]:
+    """Return each game's moves in play order, keyed by game id."""
+    moves: dict[str, list[dict]] = {game_id: [] for game_id in game_ids}
+    for start in range(0, len(game_ids), _IN_CHUNK):
+        chunk = game_ids[start : start + _IN_CHUNK]
+        rows = conn.execute(
+            f"SELECT game_id, {', '.join(_MOVE_COLUMNS)} FROM game_moves "
+            f"WHERE game_id IN ({', '.join('?' for _ in chunk)}) "
+            "ORDER BY game_id, seq",
+            chunk,
+        ).fetchall()
+        for row in rows:
+            moves[row["game_id"]].append({c: row[c] for c in _MOVE_COLUMNS})
+    return moves
+
+
+def _update_state(
+    conn,
+    game_id: str,
+    current_actor: dict,
+    status: str,
+    strikes: int,
+    expected_version: int | None = None,
+) -> int | None:
+    """Write a game's state and bump its version (see update_game)."""
+    query = """
+        UPDATE games
+        SET current_actor_name = ?, current_actor_id = ?,
+            status = ?, strikes = ?, version = version + 1,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """
+    params = [current_actor["name"], current_actor["id"], status, strikes, game_id]
+    if expected_version is not None:
+        query += " AND version = ?"
+        params.append(expected_version)
+    updated = conn.execute(query, params).rowcount
+    row = conn.execute("SELECT version FROM games WHERE id = ?", (game_id,)).fetchone()
+    if row is None:
+        return None
+    if not updated:
+        raise VersionConflict(game_id, expected_version)
+    return row[0]
 
 
-def _row_to_game(row: sqlite3.Row) -> dict:
+def _row_to_game(row: sqlite3.Row, moves: list[dict]) -> dict:
     return {
         "id": row["id"],
         "start_actor": {"name": row["start_actor_name"], "id": row["start_actor_id"]},
         "end_actor": {"name": row["end_actor_name"], "id": row["end_actor_id"]},
         "difficulty": row["difficulty"],
         "known_solution": json.loads(row["known_solution"]),
-        "moves": json.loads(row["moves"]),
+        "moves": moves,
         "current_actor": {
             "name": row["current_actor_name"],
             "id": row["current_actor_id"],
         },
         "status": row["status"],
         "strikes": row["strikes"] if "strikes" in row.keys() else 0,
+        "min_moves": row["min_moves"],
+        "version": row["version"],
         "created_at": row["created_at"],
     }
@@ -12,6 +12,36 @@ def get_llm(request: Request):
     return request.app.state.llm
 
 
+def get_name_match_cache(request: Request):
+    """The LLM name-match cache, or None when the app was started without one."""
+    return getattr(request.app.state, "name_cache", None)
+
+
+def get_popularity_cache(request: Request):
+    """The shared actor-popularity cache used by puzzle generation, if any."""
+    return getattr(request.app.state, "popularity_cache", None)
+
+
+def get_graph_snapshot(request: Request):
+    """The local actor–movie graph snapshot, or None when not configured."""
+    return getattr(request.app.state, "graph_snapshot", None)
+
+
+def get_game_cache(request: Request):
+    """The in-process cache of active games, or None when it is disabled."""
+    return getattr(request.app.state, "game_cache", None)
+
+
+def get_path_solver(request: Request):
+    """The memoized hint path solver, or None when the app has none."""
+    return getattr(request.app.state, "path_solver", None)
+
+
+def get_puzzle_pool(request: Request):
+    """The background puzzle pool, or None when it is disabled."""
+    return getattr(request.app.state, "puzzle_pool", None)
+
+
 async def require_auth(authorization: str = Header(...)) -> dict:
     if not NEXTAUTH_SECRET:
         raise HTTPException(status_code=500, detail="Server misconfigured")
@@ -1,6 +1,10 @@
 """Export game sessions from the database into RecordedGame models."""
 
-from ..database import load_game, list_games
+import gzip
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from ..database import iter_games, load_game, list_game_summaries
 from ..models.experiment import (
     ExpectedSuccess,
     RecordedMove,
@@ -8,25 +12,43 @@ from ..models.experiment import (
 )
 
 
-def list_game_ids(limit: int | None = None) -> list[dict]:
+def list_game_ids(
+    limit: int | None = None,
+    *,
+    status: str | None = None,
+    difficulty: str | None = None,
+    before: tuple[str, str] | None = None,
+) -> list[dict]:
     """List recent games in the database with summary info.
 
     Returns a list of dicts with keys: game_id, difficulty, start_actor,
-    end_actor, status, moves, created_at.
+    end_actor, status, moves, created_at. status and difficulty filter the
+    games; before is a (created_at, game_id) cursor from a previous page.
+    """
+    return list_game_summaries(
+        limit=limit, status=status, difficulty=difficulty, before=before
+    )
+
+
+def iter_game_ids(
+    *,
+    status: str | None = None,
+    difficulty: str | None = None,
+    page_size: int = 500,
+) -> Iterator[dict]:
+    """Yield every matching game's summary, newest first, a page at a time.
+
+    Only one page of summaries is held in memory, however large the database.
     """
-    games = list_games(limit=limit)
-    return [
-        {
-            "game_id": g["id"],
-            "difficulty": g["difficulty"],
-            "start_actor": g["start_actor"]["name"],
-            "end_actor": g["end_actor"]["name"],
-            "status": g["status"],
-            "moves": len(g["moves"]),
-            "created_at": g.get("created_at"),
-        }
-        for g in games
-    ]
+    before = None
+    while True:
+        page = list_game_ids(
+            page_size, status=status, difficulty=difficulty, before=before
+        )
+        yield from page
+        if len(page) < page_size:
+            return
+        before = (page[-1]["created_at"], page[-1]["game_id"])
 
 
 def export_game(game_id: str) -> RecordedGame:
@@ -38,7 +60,49 @@ def export_game(game_id: str) -> RecordedGame:
     game = load_game(game_id)
     if game is None:
         raise ValueError(f"Game not found: {game_id}")
+    return _to_recorded_game(game)
+
+
+def export_games(
+    *,
+    status: str | None = None,
+    difficulty: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    min_moves_played: int | None = None,
+) -> Iterator[RecordedGame]:
+    """Yield every matching game as a RecordedGame, newest first.
+
+    Filters are as for database.iter_games. Games are streamed from a single
+    query rather than loaded one by one, and never all held at once.
+    """
+    for game in iter_games(
+        status=status,
+        difficulty=difficulty,
+        since=since,
+        until=until,
+        min_moves_played=min_moves_played,
+    ):
+        yield _to_recorded_game(game)
+
+
+def write_jsonl(games: Iterable[RecordedGame], path: str | Path) -> int:
+    """Write games to path as JSON Lines, gzipped if it ends in .gz.
+
+    Returns the number of games written.
+    """
+    path = Path(path)
+    opener = gzip.open if path.suffix == ".gz" else open
+    count = 0
+    with opener(path, "wt", encoding="utf-8") as f:
+        for game in games:
+            f.write(game.model_dump_json())
+            f.write("\n")
+            count += 1
+    return count
+
 
+def _to_recorded_game(game: dict) -> RecordedGame:
     moves = []
     for m in game["moves"]:
         expected = ExpectedSuccess(
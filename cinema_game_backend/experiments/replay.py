@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from art_graph.cinema_data_providers.tmdb.client import TMDbClient
 from ..agents.validation_agent import validate_move
 from ..models.experiment import RecordedGame, RecordedMove, ExpectedSuccess
+from ..name_match_cache import NameMatchCache
 
 
 @dataclass
@@ -23,10 +24,17 @@ async def replay_move(
     move: RecordedMove,
     from_actor_id: int,
     llm=None,
+    name_cache: NameMatchCache | None = None,
 ) -> MoveResult:
     """Replay a single move and compare against the expected outcome."""
     result = await validate_move(
-        tmdb, from_actor, move.movie, move.actor, from_actor_id=from_actor_id, llm=llm
+        tmdb,
+        from_actor,
+        move.movie,
+        move.actor,
+        from_actor_id=from_actor_id,
+        llm=llm,
+        name_cache=name_cache,
     )
 
     expected_valid = move.expected.valid
@@ -68,11 +76,14 @@ async def replay_game(
     tmdb: TMDbClient,
     game: RecordedGame,
     llm=None,
+    name_cache: NameMatchCache | None = None,
 ) -> list[MoveResult]:
     """Replay all moves in a recorded game sequentially.
 
     Each move uses the previous move's expected actor as the from_actor,
-    mirroring how the game advances through the chain.
+    mirroring how the game advances through the chain. Pass name_cache to
+    reuse cached LLM name matches (uncached by default, so experiments see
+    the LLM's live behaviour).
     """
     results = []
     current_actor = game.start_actor
@@ -80,7 +91,12 @@ async def replay_game(
 
     for move in game.moves:
         result = await replay_move(
-            tmdb, current_actor, move, from_actor_id=current_actor_id, llm=llm
+            tmdb,
+            current_actor,
+            move,
+            from_actor_id=current_actor_id,
+            llm=llm,
+            name_cache=name_cache,
         )
         results.append(result)
 
@@ -0,0 +1,64 @@
+"""In-process cache of the games being played right now.
+
+An active session reads its game on every move, undo and poll of
+GET /game/{id}; each read would otherwise cost a games row plus its move log.
+The routes read through this cache and write through it: every write goes to
+SQLite first and the cached copy is then replaced by the written state.
+
+Cached games carry the version the database assigned to them (see
+database._update_state), and a put never replaces a newer copy with an older
+one, so a slow read that raced a write cannot resurrect stale state. Another
+worker's writes are not seen here; the routes check each hit against the
+version in the database (a single indexed lookup) and reload on a mismatch.
+Entries also expire after a TTL, so idle games don't linger.
+"""
+
+import copy
+import time
+from collections import OrderedDict
+
+from .config import GAME_CACHE_SIZE, GAME_CACHE_TTL_SECONDS
+
+
+class GameStateCache:
+    def __init__(
+        self,
+        *,
+        max_size: int = GAME_CACHE_SIZE,
+        ttl_seconds: float = GAME_CACHE_TTL_SECONDS,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        # game id -> (game dict, stored_at)
+        self._entries: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, game_id: str) -> dict | None:
+        """A private copy of the cached game, or None on a miss."""
+        entry = self._entries.get(game_id)
+        if entry is not None and time.monotonic() - entry[1] > self.ttl_seconds:
+            del self._entries[game_id]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(game_id)
+        return copy.deepcopy(entry[0])
+
+    def put(self, game: dict):
+        """Cache game unless a newer version of it is already cached."""
+        cached = self._entries.get(game["id"])
+        if cached is not None and cached[0].get("version", 0) > game.get("version", 0):
+            return
+        self._entries[game["id"]] = (copy.deepcopy(game), time.monotonic())
+        self._entries.move_to_end(game["id"])
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, game_id: str):
+        self._entries.pop(game_id, None)
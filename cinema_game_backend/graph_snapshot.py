@@ -0,0 +1,543 @@
+"""Local actor–movie graph snapshot for offline puzzle generation.
+
+A snapshot is a directory holding the bipartite actor/movie graph crawled
+from TMDb (normally through the TMDb cache):
+
+  actor_ids.npy, movie_ids.npy       sorted TMDb ids; an id's position is its
+                                     index in every other array
+  actor_movies_indptr/indices.npy    CSR adjacency actor -> movies, each
+                                     actor's movies by descending popularity
+  movie_cast_indptr/indices.npy      CSR adjacency movie -> actors, in billing
+                                     order
+  actor_popularity.npy               TMDb popularity per actor
+  movie_accept_<difficulty>.npy      whether MOVIE_FILTERS[difficulty] accepted
+                                     the movie when the snapshot was built
+  metadata.sqlite                    names, years and image URLs
+
+The arrays are memory-mapped, so opening a snapshot is cheap and pages are
+shared between workers. generate_puzzle_from_snapshot walks the graph
+in-process the same way puzzle_agent walks TMDb, and measures each puzzle's
+real distance with pathfinding.shortest_path; TMDb is only used when
+building or refreshing the snapshot (see scripts/build_graph_snapshot.py).
+Filter masks are computed at build time, so rebuild after changing
+MOVIE_FILTERS.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import shutil
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+
+import numpy as np
+from art_graph.cinema_data_providers.filters import MovieFilter
+from art_graph.cinema_data_providers.tmdb.client import TMDbClient
+
+from .config import (
+    DIFFICULTY_HOPS,
+    MAX_PUZZLE_ATTEMPTS,
+    MIN_ACTOR_POPULARITY,
+    MOVIE_FILTERS,
+)
+from .pathfinding import MIN_FALLBACK_MOVES, SnapshotGraph, min_moves_between
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Mirrors the live walk: TMDb's popular-people pages 1-5 (20 people each) are
+# the start-actor pool, get_person_movies(limit=20) bounds each actor's movies,
+# and cast lists are cut to the top-billed members the walk ever looks at.
+_START_POOL_SIZE = 100
+_MOVIES_PER_ACTOR = 20
+_CAST_PER_MOVIE = 20
+
+
+@dataclass
+class GraphData:
+    """An actor–movie graph in plain Python, as crawled from TMDb."""
+
+    # TMDb id -> {"name", "popularity", "profile_url"}
+    actors: dict[int, dict] = field(default_factory=dict)
+    # TMDb id -> {"title", "year", "popularity", "poster_url", "backdrop_url",
+    #             "accepted": {difficulty: bool}}
+    movies: dict[int, dict] = field(default_factory=dict)
+    # movie id -> actor ids in billing order
+    credits: dict[int, list[int]] = field(default_factory=dict)
+
+
+async def crawl_tmdb(
+    tmdb: TMDbClient,
+    *,
+    seed_pages: int = 5,
+    max_actors: int = 2000,
+    concurrency: int = 8,
+    movie_filters: dict[str, MovieFilter] = MOVIE_FILTERS,
+) -> GraphData:
+    """Breadth-first crawl outward from TMDb's popular people.
+
+    Each expanded actor costs a get_person_details and a get_person_movies
+    call, and each newly seen movie a get_movie_cast call; with a warm TMDb
+    cache none of these reach the network. Stops after max_actors actors
+    have been expanded.
+    """
+    data = GraphData()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(call):
+        async with semaphore:
+            return await call
+
+    queue: list[int] = []
+    seen: set[int] = set()
+    for page in range(1, seed_pages + 1):
+        for person in await tmdb.get_popular_people(page=page):
+            if person.id not in seen:
+                seen.add(person.id)
+                queue.append(person.id)
+
+    expanded = 0
+    while queue and expanded < max_actors:
+        batch = queue[: min(concurrency, max_actors - expanded)]
+        del queue[: len(batch)]
+        expanded += len(batch)
+
+        details, filmographies = await asyncio.gather(
+            asyncio.gather(*(limited(tmdb.get_person_details(a)) for a in batch)),
+            asyncio.gather(
+                *(
+                    limited(tmdb.get_person_movies(a, limit=_MOVIES_PER_ACTOR))
+                    for a in batch
+                )
+            ),
+        )
+        for person in details:
+            if person is not None:
+                _record_actor(data, person, person.popularity)
+
+        new_movies = []
+        for movies in filmographies:
+            for movie in movies:
+                if movie.id not in data.movies:
+                    data.movies[movie.id] = {
+                        "title": movie.title,
+                        "year": movie.year,
+                        "popularity": movie.popularity,
+                        "poster_url": movie.poster_url,
+                        "backdrop_url": movie.backdrop_url,
+                        "accepted": {
+                            d: movie_filter.accepts(movie)
+                            for d, movie_filter in movie_filters.items()
+                        },
+                    }
+                    new_movies.append(movie.id)
+
+        casts = await asyncio.gather(
+            *(limited(tmdb.get_movie_cast(m)) for m in new_movies)
+        )
+        for movie_id, cast in zip(new_movies, casts):
+            cast = cast[:_CAST_PER_MOVIE]
+            # An actor credited twice (e.g. a dual role) is one edge.
+            data.credits[movie_id] = list(dict.fromkeys(c.id for c in cast))
+            for member in cast:
+                if member.id not in data.actors:
+                    _record_actor(data, member, None)
+                if member.id not in seen:
+                    seen.add(member.id)
+                    queue.append(member.id)
+
+    return data
+
+
+def _record_actor(data: GraphData, person, popularity: float | None):
+    entry = data.actors.setdefault(
+        person.id,
+        {"name": person.name, "popularity": 0.0, "profile_url": person.profile_url},
+    )
+    if popularity is not None:
+        entry["popularity"] = popularity
+    if entry["profile_url"] is None:
+        entry["profile_url"] = person.profile_url
+
+
+def write_snapshot(directory: str, data: GraphData):
+    """Write data as a snapshot, replacing any snapshot already at directory.
+
+    The new snapshot is assembled next to the old one and swapped in with
+    renames, so a reader never sees a half-written directory.
+    """
+    credits = {m: cast for m, cast in data.credits.items() if m in data.movies}
+    actor_ids = np.array(
+        sorted({a for cast in credits.values() for a in cast}), dtype=np.int64
+    )
+    movie_ids = np.array(sorted(credits), dtype=np.int64)
+
+    movie_popularity = np.array(
+        [data.movies[m]["popularity"] for m in movie_ids.tolist()], dtype=np.float32
+    )
+    actor_popularity = np.array(
+        [data.actors.get(a, {}).get("popularity", 0.0) for a in actor_ids.tolist()],
+        dtype=np.float32,
+    )
+
+    cast_lists = [
+        np.searchsorted(actor_ids, np.array(credits[m], dtype=np.int64))
+        for m in movie_ids.tolist()
+    ]
+    movie_cast_indptr, movie_cast_indices = _to_csr(cast_lists)
+
+    # Invert movie -> cast into actor -> movies, ordered like
+    # get_person_movies: most popular first.
+    owners = np.repeat(np.arange(len(movie_ids)), np.diff(movie_cast_indptr))
+    order = np.lexsort((-movie_popularity[owners], movie_cast_indices))
+    actor_movies_indices = owners[order]
+    actor_movies_indptr = np.zeros(len(actor_ids) + 1, dtype=np.int64)
+    np.cumsum(
+        np.bincount(movie_cast_indices, minlength=len(actor_ids)),
+        out=actor_movies_indptr[1:],
+    )
+
+    difficulties = sorted(
+        {d for m in data.movies.values() for d in m.get("accepted", {})}
+    )
+    arrays = {
+        "actor_ids": actor_ids,
+        "movie_ids": movie_ids,
+        "actor_movies_indptr": actor_movies_indptr,
+        "actor_movies_indices": actor_movies_indices.astype(np.int32),
+        "movie_cast_indptr": movie_cast_indptr,
+        "movie_cast_indices": movie_cast_indices.astype(np.int32),
+        "actor_popularity": actor_popularity,
+    }
+    for d in difficulties:
+        arrays[f"movie_accept_{d}"] = np.array(
+            [data.movies[m]["accepted"].get(d, False) for m in movie_ids.tolist()],
+            dtype=bool,
+        )
+
+    directory = os.path.abspath(directory)
+    staging = f"{directory}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    for name, array in arrays.items():
+        np.save(os.path.join(staging, f"{name}.npy"), array)
+
+    conn = sqlite3.connect(os.path.join(staging, "metadata.sqlite"))
+    conn.executescript("""
+        CREATE TABLE info (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        CREATE TABLE actors (
+            idx INTEGER PRIMARY KEY,
+            id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            profile_url TEXT
+        );
+        CREATE TABLE movies (
+            idx INTEGER PRIMARY KEY,
+            id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            year TEXT,
+            poster_url TEXT,
+            backdrop_url TEXT
+        );
+    """)
+    conn.executemany(
+        "INSERT INTO info VALUES (?, ?)",
+        [
+            ("format_version", str(SNAPSHOT_FORMAT_VERSION)),
+            ("built_at", str(time.time())),
+            ("difficulties", ",".join(difficulties)),
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO actors VALUES (?, ?, ?, ?)",
+        (
+            (i, a, data.actors[a]["name"], data.actors[a]["profile_url"])
+            if a in data.actors
+            else (i, a, str(a), None)
+            for i, a in enumerate(actor_ids.tolist())
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO movies VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            (
+                i,
+                m,
+                data.movies[m]["title"],
+                data.movies[m]["year"],
+                data.movies[m]["poster_url"],
+                data.movies[m]["backdrop_url"],
+            )
+            for i, m in enumerate(movie_ids.tolist())
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+    previous = f"{directory}.old"
+    shutil.rmtree(previous, ignore_errors=True)
+    if os.path.exists(directory):
+        os.rename(directory, previous)
+    os.rename(staging, directory)
+    shutil.rmtree(previous, ignore_errors=True)
+
+
+def _to_csr(rows: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(r) for r in rows], out=indptr[1:])
+    indices = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+    return indptr, indices.astype(np.int64)
+
+
+class GraphSnapshot:
+    """A snapshot directory opened read-only, with arrays memory-mapped."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+        def load(name):
+            return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+
+        self._conn = sqlite3.connect(
+            f"file:{os.path.join(directory, 'metadata.sqlite')}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+        )
+        info = dict(self._conn.execute("SELECT key, value FROM info").fetchall())
+        if int(info["format_version"]) != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(
+                f"Graph snapshot at {directory} has format version "
+                f"{info['format_version']}, expected {SNAPSHOT_FORMAT_VERSION}"
+            )
+        self.built_at = float(info["built_at"])
+        self.difficulties = tuple(d for d in info["difficulties"].split(",") if d)
+
+        self.actor_ids = load("actor_ids")
+        self.movie_ids = load("movie_ids")
+        self._actor_movies_indptr = load("actor_movies_indptr")
+        self._actor_movies_indices = load("actor_movies_indices")
+        self._movie_cast_indptr = load("movie_cast_indptr")
+        self._movie_cast_indices = load("movie_cast_indices")
+        self.actor_popularity = load("actor_popularity")
+        self._movie_accept = {d: load(f"movie_accept_{d}") for d in self.difficulties}
+
+    def close(self):
+        self._conn.close()
+
+    @property
+    def n_actors(self) -> int:
+        return len(self.actor_ids)
+
+    @property
+    def n_movies(self) -> int:
+        return len(self.movie_ids)
+
+    def actor_index(self, tmdb_id: int) -> int | None:
+        return _index_of(self.actor_ids, tmdb_id)
+
+    def movie_index(self, tmdb_id: int) -> int | None:
+        return _index_of(self.movie_ids, tmdb_id)
+
+    def actor_movies(self, actor: int) -> np.ndarray:
+        """Movie indices of an actor, most popular first."""
+        start, end = self._actor_movies_indptr[actor : actor + 2]
+        return self._actor_movies_indices[start:end]
+
+    def movie_cast(self, movie: int) -> np.ndarray:
+        """Actor indices of a movie's cast, in billing order."""
+        start, end = self._movie_cast_indptr[movie : movie + 2]
+        return self._movie_cast_indices[start:end]
+
+    def expand_actors(self, actors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Movies of every actor in actors, as (movies, actor each came from)."""
+        return _expand(self._actor_movies_indptr, self._actor_movies_indices, actors)
+
+    def expand_movies(self, movies: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Cast of every movie in movies, as (actors, movie each came from)."""
+        return _expand(self._movie_cast_indptr, self._movie_cast_indices, movies)
+
+    def movie_accepted(self, difficulty: str) -> np.ndarray | None:
+        """Per-movie filter mask for difficulty, or None if none was built."""
+        return self._movie_accept.get(difficulty)
+
+    @cached_property
+    def popular_actors(self) -> np.ndarray:
+        """Start-actor pool: the most popular actors, most popular first."""
+        order = np.argsort(-np.asarray(self.actor_popularity), kind="stable")
+        return order[:_START_POOL_SIZE]
+
+    def actor(self, actor: int) -> dict:
+        row = self._conn.execute(
+            "SELECT id, name, profile_url FROM actors WHERE idx = ?", (int(actor),)
+        ).fetchone()
+        return {"type": "actor", "name": row[1], "id": row[0], "profile_url": row[2]}
+
+    def movie(self, movie: int) -> dict:
+        row = self._conn.execute(
+            "SELECT id, title, year, poster_url, backdrop_url FROM movies "
+            "WHERE idx = ?",
+            (int(movie),),
+        ).fetchone()
+        return {
+            "type": "movie",
+            "title": row[1],
+            "id": row[0],
+            "year": row[2],
+            "poster_url": row[3],
+            "backdrop_url": row[4],
+        }
+
+
+def _expand(
+    indptr: np.ndarray, indices: np.ndarray, rows: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Concatenated CSR rows, plus the row each entry belongs to."""
+    starts = np.asarray(indptr[rows])
+    counts = np.asarray(indptr[rows + 1]) - starts
+    total = int(counts.sum())
+    if not total:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    positions = np.repeat(starts, counts) + offsets
+    return np.asarray(indices[positions], dtype=np.int64), np.repeat(rows, counts)
+
+
+def _index_of(sorted_ids: np.ndarray, tmdb_id: int) -> int | None:
+    i = int(np.searchsorted(sorted_ids, tmdb_id))
+    if i < len(sorted_ids) and sorted_ids[i] == tmdb_id:
+        return i
+    return None
+
+
+def open_snapshot(directory: str | None) -> GraphSnapshot | None:
+    """Open the snapshot at directory, or return None if there isn't one."""
+    if not directory:
+        return None
+    if not os.path.isdir(directory):
+        logger.warning(
+            "No graph snapshot at %s; puzzles will be generated from TMDb",
+            directory,
+        )
+        return None
+    return GraphSnapshot(directory)
+
+
+def _walk(
+    snapshot: GraphSnapshot,
+    start: int,
+    hops: int,
+    min_popularity: float,
+    no_repeat_movies: bool,
+    accepted: np.ndarray | None,
+    rng: random.Random,
+) -> list[tuple[int, int]] | None:
+    """In-process equivalent of puzzle_agent._random_walk.
+
+    Returns [(movie, actor), ...] for each hop, or None on a dead end.
+    """
+    steps = []
+    used: set[int] = set()
+    current = start
+    for hop in range(hops):
+        movies = snapshot.actor_movies(current)[:_MOVIES_PER_ACTOR]
+        if accepted is not None:
+            filtered = movies[accepted[movies]]
+            movies = filtered if len(filtered) else movies
+        if no_repeat_movies and used:
+            movies = movies[~np.isin(movies, list(used))]
+        if not len(movies):
+            return None
+        movie = int(rng.choice(movies[:10]))
+        used.add(movie)
+
+        cast = snapshot.movie_cast(movie)
+        cast = cast[cast != current]
+        if not len(cast):
+            return None
+
+        if hop == hops - 1:
+            candidates = cast[:10]
+            popularity = snapshot.actor_popularity[candidates]
+            eligible = candidates[popularity >= min_popularity]
+            if len(eligible):
+                current = int(rng.choice(eligible))
+            else:
+                current = int(candidates[int(np.argmax(popularity))])
+        else:
+            current = int(rng.choice(cast[:15]))
+        steps.append((movie, current))
+    return steps
+
+
+async def generate_puzzle_from_snapshot(
+    snapshot: GraphSnapshot,
+    difficulty: str = "medium",
+    rng: random.Random | None = None,
+) -> dict:
+    """Generate a puzzle by walking the snapshot; same contract as generate_puzzle.
+
+    min_moves is the shortest distance between the two actors in the
+    snapshot (see pathfinding.min_moves_between). Walks whose distance is
+    below the difficulty's DIFFICULTY_HOPS floor are retried; if no attempt
+    reaches the floor, the most distant one is used. Raises RuntimeError if
+    no usable walk is found in MAX_PUZZLE_ATTEMPTS tries.
+    """
+    rng = rng or random.Random()
+    hop_range = DIFFICULTY_HOPS.get(difficulty, (3, 5))
+    hops = rng.randint(*hop_range)
+    min_pop = MIN_ACTOR_POPULARITY.get(difficulty, 4)
+    accepted = snapshot.movie_accepted(difficulty)
+    # Players may use any movie, so distances are measured on the full graph.
+    graph = SnapshotGraph(snapshot)
+
+    pool = snapshot.popular_actors
+    eligible = pool[snapshot.actor_popularity[pool] >= min_pop]
+    starts = eligible if len(eligible) else pool
+    if not len(starts):
+        raise RuntimeError("Graph snapshot is empty.")
+
+    best = None
+    for _ in range(MAX_PUZZLE_ATTEMPTS):
+        start = int(rng.choice(starts))
+        steps = _walk(
+            snapshot,
+            start,
+            hops,
+            min_pop,
+            no_repeat_movies=difficulty == "easy",
+            accepted=accepted,
+            rng=rng,
+        )
+        if not steps:
+            continue
+        min_moves = await min_moves_between(graph, start, steps[-1][1], hops)
+        if min_moves < MIN_FALLBACK_MOVES:
+            continue
+        if best is None or min_moves > best[0]:
+            best = (min_moves, start, steps)
+        if min_moves >= hop_range[0]:
+            break
+
+    if best is None:
+        raise RuntimeError(
+            f"Failed to generate a valid {difficulty} puzzle from the graph "
+            f"snapshot after {MAX_PUZZLE_ATTEMPTS} attempts."
+        )
+    min_moves, start, steps = best
+
+    path = [snapshot.actor(start)]
+    for movie, actor in steps:
+        path.append(snapshot.movie(movie))
+        path.append(snapshot.actor(actor))
+    start_step, end_step = path[0], path[-1]
+    return {
+        "start_actor": {k: start_step[k] for k in ("name", "id", "profile_url")},
+        "end_actor": {k: end_step[k] for k in ("name", "id", "profile_url")},
+        "difficulty": difficulty,
+        "min_moves": min_moves,
+        "known_solution": path,
+    }
@@ -0,0 +1,38 @@
+"""Async, deadline-bounded calls to the LLM provider.
+
+The reusable-llm-provider client is synchronous, so calling it from a route
+handler would stall the whole uvicorn worker for as long as the provider
+takes to answer. invoke_json_async runs the call on a dedicated thread pool
+(or awaits the provider's own ainvoke_json, if it has one) and gives up after
+a hard deadline, so callers can carry on without the LLM.
+"""
+
+import asyncio
+import functools
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import LLM_POOL_SIZE, LLM_TIMEOUT_SECONDS
+
+# Sized separately from the database pool so slow LLM calls can never starve
+# game-state reads and writes. A call that overruns its deadline keeps its
+# thread until the provider returns; later calls queue behind it, and time
+# spent queued counts against their own deadline.
+_executor = ThreadPoolExecutor(max_workers=LLM_POOL_SIZE, thread_name_prefix="llm")
+
+
+async def invoke_json_async(llm, prompt: str, timeout: float = LLM_TIMEOUT_SECONDS):
+    """Call llm.invoke_json(prompt) without blocking the event loop.
+
+    Raises TimeoutError if no answer arrives within timeout seconds; any
+    exception from the provider propagates unchanged.
+    """
+    native = getattr(llm, "ainvoke_json", None)
+    if inspect.iscoroutinefunction(native):
+        call = native(prompt)
+    else:
+        loop = asyncio.get_running_loop()
+        call = loop.run_in_executor(
+            _executor, functools.partial(llm.invoke_json, prompt)
+        )
+    return await asyncio.wait_for(call, timeout=timeout)
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -9,10 +10,23 @@ from .config import (
     NEXTAUTH_SECRET,
     INTERNAL_SECRET,
     BETA_SEED_EMAILS,
+    PUZZLE_POOL_SIZE,
+    GRAPH_SNAPSHOT_PATH,
+    GAME_CACHE_SIZE,
+    TMDB_CACHE_DISABLE,
+    TMDB_WARMUP,
 )
-from .database import init_db, seed_beta_users
+from .database import init_db, seed_beta_users, close_db_pool
+from .game_cache import GameStateCache
+from .graph_snapshot import open_snapshot
+from .name_match_cache import NameMatchCache
+from .path_solver import PathSolver
+from .popularity_cache import PopularityCache
+from .puzzle_pool import PuzzlePool
 from .routes.game import router as game_router
+from .routes.pool import router as pool_router
 from .routes.auth import router as auth_router
+from .tmdb_warmup import warm_tmdb_cache
 
 logger = logging.getLogger(__name__)
 
@@ -36,7 +50,37 @@ async def lifespan(app: FastAPI):
             "No LLM provider configured — nickname resolution disabled. "
             "Set ANTHROPIC_API_KEY to enable LLM fallback for name matching."
         )
+    app.state.name_cache = NameMatchCache()
+    app.state.game_cache = GameStateCache() if GAME_CACHE_SIZE > 0 else None
+    app.state.popularity_cache = PopularityCache()
+    app.state.graph_snapshot = open_snapshot(GRAPH_SNAPSHOT_PATH)
+    app.state.path_solver = PathSolver(app.state.tmdb, app.state.graph_snapshot)
+    app.state.puzzle_pool = None
+    if PUZZLE_POOL_SIZE > 0:
+        app.state.puzzle_pool = PuzzlePool(
+            app.state.tmdb,
+            popularity_cache=app.state.popularity_cache,
+            snapshot=app.state.graph_snapshot,
+        )
+        app.state.puzzle_pool.start()
+    # Warm the TMDb cache in the background so startup isn't held up by it.
+    app.state.tmdb_warmup = None
+    if TMDB_WARMUP and not TMDB_CACHE_DISABLE:
+        app.state.tmdb_warmup = asyncio.create_task(
+            warm_tmdb_cache(
+                app.state.tmdb, popularity_cache=app.state.popularity_cache
+            ),
+            name="tmdb-warmup",
+        )
     yield
+    if app.state.tmdb_warmup is not None:
+        app.state.tmdb_warmup.cancel()
+        await asyncio.gather(app.state.tmdb_warmup, return_exceptions=True)
+    if app.state.puzzle_pool is not None:
+        await app.state.puzzle_pool.stop()
+    if app.state.graph_snapshot is not None:
+        app.state.graph_snapshot.close()
+    close_db_pool()
 
 
 app = FastAPI(title="Cinema Game API", version="2.0.0", lifespan=lifespan)
@@ -58,6 +102,7 @@ app.add_middleware(
 
 app.include_router(game_router)
 app.include_router(auth_router)
+app.include_router(pool_router)
 
 
 @app.get("/health")
@@ -1,13 +1,24 @@
-"""Fuzzy name matching for player-typed actor names against TMDb cast lists."""
+"""Fuzzy matching of player-typed actor names and movie titles against TMDb data."""
 
 from dataclasses import dataclass
+from functools import cached_property
 
-from rapidfuzz import fuzz, process
+import numpy as np
+from rapidfuzz import fuzz, process, utils
 from rapidfuzz.distance import Levenshtein
 
 
 _MIN_SCORE = 85
 
+# Titles are compared whole (no partial matching), so "Batman" does not match
+# "Batman Returns" but "Spiderman" still matches "Spider-Man".
+_MIN_TITLE_SCORE = 90
+
+# Casts at least this large are gated with one vectorized rapidfuzz cdist call
+# instead of a Python loop over _effective_distance. Below it, numpy call
+# overhead outweighs the loop (see scripts/benchmark_cast_gate.py).
+_BATCH_GATE_MIN_CAST = 32
+
 
 @dataclass
 class ActorMatch:
@@ -25,10 +36,14 @@ def _effective_distance(query: str, candidate: str) -> int:
     Tries full-string, last-name-only, and token-pair comparisons to handle
     partial names, last-name-only queries, and abbreviated first names.
     """
-    d = Levenshtein.distance(query, candidate)
+    return _parts_distance(query, query.split(), candidate, candidate.split())
 
-    q_parts = query.split()
-    c_parts = candidate.split()
+
+def _parts_distance(
+    query: str, q_parts: list[str], candidate: str, c_parts: list[str]
+) -> int:
+    """_effective_distance on already-split names."""
+    d = Levenshtein.distance(query, candidate)
 
     # Single-token query: compare against candidate's last name
     if len(q_parts) == 1 and c_parts:
@@ -46,6 +61,146 @@ def _effective_distance(query: str, candidate: str) -> int:
     return d
 
 
+class CastIndex:
+    """A cast list preprocessed once for repeated fuzzy lookups.
+
+    Holds each name normalized and split into tokens, its first and last
+    tokens, and an exact-match table from normalized name to the first cast
+    name with that normalization. Building one per cast lets both actors of a
+    move (and repeat moves on the same movie) skip re-normalizing the cast.
+    """
+
+    def __init__(self, cast_names: list[str]):
+        self.names = list(cast_names)
+        self.normalized = [_normalize(n) for n in self.names]
+        self.tokens = [n.split() for n in self.normalized]
+        self.first_names = [t[0] if t else "" for t in self.tokens]
+        self.last_names = [t[-1] if t else "" for t in self.tokens]
+        self.exact: dict[str, str] = {}
+        for name, norm in zip(self.names, self.normalized):
+            self.exact.setdefault(norm, name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def match(self, query: str, max_distance: int = 3) -> ActorMatch | None:
+        """Find the best match for a player-typed actor name in this cast.
+
+        Same rules as find_actor_in_cast.
+        """
+        query_norm = _normalize(query)
+        if not query_norm or not self.names:
+            return None
+
+        # Exact match — skip fuzzy logic entirely
+        if query_norm in self.exact:
+            return ActorMatch(matched_name=self.exact[query_norm])
+
+        # Gate: only consider candidates within Levenshtein threshold
+        q_parts = query_norm.split()
+        if len(self.names) >= _BATCH_GATE_MIN_CAST:
+            survivors = self.gate_batched(query_norm, q_parts, max_distance)
+        else:
+            survivors = self.gate_scalar(query_norm, q_parts, max_distance)
+        return self._best_scoring(query_norm, survivors)
+
+    def gate_scalar(
+        self, query_norm: str, q_parts: list[str], max_distance: int
+    ) -> list[int]:
+        """Indices of cast members within max_distance, one name at a time."""
+        return [
+            i
+            for i, (norm, parts) in enumerate(zip(self.normalized, self.tokens))
+            if _parts_distance(query_norm, q_parts, norm, parts) <= max_distance
+        ]
+
+    def gate_batched(
+        self, query_norm: str, q_parts: list[str], max_distance: int
+    ) -> list[int]:
+        """Same result as gate_scalar, computed for the whole cast at once.
+
+        One cdist call scores the query (and its first/last tokens) against
+        every distinct full name, first name and last name in the cast, and
+        numpy combines the columns per member the way _parts_distance does.
+        score_cutoff clips distances above max_distance to max_distance + 1,
+        which cannot change any comparison against max_distance.
+        """
+        multi_token = len(q_parts) >= 2
+        queries = [query_norm, q_parts[-1], q_parts[0]] if multi_token else [query_norm]
+        dist = process.cdist(
+            queries,
+            self._vocab.strings,
+            scorer=Levenshtein.distance,
+            score_cutoff=max_distance,
+        )
+        d = dist[0, self._vocab.name_cols]
+
+        if not multi_token:
+            last_d = dist[0, self._vocab.last_cols]
+            d = np.where(self._vocab.has_tokens, np.minimum(d, last_d), d)
+        else:
+            last_d = dist[1, self._vocab.last_cols]
+            first_d = dist[2, self._vocab.first_cols]
+            # Prefix match on first name, in either direction
+            q_first = q_parts[0]
+            first_names = self._vocab.first_names
+            is_prefix = np.char.startswith(first_names, q_first) | np.isin(
+                first_names, [q_first[:k] for k in range(len(q_first) + 1)]
+            )
+            first_d = np.where(is_prefix, 0, first_d)
+            d = np.where(self._vocab.multi_token, np.minimum(d, last_d + first_d), d)
+
+        return np.flatnonzero(d <= max_distance).tolist()
+
+    @cached_property
+    def _vocab(self) -> "_CastVocabulary":
+        return _CastVocabulary(self)
+
+    def _best_scoring(self, query_norm: str, survivors: list[int]) -> ActorMatch | None:
+        """Pick the gate survivor rapidfuzz scores highest, if any clears _MIN_SCORE."""
+        if not survivors:
+            return None
+
+        normed_to_original = {self.normalized[i]: self.names[i] for i in survivors}
+        result = process.extractOne(
+            query_norm,
+            list(normed_to_original.keys()),
+            scorer=fuzz.WRatio,
+            score_cutoff=_MIN_SCORE,
+        )
+
+        if result is None:
+            return None
+
+        matched_norm = result[0]
+        return ActorMatch(matched_name=normed_to_original[matched_norm])
+
+
+class _CastVocabulary:
+    """Column layout for CastIndex.gate_batched.
+
+    Every distinct full name, first name and last name gets one column; the
+    *_cols arrays map each cast member to its columns.
+    """
+
+    def __init__(self, index: CastIndex):
+        columns: dict[str, int] = {}
+
+        def cols(strings: list[str]) -> np.ndarray:
+            return np.array(
+                [columns.setdefault(s, len(columns)) for s in strings], dtype=np.intp
+            )
+
+        self.name_cols = cols(index.normalized)
+        self.first_cols = cols(index.first_names)
+        self.last_cols = cols(index.last_names)
+        self.strings = list(columns)
+        self.first_names = np.array(index.first_names, dtype=str)
+        token_counts = np.array([len(t) for t in index.tokens])
+        self.has_tokens = token_counts >= 1
+        self.multi_token = token_counts >= 2
+
+
 def find_actor_in_cast(
     query: str,
     cast_names: list[str],
@@ -56,38 +211,25 @@ def find_actor_in_cast(
     Uses Levenshtein distance as a gate to filter candidates, then
     rapidfuzz scoring to select the best match among those that pass.
 
-    Returns None if no match is found within the threshold.
+    Returns None if no match is found within the threshold. To look up
+    several names against one cast, build a CastIndex once and call match.
     """
-    query_norm = _normalize(query)
-    if not query_norm or not cast_names:
-        return None
+    return CastIndex(cast_names).match(query, max_distance)
 
-    # Exact match — skip fuzzy logic entirely
-    for name in cast_names:
-        if _normalize(name) == query_norm:
-            return ActorMatch(matched_name=name)
 
-    # Gate: only consider candidates within Levenshtein threshold
-    candidates = []
-    for name in cast_names:
-        d = _effective_distance(query_norm, _normalize(name))
-        if d <= max_distance:
-            candidates.append(name)
+def match_title(query: str, titles: list[str]) -> int | None:
+    """Index of the title a player-typed movie title most likely means.
 
-    if not candidates:
+    Case and punctuation are ignored. Returns None if no title scores at
+    least _MIN_TITLE_SCORE; ties go to the earliest title.
+    """
+    if not titles:
         return None
-
-    # Score surviving candidates with rapidfuzz
-    normed_to_original = {_normalize(n): n for n in candidates}
     result = process.extractOne(
-        query_norm,
-        list(normed_to_original.keys()),
-        scorer=fuzz.WRatio,
-        score_cutoff=_MIN_SCORE,
+        query,
+        titles,
+        scorer=fuzz.ratio,
+        processor=utils.default_process,
+        score_cutoff=_MIN_TITLE_SCORE,
     )
-
-    if result is None:
-        return None
-
-    matched_norm = result[0]
-    return ActorMatch(matched_name=normed_to_original[matched_norm])
+    return result[2] if result is not None else None
@@ -59,6 +59,8 @@ class Move(BaseModel):
     backdrop_url: str | None = None
     from_actor_id: int | None = None
     to_actor_id: int | None = None
+    from_actor_profile_url: str | None = None
+    to_actor_profile_url: str | None = None
 
 
 class GameState(BaseModel):
@@ -100,6 +102,13 @@ class MoveResponse(BaseModel):
     strikes: int = 0
 
 
+class HintResponse(BaseModel):
+    movie: MovieStep
+    next_actor: Actor
+    moves_remaining: int
+    source: Literal["shortest_path", "known_solution"]
+
+
 class UndoResponse(BaseModel):
     current_actor: Actor
     moves: list[Move]
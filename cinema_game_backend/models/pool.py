@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+
+
+class DifficultyPoolStats(BaseModel):
+    available: int
+    hits: int
+    misses: int
+    generated: int
+    failed: int
+
+
+class PuzzlePoolStats(BaseModel):
+    enabled: bool
+    size: int = 0
+    low_water: int = 0
+    concurrency: int = 0
+    difficulties: dict[str, DifficultyPoolStats] = {}
@@ -0,0 +1,112 @@
+"""Two-tier cache for LLM name-resolution results.
+
+Players keep typing the same nicknames ("Larry Fishburne", "Leo") against
+the same popular casts, and each fuzzy miss would otherwise cost an LLM
+round-trip. Results are keyed by the normalized query plus a fingerprint of
+the cast list, and negative results ("no cast member matches") are cached
+too. Lookups check a small in-process LRU first, then the llm_name_matches
+table in the game database, which survives restarts and makes validation
+deterministic across replays.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from .config import (
+    LLM_NAME_CACHE_MAX_ROWS,
+    LLM_NAME_CACHE_MEMORY_SIZE,
+    LLM_NAME_CACHE_TTL_SECONDS,
+)
+from .database import get_name_match, put_name_match
+
+
+@dataclass(frozen=True)
+class CachedNameMatch:
+    """A cached LLM answer; matched_name is None for a cached "no match"."""
+
+    matched_name: str | None
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def cast_fingerprint(cast_names: list[str]) -> str:
+    """Order-independent hash of a cast list."""
+    digest = hashlib.sha256("\n".join(sorted(cast_names)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class NameMatchCache:
+    def __init__(
+        self,
+        *,
+        memory_size: int = LLM_NAME_CACHE_MEMORY_SIZE,
+        max_rows: int = LLM_NAME_CACHE_MAX_ROWS,
+        ttl_seconds: float = LLM_NAME_CACHE_TTL_SECONDS,
+        persistent: bool = True,
+    ):
+        self.memory_size = memory_size
+        self.max_rows = max_rows
+        self.ttl_seconds = ttl_seconds
+        self.persistent = persistent
+        # key -> (matched_name, created_at)
+        self._memory: OrderedDict[tuple[str, str], tuple[str | None, float]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        # The database tier is trimmed every trim_interval stores, a tenth of
+        # max_rows, rather than counted on every one.
+        self.trim_interval = max(1, max_rows // 10)
+        self._stores_until_trim = 1
+
+    def lookup(self, query: str, cast_names: list[str]) -> CachedNameMatch | None:
+        """Return the cached answer for query against this cast, or None."""
+        key = (normalize_query(query), cast_fingerprint(cast_names))
+        now = time.time()
+        min_created_at = now - self.ttl_seconds
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[1] >= min_created_at:
+                    self._memory.move_to_end(key)
+                    return CachedNameMatch(entry[0])
+                del self._memory[key]
+
+        if not self.persistent:
+            return None
+        row = get_name_match(*key, min_created_at=min_created_at, now=now)
+        if row is None:
+            return None
+        self._remember(key, row["matched_name"], row["created_at"])
+        return CachedNameMatch(row["matched_name"])
+
+    def store(self, query: str, cast_names: list[str], matched_name: str | None):
+        key = (normalize_query(query), cast_fingerprint(cast_names))
+        now = time.time()
+        self._remember(key, matched_name, now)
+        if self.persistent:
+            with self._lock:
+                self._stores_until_trim -= 1
+                trim = self._stores_until_trim <= 0
+                if trim:
+                    self._stores_until_trim = self.trim_interval
+            put_name_match(
+                *key,
+                matched_name,
+                now=now,
+                min_created_at=now - self.ttl_seconds,
+                max_rows=self.max_rows,
+                trim=trim,
+            )
+
+    def _remember(self, key, matched_name: str | None, created_at: float):
+        with self._lock:
+            self._memory[key] = (matched_name, created_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
@@ -0,0 +1,113 @@
+"""Memoized shortest paths between actors, for mid-game hints.
+
+PathSolver answers "what is a shortest path from this actor to the end
+actor?" using only movies the difficulty's MOVIE_FILTERS accept, so hints
+point at recognisable films. It searches the graph snapshot when one is
+loaded and covers both actors, and TMDb (normally through its cache)
+otherwise.
+
+Results are memoized per (difficulty, actor, target), except for searches
+a frontier limit cut short, whose "no path" is not an answer. Every suffix of a
+shortest path is itself a shortest path, so one search also answers the
+hint for each actor further along it: a player who follows the hints, or
+another player given the same pooled puzzle, never triggers a second search.
+"""
+
+from collections import OrderedDict
+
+from art_graph.cinema_data_providers.tmdb.client import TMDbClient
+
+from .config import (
+    HINT_CACHE_SIZE,
+    HINT_MAX_HOPS,
+    HINT_TMDB_MAX_FRONTIER,
+    MOVIE_FILTERS,
+    PATH_SEARCH_MAX_FRONTIER,
+)
+from .graph_snapshot import GraphSnapshot
+from .pathfinding import SnapshotGraph, TMDbGraph, shortest_path
+
+
+class PathSolver:
+    def __init__(
+        self,
+        tmdb: TMDbClient,
+        snapshot: GraphSnapshot | None = None,
+        *,
+        cache_size: int = HINT_CACHE_SIZE,
+        max_hops: int = HINT_MAX_HOPS,
+        max_frontier: int = PATH_SEARCH_MAX_FRONTIER,
+        tmdb_max_frontier: int = HINT_TMDB_MAX_FRONTIER,
+    ):
+        self._tmdb = tmdb
+        self._snapshot = snapshot
+        self.cache_size = cache_size
+        self.max_hops = max_hops
+        self.max_frontier = max_frontier
+        self.tmdb_max_frontier = tmdb_max_frontier
+        # (difficulty, actor id, target id) -> path steps, or None if a
+        # complete search found no path.
+        self._paths: OrderedDict[tuple[str, int, int], list[dict] | None] = (
+            OrderedDict()
+        )
+        self.searches = 0
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    async def shortest_path(
+        self, difficulty: str, actor: dict, target: dict
+    ) -> list[dict] | None:
+        """Steps of a shortest path from actor to target, as in known_solution.
+
+        actor and target are {"name", "id", "profile_url"} dicts, as stored
+        on a game. Returns None when no path within max_hops was found (or
+        the search hit its frontier limit first).
+        """
+        actor_id, target_id = actor["id"], target["id"]
+        key = (difficulty, actor_id, target_id)
+        if key in self._paths:
+            self._paths.move_to_end(key)
+            return self._paths[key]
+
+        self.searches += 1
+        path, complete = await self._search(difficulty, actor_id, target_id)
+        if path is None:
+            if complete:
+                self._remember(key, None)
+        else:
+            # The search roots may never have been fetched as cast members.
+            path[0] = {"type": "actor", **actor}
+            path[-1] = {"type": "actor", **target}
+            for i in range(0, len(path) - 2, 2):
+                self._remember((difficulty, path[i]["id"], target_id), path[i:])
+        return path
+
+    async def _search(
+        self, difficulty: str, actor_id: int, target_id: int
+    ) -> tuple[list[dict] | None, bool]:
+        """(path steps or None, whether the search ran to the hop cap)."""
+        graph = None
+        if self._snapshot is not None:
+            graph = SnapshotGraph(self._snapshot, difficulty)
+            start, end = graph.actor_key(actor_id), graph.actor_key(target_id)
+            max_frontier = self.max_frontier
+            if start is None or end is None:
+                graph = None
+        if graph is None:
+            graph = TMDbGraph(self._tmdb, MOVIE_FILTERS.get(difficulty))
+            start, end = actor_id, target_id
+            max_frontier = self.tmdb_max_frontier
+
+        result = await shortest_path(
+            graph, start, end, max_hops=self.max_hops, max_frontier=max_frontier
+        )
+        if result.path is None:
+            return None, result.complete
+        return [graph.step(kind, key) for kind, key in result.path], True
+
+    def _remember(self, key: tuple[str, int, int], path: list[dict] | None):
+        self._paths[key] = path
+        self._paths.move_to_end(key)
+        while len(self._paths) > self.cache_size:
+            self._paths.popitem(last=False)
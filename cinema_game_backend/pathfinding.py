@@ -0,0 +1,256 @@
+"""Shortest actor-to-actor paths over the actor–movie graph.
+
+shortest_path runs a bidirectional breadth-first search, always growing the
+smaller of the two frontiers, with a hop cap and a per-level frontier limit so
+its cost stays bounded. It works against either graph source:
+
+- SnapshotGraph: the local graph snapshot (see graph_snapshot.py), expanded
+  with vectorized CSR lookups; exact within the snapshot.
+- TMDbGraph: live (normally cached) TMDb lookups, each actor limited to
+  their most popular movies as in the puzzle walk; an upper bound on the true
+  distance, and far more expensive, so it gets a smaller frontier limit.
+
+Either graph can be restricted to the movies a difficulty's MOVIE_FILTERS
+accept.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+from art_graph.cinema_data_providers.filters import MovieFilter
+from art_graph.cinema_data_providers.tmdb.client import TMDbClient
+
+from .config import PATH_SEARCH_MAX_FRONTIER, PATH_SEARCH_MAX_HOPS
+
+if TYPE_CHECKING:
+    # graph_snapshot imports this module to measure the puzzles it generates.
+    from .graph_snapshot import GraphSnapshot
+
+ACTOR = "actor"
+MOVIE = "movie"
+
+# A puzzle whose real distance is below its difficulty floor is only used when
+# no attempt reached the floor, and never when the two actors share a movie.
+MIN_FALLBACK_MOVES = 2
+
+
+@dataclass(frozen=True)
+class PathSearchResult:
+    """Outcome of a shortest-path search.
+
+    path alternates (ACTOR, key), (MOVIE, key), ... from start to end, with
+    keys in the searched graph's own numbering, or is None if no path was
+    found. ruled_out_hops is the length below which no path exists: hops - 1
+    for a found path, otherwise as far as the search got. complete is False
+    when a frontier limit stopped the search before the hop cap.
+    """
+
+    path: list[tuple[str, int]] | None
+    ruled_out_hops: int
+    complete: bool = True
+
+    @property
+    def hops(self) -> int | None:
+        return None if self.path is None else len(self.path) // 2
+
+
+class SnapshotGraph:
+    """A GraphSnapshot as a search graph; keys are snapshot indices."""
+
+    def __init__(self, snapshot: "GraphSnapshot", difficulty: str | None = None):
+        self.snapshot = snapshot
+        self._accepted = snapshot.movie_accepted(difficulty) if difficulty else None
+
+    def actor_key(self, tmdb_id: int) -> int | None:
+        return self.snapshot.actor_index(tmdb_id)
+
+    def tmdb_id(self, kind: str, key: int) -> int:
+        ids = self.snapshot.actor_ids if kind == ACTOR else self.snapshot.movie_ids
+        return int(ids[key])
+
+    def step(self, kind: str, key: int) -> dict:
+        """The path step dict (as in known_solution) for a node."""
+        return self.snapshot.actor(key) if kind == ACTOR else self.snapshot.movie(key)
+
+    async def neighbors(
+        self, kind: str, keys: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        if kind == ACTOR:
+            movies, parents = self.snapshot.expand_actors(keys)
+            if self._accepted is not None:
+                keep = self._accepted[movies]
+                movies, parents = movies[keep], parents[keep]
+            return movies, parents
+        return self.snapshot.expand_movies(keys)
+
+
+class TMDbGraph:
+    """TMDb as a search graph; keys are TMDb ids.
+
+    Movies and cast members seen while searching are kept, so step() can
+    describe any node on a path found through this graph.
+    """
+
+    def __init__(
+        self,
+        tmdb: TMDbClient,
+        movie_filter: MovieFilter | None = None,
+        *,
+        movies_per_actor: int = 20,
+        concurrency: int = 8,
+    ):
+        self._tmdb = tmdb
+        self._movie_filter = movie_filter
+        self._movies_per_actor = movies_per_actor
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._seen: dict[tuple[str, int], object] = {}
+
+    def actor_key(self, tmdb_id: int) -> int:
+        return tmdb_id
+
+    def tmdb_id(self, kind: str, key: int) -> int:
+        return key
+
+    def step(self, kind: str, key: int) -> dict:
+        """The path step dict (as in known_solution) for a node seen so far."""
+        node = self._seen.get((kind, key))
+        if kind == MOVIE:
+            return {
+                "type": "movie",
+                "title": node.title,
+                "id": key,
+                "year": node.year,
+                "poster_url": node.poster_url,
+                "backdrop_url": node.backdrop_url,
+            }
+        return {
+            "type": "actor",
+            "name": node.name if node is not None else "",
+            "id": key,
+            "profile_url": node.profile_url if node is not None else None,
+        }
+
+    async def neighbors(
+        self, kind: str, keys: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        found_kind = MOVIE if kind == ACTOR else ACTOR
+
+        async def fetch(key: int) -> list[int]:
+            async with self._semaphore:
+                if kind == ACTOR:
+                    nodes = await self._tmdb.get_person_movies(
+                        key, limit=self._movies_per_actor
+                    )
+                    if self._movie_filter is not None:
+                        nodes = [m for m in nodes if self._movie_filter.accepts(m)]
+                else:
+                    nodes = await self._tmdb.get_movie_cast(key)
+            for node in nodes:
+                self._seen[(found_kind, node.id)] = node
+            return [node.id for node in nodes]
+
+        keys = keys.tolist()
+        results = await asyncio.gather(*(fetch(k) for k in keys))
+        neighbors = [n for result in results for n in result]
+        parents = [k for k, result in zip(keys, results) for _ in result]
+        return np.array(neighbors, dtype=np.int64), np.array(parents, dtype=np.int64)
+
+
+async def shortest_path(
+    graph,
+    start: int,
+    end: int,
+    *,
+    max_hops: int = PATH_SEARCH_MAX_HOPS,
+    max_frontier: int = PATH_SEARCH_MAX_FRONTIER,
+) -> PathSearchResult:
+    """Bidirectional BFS between two actor keys of graph.
+
+    A hop is actor -> movie -> actor. The search gives up once paths of up
+    to max_hops hops have been ruled out, or (incomplete) when the frontier
+    about to be expanded holds more than max_frontier nodes.
+    """
+    if start == end:
+        return PathSearchResult([(ACTOR, start)], ruled_out_hops=-1)
+
+    # levels[side][d] = (keys, parents) of the nodes first reached at depth
+    # d, keys sorted; even depths are actors, odd depths movies.
+    root = np.zeros(1, dtype=np.int64)
+    levels = [
+        [(np.array([start], dtype=np.int64), root)],
+        [(np.array([end], dtype=np.int64), root)],
+    ]
+
+    while len(levels[0]) + len(levels[1]) - 2 < 2 * max_hops:
+        side = 0 if len(levels[0][-1][0]) <= len(levels[1][-1][0]) else 1
+        ours, theirs = levels[side], levels[1 - side]
+        depth = len(ours) - 1
+        frontier = ours[-1][0]
+        ruled_out = (len(levels[0]) + len(levels[1]) - 2) // 2
+        if not len(frontier):
+            # This side's component is exhausted: no path at any length.
+            return PathSearchResult(None, ruled_out_hops=max_hops)
+        if len(frontier) > max_frontier:
+            return PathSearchResult(None, ruled_out_hops=ruled_out, complete=False)
+
+        neighbors, parents = await graph.neighbors(
+            ACTOR if depth % 2 == 0 else MOVIE, frontier
+        )
+        keys, first = np.unique(neighbors, return_index=True)
+        parents = parents[first]
+        # In a BFS of a bipartite graph, a neighbour of depth d is either
+        # new or was reached at depth d - 1.
+        if depth:
+            fresh = ~np.isin(keys, ours[-2][0], assume_unique=True)
+            keys, parents = keys[fresh], parents[fresh]
+        ours.append((keys, parents))
+
+        for their_depth in range((depth + 1) % 2, len(theirs), 2):
+            met = keys[np.isin(keys, theirs[their_depth][0], assume_unique=True)]
+            if len(met):
+                meeting = int(met[0])
+                forward = _trace(ours, depth + 1, meeting)
+                backward = _trace(theirs, their_depth, meeting)
+                if side == 1:
+                    forward, backward = backward, forward
+                path = forward[::-1] + backward[1:]
+                return PathSearchResult(path, ruled_out_hops=len(path) // 2 - 1)
+
+    return PathSearchResult(None, ruled_out_hops=max_hops)
+
+
+def _trace(levels, depth: int, key: int) -> list[tuple[str, int]]:
+    """The chain key, parent, grandparent, ... back to a search root."""
+    steps = []
+    for d in range(depth, -1, -1):
+        steps.append((ACTOR if d % 2 == 0 else MOVIE, key))
+        keys, parents = levels[d]
+        key = int(parents[np.searchsorted(keys, key)])
+    return steps
+
+
+async def min_moves_between(
+    graph,
+    start: int,
+    end: int,
+    walk_hops: int,
+    *,
+    max_hops: int = PATH_SEARCH_MAX_HOPS,
+    max_frontier: int = PATH_SEARCH_MAX_FRONTIER,
+) -> int:
+    """Fewest hops between two puzzle actors joined by a walk of walk_hops.
+
+    Exact when the shortest path is within the hop cap. Otherwise (or when a
+    frontier limit cuts the search short) the walk itself is the shortest
+    known path and walk_hops is returned.
+    """
+    result = await shortest_path(
+        graph,
+        start,
+        end,
+        max_hops=min(max_hops, walk_hops - 1),
+        max_frontier=max_frontier,
+    )
+    return walk_hops if result.path is None else result.hops
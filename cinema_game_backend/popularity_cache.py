@@ -0,0 +1,51 @@
+"""In-memory cache of TMDb person popularity scores for puzzle generation.
+
+The last hop of a random walk needs the popularity of up to ten cast members
+to pick a recognisable end actor, and otherwise costs one get_person_details
+request per candidate. Scores seen anywhere during generation (popular-people
+pages, earlier walks) are remembered here, so repeat candidates need no
+request at all. TMDb popularity is a daily trending score, so entries expire.
+"""
+
+import time
+from collections import OrderedDict
+
+from .config import POPULARITY_CACHE_SIZE, POPULARITY_CACHE_TTL_SECONDS
+
+
+class PopularityCache:
+    def __init__(
+        self,
+        *,
+        max_size: int = POPULARITY_CACHE_SIZE,
+        ttl_seconds: float = POPULARITY_CACHE_TTL_SECONDS,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        # person id -> (popularity, stored_at)
+        self._entries: OrderedDict[int, tuple[float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, person_id: int) -> float | None:
+        entry = self._entries.get(person_id)
+        if entry is None:
+            return None
+        popularity, stored_at = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[person_id]
+            return None
+        self._entries.move_to_end(person_id)
+        return popularity
+
+    def put(self, person_id: int, popularity: float):
+        self._entries[person_id] = (popularity, time.monotonic())
+        self._entries.move_to_end(person_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def record_people(self, people):
+        """Remember the popularity of every Person in people."""
+        for person in people:
+            self.put(person.id, person.popularity)
@@ -0,0 +1,158 @@
+"""Pre-generated puzzle pool, topped up by background asyncio workers.
+
+Generating a puzzle is a multi-hop TMDb random walk with retries, which is
+too slow to sit in front of /game/new. PuzzlePool keeps a stock of ready
+puzzles per difficulty in the game database and runs one refill worker per
+difficulty; new_game pops a puzzle in a single query and only generates one
+live when the pool has run dry.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from art_graph.cinema_data_providers.tmdb.client import TMDbClient
+
+from .agents.puzzle_agent import generate_puzzle
+from .config import (
+    DIFFICULTY_HOPS,
+    PUZZLE_POOL_CONCURRENCY,
+    PUZZLE_POOL_LOW_WATER,
+    PUZZLE_POOL_RECHECK_SECONDS,
+    PUZZLE_POOL_SIZE,
+)
+from .database import (
+    add_pooled_puzzle,
+    count_pooled_puzzles,
+    run_db,
+    take_pooled_puzzle,
+)
+from .graph_snapshot import GraphSnapshot
+from .popularity_cache import PopularityCache
+from .tmdb_scheduler import TMDbPriority, tmdb_priority
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DifficultyCounters:
+    """Running totals for one difficulty since the pool started."""
+
+    hits: int = 0
+    misses: int = 0
+    generated: int = 0
+    failed: int = 0
+
+
+class PuzzlePool:
+    def __init__(
+        self,
+        tmdb: TMDbClient,
+        *,
+        size: int = PUZZLE_POOL_SIZE,
+        low_water: int = PUZZLE_POOL_LOW_WATER,
+        concurrency: int = PUZZLE_POOL_CONCURRENCY,
+        recheck_seconds: float = PUZZLE_POOL_RECHECK_SECONDS,
+        difficulties: tuple[str, ...] = tuple(DIFFICULTY_HOPS),
+        popularity_cache: PopularityCache | None = None,
+        snapshot: GraphSnapshot | None = None,
+    ):
+        self._tmdb = tmdb
+        self._popularity_cache = popularity_cache
+        self._snapshot = snapshot
+        self.size = size
+        self.low_water = low_water
+        self.concurrency = concurrency
+        self.recheck_seconds = recheck_seconds
+        self.difficulties = difficulties
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._wakeups = {d: asyncio.Event() for d in difficulties}
+        self._counters = {d: DifficultyCounters() for d in difficulties}
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self):
+        """Start one refill worker per difficulty on the running loop."""
+        self._tasks = [
+            asyncio.create_task(self._refill_loop(d), name=f"puzzle-pool-{d}")
+            for d in self.difficulties
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def take(self, difficulty: str) -> dict | None:
+        """Pop a ready puzzle, or return None if the pool is empty."""
+        puzzle = await run_db(take_pooled_puzzle, difficulty)
+        counters = self._counters[difficulty]
+        if puzzle is None:
+            counters.misses += 1
+        else:
+            counters.hits += 1
+        # Let the worker re-check its stock now rather than at its next poll.
+        self._wakeups[difficulty].set()
+        return puzzle
+
+    async def stats(self) -> dict:
+        difficulties = {}
+        for d in self.difficulties:
+            counters = self._counters[d]
+            difficulties[d] = {
+                "available": await run_db(count_pooled_puzzles, d),
+                "hits": counters.hits,
+                "misses": counters.misses,
+                "generated": counters.generated,
+                "failed": counters.failed,
+            }
+        return {
+            "enabled": True,
+            "size": self.size,
+            "low_water": self.low_water,
+            "concurrency": self.concurrency,
+            "difficulties": difficulties,
+        }
+
+    async def _refill_loop(self, difficulty: str):
+        wakeup = self._wakeups[difficulty]
+        while True:
+            wakeup.clear()
+            available = await run_db(count_pooled_puzzles, difficulty)
+            if available <= self.low_water and available < self.size:
+                results = await asyncio.gather(
+                    *(
+                        self._generate_one(difficulty)
+                        for _ in range(self.size - available)
+                    )
+                )
+                if all(results):
+                    continue
+            # Idle (or backing off after a failure) until a puzzle is taken.
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=self.recheck_seconds)
+            except TimeoutError:
+                pass
+
+    async def _generate_one(self, difficulty: str) -> bool:
+        counters = self._counters[difficulty]
+        async with self._semaphore:
+            try:
+                with tmdb_priority(TMDbPriority.BACKGROUND):
+                    puzzle = await generate_puzzle(
+                        self._tmdb,
+                        difficulty,
+                        popularity_cache=self._popularity_cache,
+                        snapshot=self._snapshot,
+                    )
+                await run_db(add_pooled_puzzle, difficulty, puzzle)
+            except Exception:
+                counters.failed += 1
+                logger.warning(
+                    "Puzzle pool failed to generate a %s puzzle",
+                    difficulty,
+                    exc_info=True,
+                )
+                return False
+        counters.generated += 1
+        return True
@@ -2,7 +2,7 @@ import hmac
 from fastapi import APIRouter, Depends, Header, HTTPException
 from pydantic import BaseModel
 from ..config import INTERNAL_SECRET
-from ..database import is_beta_user
+from ..database import is_beta_user, run_db
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -23,6 +23,6 @@ async def check_beta(
     body: BetaCheckRequest,
     _: None = Depends(_require_internal),
 ):
-    if not is_beta_user(body.email):
+    if not await run_db(is_beta_user, body.email):
         raise HTTPException(status_code=403, detail="Not in beta")
     return {"allowed": True}
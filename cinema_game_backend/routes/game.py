@@ -1,5 +1,8 @@
+import hashlib
+import json
+import logging
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
 from langsmith import traceable, get_current_run_tree
 from art_graph.cinema_data_providers.tmdb.client import TMDbClient
 from ..models.game import (
@@ -7,24 +10,131 @@ from ..models.game import (
     MoveRequest,
     MoveResponse,
     UndoResponse,
+    HintResponse,
     GameState,
     Actor,
     Move,
+    MovieStep,
 )
 from ..agents.puzzle_agent import generate_puzzle
 from ..agents.validation_agent import validate_move
-from ..dependencies import get_tmdb, get_llm, require_auth
-from ..database import save_game, load_game, update_game
+from ..path_solver import PathSolver
+from ..tmdb_scheduler import TMDbPriority, tmdb_priority
+from ..dependencies import (
+    get_tmdb,
+    get_graph_snapshot,
+    get_llm,
+    get_game_cache,
+    get_name_match_cache,
+    get_path_solver,
+    get_popularity_cache,
+    get_puzzle_pool,
+    require_auth,
+)
+from ..database import (
+    VersionConflict,
+    get_game_version,
+    get_idempotent_response,
+    run_db,
+    save_game,
+    load_game,
+    append_move,
+    pop_moves,
+    update_game_state,
+)
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/game", tags=["game"])
 
+# Games with a move being validated by this process. A second move for the
+# same game (a double-click, an impatient retry) is turned away at once rather
+# than repeating the TMDb/LLM work only to lose the version check.
+_moves_in_flight: set[str] = set()
+
+_MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+
+async def _load_game(game_id: str, cache) -> dict | None:
+    """Load a game, from the game cache when it holds the current version.
+
+    A cached copy is checked against the version in the database, so a write
+    made by another worker is seen on the next read.
+    """
+    game = cache.get(game_id) if cache is not None else None
+    if game is not None and await run_db(get_game_version, game_id) != game["version"]:
+        cache.invalidate(game_id)
+        game = None
+    if game is None:
+        game = await run_db(load_game, game_id)
+        if game is not None and cache is not None:
+            cache.put(game)
+    return game
+
+
+async def _write_game(cache, game: dict, write, *args, idempotency=None, **state):
+    """Write a state change to the game at the version it was loaded at.
+
+    write is one of the database write functions, called as
+    write(game_id, *args, expected_version=...); state is the same change as
+    game fields, applied to game and the game cache once the write succeeds.
+    An idempotency record is stored with the write (see database.py).
+    Raises a 409 if another request changed the game since it was loaded.
+    """
+    kwargs = {"expected_version": game["version"]}
+    if idempotency is not None:
+        kwargs["idempotency"] = idempotency
+    try:
+        version = await run_db(write, game["id"], *args, **kwargs)
+    except VersionConflict:
+        if cache is not None:
+            cache.invalidate(game["id"])
+        raise HTTPException(
+            status_code=409,
+            detail="Game was changed by another request; reload it and retry",
+        )
+    if cache is None:
+        return
+    if version is None:
+        cache.invalidate(game["id"])
+        return
+    game.update(state, version=version)
+    cache.put(game)
+
+
+def _idempotency_record(
+    idempotency: tuple[str, str] | None, response: MoveResponse
+) -> tuple[str, str, dict] | None:
+    """The (key, request_hash, response) row stored alongside a move, if keyed."""
+    if idempotency is None:
+        return None
+    return (*idempotency, response.model_dump())
 
-async def _resolve_actor(tmdb: TMDbClient, name: str, fallback_id: int = 0) -> dict:
-    """Look up an actor by name and return their TMDb ID + canonical name."""
-    person = await tmdb.search_person(name)
-    if person:
-        return {"name": person.name, "id": person.id, "profile_url": person.profile_url}
-    return {"name": name, "id": fallback_id, "profile_url": None}
+
+def _actor_after_moves(game: dict, count: int) -> dict:
+    """The actor a game was on after its first count moves, from stored data.
+
+    Each move records both actors' IDs and profile URLs; moves stored before
+    it did fall back to the neighbouring move's fields.
+    """
+    moves = game["moves"]
+    after = moves[count] if count < len(moves) else {}
+    if count == 0:
+        start = game["start_actor"]
+        profile_url = start.get("profile_url") or after.get("from_actor_profile_url")
+        # Games loaded from the database don't carry the start actor's
+        # profile URL, but the puzzle's walk begins with it.
+        walk_start = game["known_solution"][0] if game["known_solution"] else {}
+        if profile_url is None and walk_start.get("id") == start["id"]:
+            profile_url = walk_start.get("profile_url")
+        return {"name": start["name"], "id": start["id"], "profile_url": profile_url}
+    move = moves[count - 1]
+    return {
+        "name": move["to_actor"],
+        "id": move.get("to_actor_id") or after.get("from_actor_id") or 0,
+        "profile_url": move.get("to_actor_profile_url")
+        or after.get("from_actor_profile_url"),
+    }
 
 
 def _reached_end(next_actor_id: int, next_actor_name: str, end_actor: dict) -> bool:
@@ -44,6 +154,9 @@ def _reached_end(next_actor_id: int, next_actor_name: str, end_actor: dict) -> b
 async def new_game(
     difficulty: str = "medium",
     tmdb: TMDbClient = Depends(get_tmdb),
+    pool=Depends(get_puzzle_pool),
+    popularity_cache=Depends(get_popularity_cache),
+    snapshot=Depends(get_graph_snapshot),
     _user: dict = Depends(require_auth),
 ):
     if difficulty not in ("easy", "medium", "hard"):
@@ -51,12 +164,22 @@ async def new_game(
             status_code=400, detail="difficulty must be easy, medium, or hard"
         )
 
-    puzzle = await generate_puzzle(tmdb, difficulty)
+    # Serve a pre-generated puzzle when one is ready; only walk TMDb live
+    # when the pool is disabled or has run dry.
+    puzzle = await pool.take(difficulty) if pool is not None else None
+    from_pool = puzzle is not None
+    if puzzle is None:
+        with tmdb_priority(TMDbPriority.CREATION):
+            puzzle = await generate_puzzle(
+                tmdb, difficulty, popularity_cache=popularity_cache, snapshot=snapshot
+            )
 
     game_id = str(uuid.uuid4())
     rt = get_current_run_tree()
     if rt:
-        rt.metadata.update({"game_id": game_id, "difficulty": difficulty})
+        rt.metadata.update(
+            {"game_id": game_id, "difficulty": difficulty, "from_pool": from_pool}
+        )
 
     game = {
         "id": game_id,
@@ -68,8 +191,9 @@ async def new_game(
         "current_actor": puzzle["start_actor"],
         "status": "in_progress",
         "strikes": 0,
+        "min_moves": puzzle["min_moves"],
     }
-    save_game(game)
+    await run_db(save_game, game)
 
     return NewGameResponse(
         game_id=game_id,
@@ -87,16 +211,69 @@ async def make_move(
     body: MoveRequest,
     tmdb: TMDbClient = Depends(get_tmdb),
     llm=Depends(get_llm),
+    name_cache=Depends(get_name_match_cache),
+    cache=Depends(get_game_cache),
+    idempotency_key: str | None = Header(None),
     _user: dict = Depends(require_auth),
 ):
-    game = load_game(game_id)
+    idempotency = None
+    if idempotency_key is not None:
+        if not 0 < len(idempotency_key) <= _MAX_IDEMPOTENCY_KEY_LENGTH:
+            raise HTTPException(
+                status_code=400,
+                detail="Idempotency-Key must be 1 to 255 characters",
+            )
+        request_hash = hashlib.sha256(
+            json.dumps(body.model_dump(), sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        # A retry gets the original answer without the move being re-validated
+        # or re-applied, even if the game has moved on (or ended) since.
+        stored = await run_db(get_idempotent_response, game_id, idempotency_key)
+        if stored is not None:
+            if stored[0] != request_hash:
+                raise HTTPException(
+                    status_code=422,
+                    detail="Idempotency-Key was already used for a different move",
+                )
+            return MoveResponse(**stored[1])
+        idempotency = (idempotency_key, request_hash)
+
+    game = await _load_game(game_id, cache)
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
     if game["status"] != "in_progress":
         raise HTTPException(status_code=400, detail="Game is already over")
+    if game_id in _moves_in_flight:
+        raise HTTPException(
+            status_code=409, detail="A move for this game is already being checked"
+        )
+
+    _moves_in_flight.add(game_id)
+    try:
+        return await _play_move(game, body, tmdb, llm, name_cache, cache, idempotency)
+    finally:
+        _moves_in_flight.discard(game_id)
 
+
+async def _play_move(
+    game: dict,
+    body: MoveRequest,
+    tmdb: TMDbClient,
+    llm,
+    name_cache,
+    cache,
+    idempotency: tuple[str, str] | None,
+) -> MoveResponse:
+    """Validate and apply a move; idempotency is (key, request_hash) or None."""
+    game_id = game["id"]
     from_actor = game["current_actor"]["name"]
     from_actor_id = game["current_actor"]["id"]
+    from_actor_profile_url = game["current_actor"].get("profile_url")
+    if from_actor_profile_url is None:
+        # Games reloaded from the database store only the current actor's
+        # name and ID.
+        current = _actor_after_moves(game, len(game["moves"]))
+        from_actor_profile_url = current["profile_url"]
 
     rt = get_current_run_tree()
     if rt:
@@ -115,20 +292,32 @@ async def make_move(
         body.next_actor,
         from_actor_id=from_actor_id,
         llm=llm,
+        name_cache=name_cache,
         langsmith_extra={"metadata": {"game_id": game_id}},
     )
 
     if not result.valid:
         strikes = game.get("strikes", 0) + 1
         new_status = "lost" if strikes >= 3 else "in_progress"
-        update_game(game_id, game["moves"], game["current_actor"], new_status, strikes)
-        return MoveResponse(
+        response = MoveResponse(
             valid=False,
             explanation=result.explanation,
             game_status=new_status,
             current_actor=Actor(**game["current_actor"]),
             strikes=strikes,
         )
+        await _write_game(
+            cache,
+            game,
+            update_game_state,
+            game["current_actor"],
+            new_status,
+            strikes,
+            idempotency=_idempotency_record(idempotency, response),
+            status=new_status,
+            strikes=strikes,
+        )
+        return response
 
     # The next actor's TMDb ID and canonical name come straight from the cast
     # member validate_move matched against — no separate name search needed,
@@ -151,17 +340,15 @@ async def make_move(
         backdrop_url=result.backdrop_url,
         from_actor_id=from_actor_id,
         to_actor_id=new_actor["id"],
+        from_actor_profile_url=from_actor_profile_url,
+        to_actor_profile_url=new_actor["profile_url"],
     )
-    game["moves"].append(move.model_dump())
-
     # Win check: ID-first, name fallback
     reached = _reached_end(new_actor["id"], new_actor["name"], game["end_actor"])
     new_status = "won" if reached else "in_progress"
 
     strikes = game.get("strikes", 0)
-    update_game(game_id, game["moves"], new_actor, new_status, strikes)
-
-    return MoveResponse(
+    response = MoveResponse(
         valid=True,
         explanation=result.explanation,
         movie_id=result.movie_id,
@@ -173,43 +360,140 @@ async def make_move(
         current_actor=Actor(**new_actor),
         strikes=strikes,
     )
+    await _write_game(
+        cache,
+        game,
+        append_move,
+        move.model_dump(),
+        new_actor,
+        new_status,
+        strikes,
+        idempotency=_idempotency_record(idempotency, response),
+        moves=game["moves"] + [move.model_dump()],
+        current_actor=new_actor,
+        status=new_status,
+    )
+    return response
 
 
 @router.delete("/{game_id}/move", response_model=UndoResponse)
 @traceable(run_type="chain", name="undo_move")
 async def undo_move(
     game_id: str,
-    tmdb: TMDbClient = Depends(get_tmdb),
+    steps: int = 1,
+    cache=Depends(get_game_cache),
     _user: dict = Depends(require_auth),
 ):
-    game = load_game(game_id)
+    if steps < 1:
+        raise HTTPException(status_code=400, detail="steps must be at least 1")
+    game = await _load_game(game_id, cache)
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
     if game["status"] != "in_progress":
         raise HTTPException(status_code=400, detail="Game is already over")
     if not game["moves"]:
         raise HTTPException(status_code=400, detail="No moves to undo")
+    if steps > len(game["moves"]):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Only {len(game['moves'])} moves to undo",
+        )
 
-    last_move = game["moves"].pop()
-    restored_actor = await _resolve_actor(
-        tmdb,
-        last_move["from_actor"],
-        fallback_id=game["start_actor"]["id"] if not game["moves"] else 0,
-    )
+    # Everything needed is already in the move log, so undo is a single
+    # database write with no TMDb lookups.
+    keep = len(game["moves"]) - steps
+    restored_actor = _actor_after_moves(game, keep)
+    moves = game["moves"][:keep]
     strikes = game.get("strikes", 0)
-    update_game(game_id, game["moves"], restored_actor, "in_progress", strikes)
+    await _write_game(
+        cache,
+        game,
+        pop_moves,
+        steps,
+        restored_actor,
+        "in_progress",
+        strikes,
+        moves=moves,
+        current_actor=restored_actor,
+    )
 
     return UndoResponse(
         current_actor=Actor(**restored_actor),
-        moves=[Move(**m) for m in game["moves"]],
+        moves=[Move(**m) for m in moves],
         strikes=strikes,
         game_status="in_progress",
     )
 
 
+def _known_solution_suffix(game: dict) -> list[dict] | None:
+    """The rest of the puzzle's own walk, if the player is still on it."""
+    path = game["known_solution"]
+    for i in range(0, len(path), 2):
+        if path[i]["id"] == game["current_actor"]["id"]:
+            return path[i:]
+    return None
+
+
+@router.get("/{game_id}/hint", response_model=HintResponse)
+@traceable(run_type="chain", name="hint")
+async def get_hint(
+    game_id: str,
+    tmdb: TMDbClient = Depends(get_tmdb),
+    solver=Depends(get_path_solver),
+    snapshot=Depends(get_graph_snapshot),
+    cache=Depends(get_game_cache),
+    _user: dict = Depends(require_auth),
+):
+    game = await _load_game(game_id, cache)
+    if not game:
+        raise HTTPException(status_code=404, detail="Game not found")
+    if game["status"] != "in_progress":
+        raise HTTPException(status_code=400, detail="Game is already over")
+
+    if solver is None:
+        solver = PathSolver(tmdb, snapshot)
+    try:
+        path = await solver.shortest_path(
+            game["difficulty"], game["current_actor"], game["end_actor"]
+        )
+    except Exception:
+        logger.warning("Hint search failed for game %s", game_id, exc_info=True)
+        path = None
+    source = "shortest_path"
+    if path is None or len(path) < 3:
+        # No filtered path within the hop cap (or TMDb failed): the puzzle's
+        # own walk still leads to the end actor if the player has not left it.
+        path = _known_solution_suffix(game)
+        source = "known_solution"
+    if path is None or len(path) < 3:
+        raise HTTPException(
+            status_code=404, detail="No hint available from the current actor"
+        )
+
+    rt = get_current_run_tree()
+    if rt:
+        rt.metadata.update({"game_id": game_id, "hint_source": source})
+
+    next_actor = path[2]
+    return HintResponse(
+        movie=MovieStep(**path[1]),
+        next_actor=Actor(
+            name=next_actor["name"],
+            id=next_actor["id"],
+            profile_url=next_actor.get("profile_url"),
+        ),
+        moves_remaining=len(path) // 2,
+        source=source,
+    )
+
+
 @router.get("/{game_id}", response_model=GameState)
-async def get_game(game_id: str, _user: dict = Depends(require_auth)):
-    game = load_game(game_id)
+async def get_game(
+    game_id: str,
+    cache=Depends(get_game_cache),
+    _user: dict = Depends(require_auth),
+):
+    game = await _load_game(game_id, cache)
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
 
@@ -218,7 +502,7 @@ async def get_game(game_id: str, _user: dict = Depends(require_auth)):
         start_actor=Actor(**game["start_actor"]),
         end_actor=Actor(**game["end_actor"]),
         difficulty=game["difficulty"],
-        min_moves=len([s for s in game["known_solution"] if s["type"] == "movie"]),
+        min_moves=game["min_moves"],
         current_actor=Actor(**game["current_actor"]),
         moves=[Move(**m) for m in game["moves"]],
         status=game["status"],
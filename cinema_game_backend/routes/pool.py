@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+from ..dependencies import get_puzzle_pool, require_auth
+from ..models.pool import PuzzlePoolStats
+from ..puzzle_pool import PuzzlePool
+
+router = APIRouter(prefix="/pool", tags=["pool"])
+
+
+@router.get("/stats", response_model=PuzzlePoolStats)
+async def pool_stats(
+    pool: PuzzlePool | None = Depends(get_puzzle_pool),
+    _user: dict = Depends(require_auth),
+):
+    if pool is None:
+        return PuzzlePoolStats(enabled=False)
+    return PuzzlePoolStats(**await pool.stats())
@@ -1,5 +1,45 @@
+import sqlite3
+from unittest.mock import patch
+
 import pytest
 
+from cinema_game_backend.database import init_db
+from cinema_game_backend.graph_snapshot import GraphData
+
+
+class _NoCloseConnection:
+    """Wraps a sqlite3.Connection so that .close() is a no-op."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def close(self):
+        pass  # prevent database.py from closing the shared connection
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+@pytest.fixture
+def use_in_memory_db():
+    """Point database.get_db at a fresh shared in-memory SQLite DB.
+
+    Yields the underlying connection. Modules whose every test needs it
+    use pytestmark = pytest.mark.usefixtures("use_in_memory_db").
+    """
+    conn = sqlite3.connect(
+        "file::memory:?cache=shared", uri=True, check_same_thread=False
+    )
+    conn.row_factory = sqlite3.Row
+
+    with patch(
+        "cinema_game_backend.database.get_db",
+        side_effect=lambda: _NoCloseConnection(conn),
+    ):
+        init_db()
+        yield conn
+    conn.close()
+
 
 @pytest.fixture
 def departed_cast():
@@ -39,3 +79,31 @@ def toy_story_cast():
         "John Ratzenberger",
         "Annie Potts",
     ]
+
+
+def _chain_graph(length=10, popularity=20.0) -> GraphData:
+    """Actors 1..length+1 where movie 100+i stars actors i and i+1."""
+    data = GraphData()
+    for a in range(1, length + 2):
+        data.actors[a] = {
+            "name": f"Actor {a}",
+            "popularity": popularity,
+            "profile_url": None,
+        }
+    for i in range(1, length + 1):
+        data.movies[100 + i] = {
+            "title": f"Movie {i}",
+            "year": "2000",
+            "popularity": float(i),
+            "poster_url": None,
+            "backdrop_url": None,
+            "accepted": {"easy": True, "medium": True, "hard": True},
+        }
+        data.credits[100 + i] = [i, i + 1]
+    return data
+
+
+@pytest.fixture
+def chain_graph():
+    """Builder of small chain-shaped GraphData, chain_graph(length=...)."""
+    return _chain_graph
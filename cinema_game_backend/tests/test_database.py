@@ -1,11 +1,23 @@
-import sqlite3
+import json
+import threading
 import pytest
 from unittest.mock import patch
 from cinema_game_backend.database import (
+    VersionConflict,
+    _connect,
+    get_game_version,
+    get_idempotent_response,
+    run_db,
     init_db,
+    iter_games,
     save_game,
     load_game,
     update_game,
+    update_game_state,
+    append_move,
+    pop_move,
+    pop_moves,
+    list_game_summaries,
     list_games,
 )
 
@@ -27,33 +39,32 @@ def _make_game(game_id="test-123"):
     }
 
 
-class _NoCloseConnection:
-    """Wraps a sqlite3.Connection so that .close() is a no-op."""
-
-    def __init__(self, conn):
-        self._conn = conn
-
-    def close(self):
-        pass  # prevent database.py from closing the shared connection
+def _make_move(from_actor="Brad Pitt", to_actor="Michael Fassbender", movie_id=76203):
+    return {
+        "from_actor": from_actor,
+        "movie": "12 Years a Slave",
+        "to_actor": to_actor,
+        "movie_id": movie_id,
+        "movie_title": "12 Years a Slave",
+        "movie_year": "2013",
+        "poster_url": None,
+        "backdrop_url": None,
+        "from_actor_id": 287,
+        "to_actor_id": 17288,
+        "from_actor_profile_url": None,
+        "to_actor_profile_url": "/fassbender.jpg",
+    }
 
-    def __getattr__(self, name):
-        return getattr(self._conn, name)
 
+def _set_created_at(game_id, created_at):
+    from cinema_game_backend.database import get_db
 
-@pytest.fixture(autouse=True)
-def use_in_memory_db():
-    """Use a shared named in-memory SQLite DB for each test."""
-    conn = sqlite3.connect("file::memory:?cache=shared", uri=True)
-    conn.row_factory = sqlite3.Row
+    conn = get_db()
+    conn.execute("UPDATE games SET created_at = ? WHERE id = ?", (created_at, game_id))
+    conn.commit()
 
-    def make_wrapper():
-        wrapper = _NoCloseConnection(conn)
-        return wrapper
 
-    with patch("cinema_game_backend.database.get_db", side_effect=make_wrapper):
-        init_db()
-        yield
-    conn.close()
+pytestmark = pytest.mark.usefixtures("use_in_memory_db")
 
 
 class TestInitDb:
@@ -71,6 +82,28 @@ class TestInitDb:
         init_db()
 
 
+class TestConnectionPool:
+    def test_connect_enables_wal(self, tmp_path):
+        conn = _connect(str(tmp_path / "pool.db"))
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        conn.close()
+        assert mode == "wal"
+
+    def test_connect_sets_busy_timeout(self, tmp_path):
+        conn = _connect(str(tmp_path / "pool.db"))
+        timeout = conn.execute("PRAGMA busy_timeout").fetchone()[0]
+        conn.close()
+        assert timeout > 0
+
+    async def test_run_db_runs_off_the_event_loop_thread(self):
+        loop_thread = threading.get_ident()
+        worker_thread = await run_db(threading.get_ident)
+        assert worker_thread != loop_thread
+
+    async def test_run_db_passes_arguments(self):
+        assert await run_db(sorted, [2, 3, 1], reverse=True) == [3, 2, 1]
+
+
 class TestSaveAndLoadGame:
     def test_save_and_load(self):
         game = _make_game()
@@ -95,6 +128,35 @@ class TestSaveAndLoadGame:
         assert isinstance(loaded["known_solution"], list)
         assert loaded["known_solution"][1]["title"] == "12 Years a Slave"
 
+    def test_min_moves_round_trips(self):
+        save_game({**_make_game(), "min_moves": 4})
+        assert load_game("test-123")["min_moves"] == 4
+
+    def test_min_moves_defaults_to_solution_length(self):
+        save_game(_make_game())
+        assert load_game("test-123")["min_moves"] == 1
+
+    def test_migration_backfills_min_moves(self):
+        from cinema_game_backend.database import get_db
+
+        save_game({**_make_game(), "min_moves": 4})
+        conn = get_db()
+        conn.execute("UPDATE games SET min_moves = NULL")
+        conn.commit()
+
+        init_db()
+
+        assert load_game("test-123")["min_moves"] == 1
+
+    def test_get_game_version(self):
+        save_game(_make_game())
+        assert get_game_version("test-123") == 0
+        update_game_state(
+            "test-123", {"name": "X", "id": 1}, "in_progress", 1, expected_version=0
+        )
+        assert get_game_version("test-123") == 1
+        assert get_game_version("does-not-exist") is None
+
     def test_created_at_populated(self):
         game = _make_game()
         save_game(game)
@@ -118,7 +180,10 @@ class TestUpdateGame:
         update_game("test-123", new_moves, new_actor, "in_progress")
 
         loaded = load_game("test-123")
-        assert loaded["moves"] == new_moves
+        assert len(loaded["moves"]) == 1
+        assert loaded["moves"][0]["from_actor"] == "Brad Pitt"
+        assert loaded["moves"][0]["movie"] == "12 Years a Slave"
+        assert loaded["moves"][0]["to_actor"] == "Michael Fassbender"
         assert loaded["current_actor"] == new_actor
         assert loaded["status"] == "in_progress"
 
@@ -136,7 +201,7 @@ class TestUpdateGame:
         save_game(_make_game("game-a"))
         save_game(_make_game("game-b"))
 
-        update_game("game-a", [{"move": 1}], {"name": "X", "id": 1}, "won")
+        update_game("game-a", [_make_move()], {"name": "X", "id": 1}, "won")
 
         a = load_game("game-a")
         b = load_game("game-b")
@@ -144,6 +209,221 @@ class TestUpdateGame:
         assert b["status"] == "in_progress"
 
 
+class TestMoveLog:
+    def test_append_move_adds_one_row(self):
+        save_game(_make_game())
+        actor = {"name": "Michael Fassbender", "id": 17288}
+        append_move("test-123", _make_move(), actor, "in_progress", 0)
+
+        loaded = load_game("test-123")
+        assert loaded["moves"] == [_make_move()]
+        assert loaded["current_actor"] == actor
+
+    def test_moves_load_in_play_order(self):
+        save_game(_make_game())
+        actor = {"name": "X", "id": 1}
+        for movie_id in (1, 2, 3):
+            append_move(
+                "test-123", _make_move(movie_id=movie_id), actor, "in_progress", 0
+            )
+
+        loaded = load_game("test-123")
+        assert [m["movie_id"] for m in loaded["moves"]] == [1, 2, 3]
+
+    def test_pop_move_removes_only_the_last_move(self):
+        save_game(_make_game())
+        actor = {"name": "X", "id": 1}
+        append_move("test-123", _make_move(movie_id=1), actor, "in_progress", 0)
+        append_move("test-123", _make_move(movie_id=2), actor, "in_progress", 0)
+
+        pop_move("test-123", {"name": "Brad Pitt", "id": 287}, "in_progress", 0)
+
+        loaded = load_game("test-123")
+        assert [m["movie_id"] for m in loaded["moves"]] == [1]
+        assert loaded["current_actor"]["name"] == "Brad Pitt"
+
+    def test_pop_moves_removes_the_last_n_moves(self):
+        save_game(_make_game())
+        actor = {"name": "X", "id": 1}
+        for movie_id in (1, 2, 3):
+            append_move(
+                "test-123", _make_move(movie_id=movie_id), actor, "in_progress", 0
+            )
+
+        pop_moves("test-123", 2, {"name": "Brad Pitt", "id": 287}, "in_progress", 0)
+
+        loaded = load_game("test-123")
+        assert [m["movie_id"] for m in loaded["moves"]] == [1]
+        assert loaded["moves"][0]["to_actor_profile_url"] == "/fassbender.jpg"
+        assert loaded["current_actor"]["id"] == 287
+
+    @pytest.mark.parametrize("count", [0, -1])
+    def test_pop_moves_rejects_counts_below_one(self, count):
+        save_game(_make_game())
+        actor = {"name": "X", "id": 1}
+        append_move("test-123", _make_move(), actor, "in_progress", 0)
+
+        with pytest.raises(ValueError):
+            pop_moves("test-123", count, {"name": "Brad Pitt", "id": 287}, "x", 0)
+
+        loaded = load_game("test-123")
+        assert len(loaded["moves"]) == 1
+        assert loaded["version"] == 1
+
+    def test_pop_moves_beyond_the_log_writes_nothing(self):
+        save_game(_make_game())
+        actor = {"name": "X", "id": 1}
+        append_move("test-123", _make_move(), actor, "in_progress", 0)
+
+        with pytest.raises(ValueError):
+            pop_moves("test-123", 2, {"name": "Brad Pitt", "id": 287}, "in_progress", 0)
+
+        loaded = load_game("test-123")
+        assert len(loaded["moves"]) == 1
+        assert loaded["current_actor"]["name"] == "X"
+        assert loaded["version"] == 1
+
+    def test_update_game_state_keeps_moves(self):
+        save_game(_make_game())
+        actor = {"name": "X", "id": 1}
+        append_move("test-123", _make_move(), actor, "in_progress", 0)
+
+        update_game_state("test-123", actor, "lost", 3)
+
+        loaded = load_game("test-123")
+        assert loaded["status"] == "lost"
+        assert loaded["strikes"] == 3
+        assert len(loaded["moves"]) == 1
+
+    def test_save_game_with_moves(self):
+        game = _make_game()
+        game["moves"] = [_make_move()]
+        save_game(game)
+        assert load_game("test-123")["moves"] == [_make_move()]
+
+    def test_writes_bump_version(self):
+        save_game(_make_game())
+        assert load_game("test-123")["version"] == 0
+        actor = {"name": "X", "id": 1}
+        assert append_move("test-123", _make_move(), actor, "in_progress", 0) == 1
+        assert update_game_state("test-123", actor, "in_progress", 1) == 2
+        assert pop_move("test-123", actor, "in_progress", 1) == 3
+        assert update_game("test-123", [], actor, "in_progress", 1) == 4
+        assert load_game("test-123")["version"] == 4
+
+    def test_write_to_missing_game_returns_no_version(self):
+        actor = {"name": "X", "id": 1}
+        assert update_game_state("missing", actor, "in_progress", 0) is None
+
+    def test_writes_to_missing_game_with_foreign_keys(self, tmp_path):
+        conn = _connect(str(tmp_path / "games.db"))
+        with patch("cinema_game_backend.database.get_db", return_value=conn):
+            init_db()
+            actor = {"name": "X", "id": 1}
+            assert append_move("missing", _make_move(), actor, "in_progress", 0) is None
+            assert update_game("missing", [_make_move()], actor, "in_progress") is None
+        conn.close()
+
+    def test_compare_and_swap(self):
+        save_game(_make_game())
+        actor = {"name": "X", "id": 1}
+        version = append_move(
+            "test-123", _make_move(), actor, "in_progress", 0, expected_version=0
+        )
+        assert version == 1
+
+        with pytest.raises(VersionConflict):
+            append_move(
+                "test-123",
+                _make_move(movie_id=2),
+                actor,
+                "in_progress",
+                0,
+                expected_version=0,
+            )
+        with pytest.raises(VersionConflict):
+            pop_move("test-123", actor, "in_progress", 0, expected_version=0)
+        with pytest.raises(VersionConflict):
+            update_game_state("test-123", actor, "lost", 3, expected_version=0)
+        with pytest.raises(VersionConflict):
+            update_game("test-123", [], actor, "lost", 3, expected_version=0)
+
+        # The losing writes left the game exactly as the first one wrote it.
+        loaded = load_game("test-123")
+        assert loaded["version"] == 1
+        assert loaded["moves"] == [_make_move()]
+        assert loaded["status"] == "in_progress"
+
+    def test_compare_and_swap_on_missing_game(self):
+        actor = {"name": "X", "id": 1}
+        assert (
+            update_game_state("missing", actor, "in_progress", 0, expected_version=0)
+            is None
+        )
+
+    def test_migrates_json_moves_blob(self):
+        from cinema_game_backend.database import get_db
+
+        save_game(_make_game())
+        conn = get_db()
+        conn.execute(
+            "UPDATE games SET moves = ? WHERE id = ?",
+            (json.dumps([_make_move()]), "test-123"),
+        )
+        conn.commit()
+
+        init_db()
+
+        assert load_game("test-123")["moves"] == [_make_move()]
+        row = conn.execute("SELECT moves FROM games WHERE id = 'test-123'").fetchone()
+        assert row["moves"] == "[]"
+
+
+class TestIdempotentResponses:
+    def test_stored_with_the_move(self):
+        save_game(_make_game())
+        actor = {"name": "X", "id": 1}
+        append_move(
+            "test-123",
+            _make_move(),
+            actor,
+            "in_progress",
+            0,
+            idempotency=("k1", "hash", {"valid": True}),
+        )
+        assert get_idempotent_response("test-123", "k1") == ("hash", {"valid": True})
+        assert get_idempotent_response("test-123", "k2") is None
+        assert get_idempotent_response("other-game", "k1") is None
+
+    def test_not_stored_when_the_write_conflicts(self):
+        save_game(_make_game())
+        actor = {"name": "X", "id": 1}
+        with pytest.raises(VersionConflict):
+            update_game_state(
+                "test-123",
+                actor,
+                "in_progress",
+                1,
+                expected_version=5,
+                idempotency=("k1", "hash", {"valid": False}),
+            )
+        assert get_idempotent_response("test-123", "k1") is None
+
+    def test_expires(self):
+        save_game(_make_game())
+        actor = {"name": "X", "id": 1}
+        with patch("time.time", return_value=1000.0):
+            update_game_state(
+                "test-123",
+                actor,
+                "in_progress",
+                1,
+                idempotency=("k1", "hash", {"valid": False}),
+            )
+        with patch("time.time", return_value=1000.0 + 86401):
+            assert get_idempotent_response("test-123", "k1") is None
+
+
 class TestListGames:
     def test_empty_database(self):
         assert list_games() == []
@@ -174,3 +454,93 @@ class TestListGames:
         save_game(_make_game("game-c"))
         games = list_games(limit=None)
         assert len(games) == 3
+
+    def test_newest_first_with_keyset_cursor(self):
+        for i, game_id in enumerate(("game-a", "game-b", "game-c")):
+            save_game(_make_game(game_id))
+            _set_created_at(game_id, f"2025-01-0{i + 1} 00:00:00")
+
+        first = list_games(limit=2)
+        assert [g["id"] for g in first] == ["game-c", "game-b"]
+        cursor = (first[-1]["created_at"], first[-1]["id"])
+        assert [g["id"] for g in list_games(limit=2, before=cursor)] == ["game-a"]
+
+    def test_cursor_breaks_created_at_ties_by_id(self):
+        for game_id in ("game-a", "game-b", "game-c"):
+            save_game(_make_game(game_id))
+            _set_created_at(game_id, "2025-01-01 00:00:00")
+
+        cursor = ("2025-01-01 00:00:00", "game-b")
+        assert [g["id"] for g in list_games(before=cursor)] == ["game-a"]
+
+    def test_filters(self):
+        save_game(_make_game("game-a"))
+        save_game(_make_game("game-b"))
+        update_game_state("game-b", {"name": "X", "id": 1}, "won", 0)
+
+        assert [g["id"] for g in list_games(status="won")] == ["game-b"]
+        assert list_games(difficulty="hard") == []
+        assert len(list_games(difficulty="medium", status="in_progress")) == 1
+
+
+class TestListGameSummaries:
+    def test_summary_fields(self):
+        save_game(_make_game("game-a"))
+        append_move("game-a", _make_move(), {"name": "X", "id": 1}, "in_progress", 0)
+        _set_created_at("game-a", "2025-01-01 00:00:00")
+
+        assert list_game_summaries() == [
+            {
+                "game_id": "game-a",
+                "difficulty": "medium",
+                "start_actor": "Brad Pitt",
+                "end_actor": "Colin Firth",
+                "status": "in_progress",
+                "moves": 1,
+                "created_at": "2025-01-01 00:00:00",
+            }
+        ]
+
+    def test_does_not_read_json_columns(self):
+        from cinema_game_backend.database import get_db
+
+        save_game(_make_game("game-a"))
+        get_db().execute("UPDATE games SET known_solution = 'not json'")
+
+        assert len(list_game_summaries()) == 1
+
+    def test_filters_and_cursor(self):
+        for i, game_id in enumerate(("game-a", "game-b", "game-c")):
+            save_game(_make_game(game_id))
+            _set_created_at(game_id, f"2025-01-0{i + 1} 00:00:00")
+        update_game_state("game-a", {"name": "X", "id": 1}, "lost", 3)
+
+        in_progress = list_game_summaries(status="in_progress", limit=1)
+        assert [g["game_id"] for g in in_progress] == ["game-c"]
+        cursor = (in_progress[0]["created_at"], in_progress[0]["game_id"])
+        rest = list_game_summaries(status="in_progress", before=cursor)
+        assert [g["game_id"] for g in rest] == ["game-b"]
+
+
+class TestIterGames:
+    def test_streams_in_batches_with_moves(self):
+        for i, game_id in enumerate(("game-a", "game-b", "game-c")):
+            save_game(_make_game(game_id))
+            _set_created_at(game_id, f"2025-01-0{i + 1} 00:00:00")
+        append_move("game-a", _make_move(), {"name": "X", "id": 1}, "in_progress", 0)
+
+        games = list(iter_games(batch_size=2))
+
+        assert [g["id"] for g in games] == ["game-c", "game-b", "game-a"]
+        assert games[2]["moves"] == [_make_move()]
+
+    def test_filters(self):
+        for i, game_id in enumerate(("game-a", "game-b", "game-c")):
+            save_game(_make_game(game_id))
+            _set_created_at(game_id, f"2025-01-0{i + 1} 12:00:00")
+        append_move("game-b", _make_move(), {"name": "X", "id": 1}, "in_progress", 0)
+
+        dated = iter_games(since="2025-01-02", until="2025-01-03")
+        assert [g["id"] for g in dated] == ["game-b"]
+        assert [g["id"] for g in iter_games(min_moves_played=1)] == ["game-b"]
+        assert list(iter_games(status="won")) == []
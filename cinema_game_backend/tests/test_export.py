@@ -1,8 +1,17 @@
 """Tests for database-to-RecordedGame export."""
 
+import gzip
+import json
+
 import pytest
 from unittest.mock import patch
-from cinema_game_backend.experiments.export import list_game_ids, export_game
+from cinema_game_backend.experiments.export import (
+    export_game,
+    export_games,
+    iter_game_ids,
+    list_game_ids,
+    write_jsonl,
+)
 from cinema_game_backend.models.experiment import RecordedGame, ExpectedSuccess
 
 
@@ -64,37 +73,55 @@ def empty_game_dict():
 
 
 class TestListGameIds:
-    @patch("cinema_game_backend.experiments.export.list_games")
+    @patch("cinema_game_backend.experiments.export.list_game_summaries")
     def test_empty(self, mock_list):
         mock_list.return_value = []
         assert list_game_ids() == []
 
-    @patch("cinema_game_backend.experiments.export.list_games")
-    def test_returns_summary(self, mock_list, sample_game_dict):
-        mock_list.return_value = [sample_game_dict]
-        result = list_game_ids()
-
-        assert len(result) == 1
-        g = result[0]
-        assert g["game_id"] == "abc-123"
-        assert g["difficulty"] == "medium"
-        assert g["start_actor"] == "Brad Pitt"
-        assert g["end_actor"] == "Colin Firth"
-        assert g["status"] == "in_progress"
-        assert g["moves"] == 2
-        assert g["created_at"] == "2025-01-01 00:00:00"
-
-    @patch("cinema_game_backend.experiments.export.list_games")
-    def test_passes_limit(self, mock_list):
+    @patch("cinema_game_backend.experiments.export.list_game_summaries")
+    def test_passes_limit_and_filters(self, mock_list):
         mock_list.return_value = []
-        list_game_ids(limit=5)
-        mock_list.assert_called_once_with(limit=5)
+        list_game_ids(limit=5, status="won", difficulty="hard", before=("t", "id"))
+        mock_list.assert_called_once_with(
+            limit=5, status="won", difficulty="hard", before=("t", "id")
+        )
 
-    @patch("cinema_game_backend.experiments.export.list_games")
+    @patch("cinema_game_backend.experiments.export.list_game_summaries")
     def test_default_limit_is_none(self, mock_list):
         mock_list.return_value = []
         list_game_ids()
-        mock_list.assert_called_once_with(limit=None)
+        mock_list.assert_called_once_with(
+            limit=None, status=None, difficulty=None, before=None
+        )
+
+
+class TestIterGameIds:
+    @patch("cinema_game_backend.experiments.export.list_game_summaries")
+    def test_pages_with_cursor(self, mock_list):
+        pages = [
+            [
+                {"game_id": "c", "created_at": "3"},
+                {"game_id": "b", "created_at": "2"},
+            ],
+            [{"game_id": "a", "created_at": "1"}],
+        ]
+        mock_list.side_effect = pages
+
+        result = list(iter_game_ids(page_size=2, status="won"))
+
+        assert [g["game_id"] for g in result] == ["c", "b", "a"]
+        assert mock_list.call_args_list[1].kwargs == {
+            "limit": 2,
+            "status": "won",
+            "difficulty": None,
+            "before": ("2", "b"),
+        }
+
+    @patch("cinema_game_backend.experiments.export.list_game_summaries")
+    def test_stops_after_a_short_page(self, mock_list):
+        mock_list.return_value = []
+        assert list(iter_game_ids()) == []
+        assert mock_list.call_count == 1
 
 
 class TestExportGame:
@@ -161,3 +188,41 @@ class TestExportGame:
         json_str = game.model_dump_json()
         restored = RecordedGame.model_validate_json(json_str)
         assert restored == game
+
+
+class TestExportGames:
+    @patch("cinema_game_backend.experiments.export.iter_games")
+    def test_streams_recorded_games(self, mock_iter, sample_game_dict):
+        mock_iter.return_value = iter([sample_game_dict])
+
+        games = list(export_games(difficulty="medium", min_moves_played=2))
+
+        assert [g.start_actor for g in games] == ["Brad Pitt"]
+        assert len(games[0].moves) == 2
+        mock_iter.assert_called_once_with(
+            status=None, difficulty="medium", since=None, until=None, min_moves_played=2
+        )
+
+    @patch("cinema_game_backend.experiments.export.iter_games")
+    def test_write_jsonl(self, mock_iter, sample_game_dict, empty_game_dict, tmp_path):
+        mock_iter.return_value = iter([sample_game_dict, empty_game_dict])
+        path = tmp_path / "corpus.jsonl"
+
+        assert write_jsonl(export_games(), path) == 2
+
+        lines = path.read_text().splitlines()
+        assert [RecordedGame(**json.loads(line)).start_actor for line in lines] == [
+            "Brad Pitt",
+            "Tom Hanks",
+        ]
+
+    def test_write_jsonl_gzip(self, sample_game_dict, tmp_path):
+        path = tmp_path / "corpus.jsonl.gz"
+        with patch(
+            "cinema_game_backend.experiments.export.iter_games",
+            return_value=iter([sample_game_dict]),
+        ):
+            write_jsonl(export_games(), path)
+
+        with gzip.open(path, "rt") as f:
+            assert RecordedGame(**json.loads(f.readline())).end_actor == "Colin Firth"
@@ -0,0 +1,60 @@
+from unittest.mock import patch
+from cinema_game_backend.game_cache import GameStateCache
+
+
+def _game(game_id="g1", version=0, moves=None):
+    return {"id": game_id, "version": version, "moves": moves or []}
+
+
+class TestGameStateCache:
+    def test_miss(self):
+        cache = GameStateCache()
+        assert cache.get("g1") is None
+        assert cache.misses == 1
+
+    def test_put_and_get(self):
+        cache = GameStateCache()
+        cache.put(_game())
+        assert cache.get("g1") == _game()
+        assert cache.hits == 1
+
+    def test_returns_private_copies(self):
+        cache = GameStateCache()
+        game = _game(moves=[{"movie": "Heat"}])
+        cache.put(game)
+        game["moves"].clear()
+        cache.get("g1")["moves"].pop()
+        assert cache.get("g1")["moves"] == [{"movie": "Heat"}]
+
+    def test_never_replaces_newer_version(self):
+        cache = GameStateCache()
+        cache.put(_game(version=3))
+        cache.put(_game(version=2))
+        assert cache.get("g1")["version"] == 3
+        cache.put(_game(version=4))
+        assert cache.get("g1")["version"] == 4
+
+    def test_invalidate(self):
+        cache = GameStateCache()
+        cache.put(_game())
+        cache.invalidate("g1")
+        cache.invalidate("missing")
+        assert cache.get("g1") is None
+
+    def test_evicts_least_recently_used(self):
+        cache = GameStateCache(max_size=2)
+        cache.put(_game("a"))
+        cache.put(_game("b"))
+        cache.get("a")
+        cache.put(_game("c"))
+        assert len(cache) == 2
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+
+    def test_entries_expire(self):
+        cache = GameStateCache(ttl_seconds=60)
+        with patch("time.monotonic", return_value=1000.0):
+            cache.put(_game())
+        with patch("time.monotonic", return_value=1061.0):
+            assert cache.get("g1") is None
+        assert len(cache) == 0
@@ -0,0 +1,218 @@
+import random
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from art_graph.cinema_data_providers.tmdb_models import (
+    CastMember,
+    MovieCreditRole,
+    Person,
+)
+from cinema_game_backend.agents.puzzle_agent import generate_puzzle
+from cinema_game_backend.graph_snapshot import (
+    GraphSnapshot,
+    crawl_tmdb,
+    generate_puzzle_from_snapshot,
+    open_snapshot,
+    write_snapshot,
+)
+
+
+@pytest.fixture
+def snapshot(tmp_path, chain_graph):
+    write_snapshot(str(tmp_path / "graph"), chain_graph())
+    snapshot = GraphSnapshot(str(tmp_path / "graph"))
+    yield snapshot
+    snapshot.close()
+
+
+class TestSnapshotFormat:
+    def test_counts(self, snapshot):
+        assert snapshot.n_actors == 11
+        assert snapshot.n_movies == 10
+
+    def test_id_lookup(self, snapshot):
+        assert snapshot.actor_ids[snapshot.actor_index(5)] == 5
+        assert snapshot.movie_ids[snapshot.movie_index(103)] == 103
+        assert snapshot.actor_index(999) is None
+        assert snapshot.movie_index(1) is None
+
+    def test_cast_in_billing_order(self, tmp_path, chain_graph):
+        data = chain_graph(length=1)
+        data.credits[101] = [2, 1]
+        write_snapshot(str(tmp_path / "g"), data)
+        snapshot = GraphSnapshot(str(tmp_path / "g"))
+        cast = snapshot.movie_cast(snapshot.movie_index(101))
+        assert snapshot.actor_ids[cast].tolist() == [2, 1]
+
+    def test_actor_movies_most_popular_first(self, snapshot):
+        movies = snapshot.actor_movies(snapshot.actor_index(5))
+        # Actor 5 is in Movie 4 (popularity 4) and Movie 5 (popularity 5).
+        assert snapshot.movie_ids[movies].tolist() == [105, 104]
+
+    def test_filter_masks(self, tmp_path, chain_graph):
+        data = chain_graph(length=2)
+        data.movies[101]["accepted"]["easy"] = False
+        write_snapshot(str(tmp_path / "g"), data)
+        snapshot = GraphSnapshot(str(tmp_path / "g"))
+        assert snapshot.movie_accepted("easy").tolist() == [False, True]
+        assert snapshot.movie_accepted("hard").tolist() == [True, True]
+        assert snapshot.movie_accepted("unknown") is None
+
+    def test_metadata(self, snapshot):
+        assert snapshot.actor(snapshot.actor_index(3)) == {
+            "type": "actor",
+            "name": "Actor 3",
+            "id": 3,
+            "profile_url": None,
+        }
+        movie = snapshot.movie(snapshot.movie_index(102))
+        assert movie["title"] == "Movie 2"
+        assert movie["year"] == "2000"
+
+    def test_rewrite_replaces_snapshot(self, tmp_path, chain_graph):
+        directory = str(tmp_path / "g")
+        write_snapshot(directory, chain_graph(length=2))
+        write_snapshot(directory, chain_graph(length=5))
+        assert GraphSnapshot(directory).n_movies == 5
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["g"]
+
+    def test_open_missing_snapshot(self, tmp_path):
+        assert open_snapshot(None) is None
+        assert open_snapshot(str(tmp_path / "missing")) is None
+
+
+class TestGenerateFromSnapshot:
+    def _assert_valid_path(self, snapshot, path):
+        for i in range(1, len(path), 2):
+            movie = snapshot.movie_index(path[i]["id"])
+            cast = snapshot.actor_ids[snapshot.movie_cast(movie)].tolist()
+            assert path[i - 1]["id"] in cast
+            assert path[i + 1]["id"] in cast
+
+    @pytest.mark.parametrize("difficulty", ["easy", "medium", "hard"])
+    async def test_puzzle_is_a_valid_walk(self, snapshot, difficulty):
+        puzzle = await generate_puzzle_from_snapshot(
+            snapshot, difficulty, rng=random.Random(1)
+        )
+        path = puzzle["known_solution"]
+        assert len(path) >= 2 * puzzle["min_moves"] + 1
+        assert puzzle["start_actor"]["id"] == path[0]["id"]
+        assert puzzle["end_actor"]["id"] == path[-1]["id"]
+        assert puzzle["difficulty"] == difficulty
+        self._assert_valid_path(snapshot, path)
+
+    async def test_min_moves_is_the_real_distance(self, snapshot):
+        rng = random.Random(0)
+        for _ in range(20):
+            puzzle = await generate_puzzle_from_snapshot(snapshot, "medium", rng=rng)
+            # On a chain, walks may double back; the distance is the id gap.
+            gap = abs(puzzle["end_actor"]["id"] - puzzle["start_actor"]["id"])
+            assert puzzle["min_moves"] == gap
+            assert puzzle["min_moves"] >= 3
+
+    async def test_uses_most_distant_walk_below_the_floor(self, tmp_path, chain_graph):
+        # Three actors in a row: no two are more than 2 hops apart.
+        write_snapshot(str(tmp_path / "g"), chain_graph(length=2))
+        snapshot = GraphSnapshot(str(tmp_path / "g"))
+        puzzle = await generate_puzzle_from_snapshot(
+            snapshot, "medium", rng=random.Random(0)
+        )
+        assert puzzle["min_moves"] == 2
+        assert {puzzle["start_actor"]["id"], puzzle["end_actor"]["id"]} == {1, 3}
+
+    async def test_start_and_end_never_share_a_movie(self, snapshot):
+        rng = random.Random(0)
+        for _ in range(20):
+            puzzle = await generate_puzzle_from_snapshot(snapshot, "medium", rng=rng)
+            start = snapshot.actor_index(puzzle["start_actor"]["id"])
+            end = snapshot.actor_index(puzzle["end_actor"]["id"])
+            assert start != end
+            assert not set(snapshot.actor_movies(start).tolist()) & set(
+                snapshot.actor_movies(end).tolist()
+            )
+
+    async def test_easy_never_repeats_a_movie(self, snapshot):
+        rng = random.Random(0)
+        for _ in range(20):
+            puzzle = await generate_puzzle_from_snapshot(snapshot, "easy", rng=rng)
+            movie_ids = [
+                step["id"]
+                for step in puzzle["known_solution"]
+                if step["type"] == "movie"
+            ]
+            assert len(movie_ids) == len(set(movie_ids))
+
+    async def test_raises_when_no_walk_fits(self, tmp_path, chain_graph):
+        write_snapshot(str(tmp_path / "g"), chain_graph(length=1))
+        snapshot = GraphSnapshot(str(tmp_path / "g"))
+        with pytest.raises(RuntimeError, match="graph snapshot"):
+            await generate_puzzle_from_snapshot(snapshot, "easy")
+
+
+class TestGeneratePuzzleBackend:
+    async def test_snapshot_makes_no_tmdb_calls(self, snapshot):
+        tmdb = AsyncMock()
+        puzzle = await generate_puzzle(tmdb, "easy", snapshot=snapshot)
+        assert puzzle["difficulty"] == "easy"
+        assert tmdb.mock_calls == []
+
+    async def test_falls_back_to_tmdb_when_snapshot_fails(self, snapshot):
+        with (
+            patch(
+                "cinema_game_backend.agents.puzzle_agent.generate_puzzle_from_snapshot",
+                side_effect=RuntimeError("no walk"),
+            ),
+            patch(
+                "cinema_game_backend.agents.puzzle_agent._pick_popular_actor",
+                new_callable=AsyncMock,
+                side_effect=RuntimeError("TMDb walk"),
+            ),
+        ):
+            with pytest.raises(RuntimeError, match="TMDb walk"):
+                await generate_puzzle(MagicMock(), "easy", snapshot=snapshot)
+
+
+class TestCrawl:
+    async def test_crawls_from_popular_people(self):
+        movie = MovieCreditRole(
+            id=100, title="Heat", release_date="1995-12-15", popularity=30.0
+        )
+        tmdb = MagicMock()
+        tmdb.get_popular_people = AsyncMock(
+            return_value=[Person(id=1, name="Al Pacino", popularity=25.0)]
+        )
+        tmdb.get_person_details = AsyncMock(
+            side_effect=lambda pid: Person(
+                id=pid, name=f"Person {pid}", popularity=float(pid)
+            )
+        )
+        tmdb.get_person_movies = AsyncMock(
+            side_effect=lambda pid, limit=20: [movie] if pid == 1 else []
+        )
+        tmdb.get_movie_cast = AsyncMock(
+            return_value=[
+                CastMember(id=1, name="Al Pacino"),
+                CastMember(id=2, name="Robert De Niro"),
+                CastMember(id=1, name="Al Pacino"),
+            ]
+        )
+
+        data = await crawl_tmdb(tmdb, seed_pages=1, max_actors=10)
+
+        assert data.credits == {100: [1, 2]}
+        assert data.movies[100]["title"] == "Heat"
+        assert data.movies[100]["year"] == "1995"
+        assert set(data.movies[100]["accepted"]) == {"easy", "medium", "hard"}
+        assert data.actors[2]["popularity"] == 2.0
+        tmdb.get_movie_cast.assert_awaited_once_with(100)
+
+    async def test_stops_after_max_actors(self):
+        tmdb = MagicMock()
+        tmdb.get_popular_people = AsyncMock(
+            return_value=[Person(id=i, name=f"P{i}") for i in range(1, 6)]
+        )
+        tmdb.get_person_details = AsyncMock(return_value=None)
+        tmdb.get_person_movies = AsyncMock(return_value=[])
+
+        await crawl_tmdb(tmdb, seed_pages=1, max_actors=3)
+
+        assert tmdb.get_person_movies.await_count == 3
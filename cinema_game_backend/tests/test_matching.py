@@ -1,6 +1,10 @@
-"""Tests for fuzzy actor name matching against cast lists."""
+"""Tests for fuzzy actor name and movie title matching."""
 
-from cinema_game_backend.matching import find_actor_in_cast
+import random
+
+import pytest
+
+from cinema_game_backend.matching import CastIndex, find_actor_in_cast, match_title
 
 
 class TestExactMatch:
@@ -117,3 +121,101 @@ class TestEdgeCases:
         result = find_actor_in_cast("  Matt   Damon  ", departed_cast)
         assert result is not None
         assert result.matched_name == "Matt Damon"
+
+
+class TestCastIndex:
+    def test_match_agrees_with_find_actor_in_cast(self, departed_cast):
+        index = CastIndex(departed_cast)
+        for query in (
+            "Leonardo DiCaprio",
+            "Matt Daimon",
+            "Nicholson",
+            "Jack Nickleson",
+            "Leo DiCaprio",
+            "Tom Hanks",
+            "",
+        ):
+            assert index.match(query) == find_actor_in_cast(query, departed_cast)
+
+    def test_reusable_across_queries(self, apocalypse_now_cast):
+        index = CastIndex(apocalypse_now_cast)
+        assert index.match("Marlon Brando").matched_name == "Marlon Brando"
+        assert index.match("Dennis Hoper").matched_name == "Dennis Hopper"
+
+    def test_precomputes_name_parts(self):
+        index = CastIndex(["  Tom   Hanks ", "Cher"])
+        assert index.normalized == ["tom hanks", "cher"]
+        assert index.first_names == ["tom", "cher"]
+        assert index.last_names == ["hanks", "cher"]
+
+    def test_exact_match_returns_first_duplicate(self):
+        index = CastIndex(["Tom Hanks", "tom hanks"])
+        assert index.match("TOM HANKS").matched_name == "Tom Hanks"
+
+    def test_empty_cast(self):
+        assert CastIndex([]).match("Tom Hanks") is None
+
+
+def _synthetic_cast(size, seed):
+    rng = random.Random(seed)
+    syllables = ["an", "bel", "cor", "da", "el", "fin", "gar", "ho", "is", "jo"]
+
+    def word():
+        return "".join(rng.choice(syllables) for _ in range(rng.randint(1, 3)))
+
+    names = []
+    for _ in range(size):
+        tokens = rng.choice([1, 2, 2, 2, 3])
+        names.append(" ".join(word().title() for _ in range(tokens)))
+    return names
+
+
+class TestBatchedGate:
+    """gate_batched must admit exactly the cast members gate_scalar does."""
+
+    @pytest.mark.parametrize("size", [20, 100, 500])
+    def test_matches_scalar_gate(self, size):
+        cast = _synthetic_cast(size, seed=size)
+        index = CastIndex(cast)
+        rng = random.Random(size + 1)
+        queries = ["Belda", "Jo", "Cor Hofin", "An Elis Dagar"]
+        for name in rng.sample(cast, 10):
+            norm = name.lower()
+            queries.append(norm)
+            queries.append(norm[:-1])
+            queries.append(norm.split()[-1])
+            queries.append(norm.split()[0][:2] + " " + norm.split()[-1])
+
+        for query in queries:
+            query_norm = " ".join(query.lower().split())
+            q_parts = query_norm.split()
+            for max_distance in range(4):
+                assert index.gate_batched(
+                    query_norm, q_parts, max_distance
+                ) == index.gate_scalar(query_norm, q_parts, max_distance), (
+                    query,
+                    max_distance,
+                )
+
+    def test_large_cast_match_uses_same_rules(self, departed_cast):
+        cast = _synthetic_cast(200, seed=7) + departed_cast
+        assert CastIndex(cast).match("Matt Daimon").matched_name == "Matt Damon"
+        assert CastIndex(cast).match("Nicholson").matched_name == "Jack Nicholson"
+
+
+class TestMatchTitle:
+    def test_exact_title_preferred_over_longer_titles(self):
+        assert match_title("Thor", ["Thor: Ragnarok", "Thor"]) == 1
+
+    def test_ignores_case_and_punctuation(self):
+        assert match_title("oceans eleven", ["Heat", "Ocean's Eleven"]) == 1
+        assert match_title("Spiderman", ["Spider-Man"]) == 0
+
+    def test_minor_typo(self):
+        assert match_title("The Departd", ["The Departed"]) == 0
+
+    def test_no_partial_matches(self):
+        assert match_title("Batman", ["Batman Returns"]) is None
+
+    def test_empty(self):
+        assert match_title("Heat", []) is None
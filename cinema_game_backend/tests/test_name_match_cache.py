@@ -0,0 +1,122 @@
+import time
+import pytest
+from unittest.mock import patch
+from cinema_game_backend.name_match_cache import (
+    NameMatchCache,
+    cast_fingerprint,
+    normalize_query,
+)
+
+CAST = ["Marlon Brando", "Martin Sheen", "Laurence Fishburne"]
+
+pytestmark = pytest.mark.usefixtures("use_in_memory_db")
+
+
+class TestKeys:
+    def test_query_normalized(self):
+        assert normalize_query("  Larry   FISHBURNE ") == "larry fishburne"
+
+    def test_fingerprint_ignores_cast_order(self):
+        assert cast_fingerprint(CAST) == cast_fingerprint(list(reversed(CAST)))
+
+    def test_fingerprint_changes_with_cast(self):
+        assert cast_fingerprint(CAST) != cast_fingerprint(CAST[:2])
+
+
+class TestLookup:
+    def test_miss(self):
+        assert NameMatchCache().lookup("Larry Fishburne", CAST) is None
+
+    def test_positive_match_round_trips(self):
+        cache = NameMatchCache()
+        cache.store("Larry Fishburne", CAST, "Laurence Fishburne")
+        hit = cache.lookup("larry fishburne", CAST)
+        assert hit is not None
+        assert hit.matched_name == "Laurence Fishburne"
+
+    def test_negative_match_is_cached(self):
+        cache = NameMatchCache()
+        cache.store("Bob Nobody", CAST, None)
+        hit = cache.lookup("Bob Nobody", CAST)
+        assert hit is not None
+        assert hit.matched_name is None
+
+    def test_different_cast_misses(self):
+        cache = NameMatchCache()
+        cache.store("Larry Fishburne", CAST, "Laurence Fishburne")
+        assert cache.lookup("Larry Fishburne", CAST[:2]) is None
+
+    def test_survives_a_new_process(self):
+        """A fresh cache (empty memory tier) still hits the database row."""
+        NameMatchCache().store("Larry Fishburne", CAST, "Laurence Fishburne")
+        hit = NameMatchCache().lookup("Larry Fishburne", CAST)
+        assert hit is not None
+        assert hit.matched_name == "Laurence Fishburne"
+
+    def test_memory_only_cache_skips_database(self, use_in_memory_db):
+        cache = NameMatchCache(persistent=False)
+        cache.store("Larry Fishburne", CAST, "Laurence Fishburne")
+        assert cache.lookup("Larry Fishburne", CAST) is not None
+        count = use_in_memory_db.execute(
+            "SELECT COUNT(*) FROM llm_name_matches"
+        ).fetchone()[0]
+        assert count == 0
+
+
+class TestExpiry:
+    def test_expired_entries_miss(self):
+        cache = NameMatchCache(ttl_seconds=60)
+        cache.store("Larry Fishburne", CAST, "Laurence Fishburne")
+        with patch("time.time", return_value=time.time() + 120):
+            assert cache.lookup("Larry Fishburne", CAST) is None
+            assert (
+                NameMatchCache(ttl_seconds=60).lookup("Larry Fishburne", CAST) is None
+            )
+
+    def test_memory_tier_evicts_least_recently_used(self):
+        cache = NameMatchCache(memory_size=2, persistent=False)
+        cache.store("a", CAST, None)
+        cache.store("b", CAST, None)
+        cache.lookup("a", CAST)
+        cache.store("c", CAST, None)
+        assert cache.lookup("a", CAST) is not None
+        assert cache.lookup("b", CAST) is None
+
+    def test_database_tier_keeps_at_most_max_rows(self, use_in_memory_db):
+        cache = NameMatchCache(max_rows=2)
+        with patch("time.time", side_effect=[1000.0, 1001.0, 1002.0, 1003.0]):
+            cache.store("a", CAST, None)
+            cache.store("b", CAST, None)
+            # Touch "a" so "b" is the least recently used row.
+            NameMatchCache(max_rows=2).lookup("a", CAST)
+            cache.store("c", CAST, None)
+        rows = use_in_memory_db.execute(
+            "SELECT query FROM llm_name_matches ORDER BY query"
+        ).fetchall()
+        assert [r["query"] for r in rows] == ["a", "c"]
+
+    def test_database_tier_trims_in_batches(self, use_in_memory_db):
+        cache = NameMatchCache(max_rows=10, memory_size=0)
+
+        def queries():
+            rows = use_in_memory_db.execute(
+                "SELECT query FROM llm_name_matches ORDER BY last_used_at"
+            ).fetchall()
+            return [r["query"] for r in rows]
+
+        with patch("time.time", side_effect=[1000.0 + i for i in range(12)]):
+            for i in range(11):
+                cache.store(f"q{i}", CAST, None)
+            # Over the cap, a tenth more than the excess goes, oldest first.
+            assert queries() == [f"q{i}" for i in range(2, 11)]
+            # The next insert fits without another trim.
+            cache.store("q11", CAST, None)
+        assert queries() == [f"q{i}" for i in range(2, 12)]
+
+    def test_database_tier_is_trimmed_every_tenth_of_max_rows(self):
+        cache = NameMatchCache(max_rows=30)
+        with patch("cinema_game_backend.name_match_cache.put_name_match") as put:
+            for i in range(7):
+                cache.store(f"q{i}", CAST, None)
+        trims = [c.kwargs["trim"] for c in put.call_args_list]
+        assert trims == [True, False, False, True, False, False, True]
@@ -0,0 +1,126 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from art_graph.cinema_data_providers.tmdb_models import CastMember, MovieCreditRole
+from cinema_game_backend.graph_snapshot import GraphSnapshot, write_snapshot
+from cinema_game_backend.path_solver import PathSolver
+
+
+def actor(id):
+    return {"name": f"Actor {id}", "id": id, "profile_url": None}
+
+
+@pytest.fixture
+def snapshot(tmp_path, chain_graph):
+    # Actors 1..11 in a chain, plus an obscure Movie 99 starring 2 and 8.
+    data = chain_graph()
+    data.movies[99] = {
+        "title": "Shortcut",
+        "year": "2000",
+        "popularity": 0.5,
+        "poster_url": None,
+        "backdrop_url": None,
+        "accepted": {"easy": False, "medium": True, "hard": True},
+    }
+    data.credits[99] = [2, 8]
+    write_snapshot(str(tmp_path / "graph"), data)
+    snapshot = GraphSnapshot(str(tmp_path / "graph"))
+    yield snapshot
+    snapshot.close()
+
+
+def ids(path):
+    return [step["id"] for step in path]
+
+
+class TestPathSolverOnSnapshot:
+    async def test_shortest_path(self, snapshot):
+        solver = PathSolver(MagicMock(), snapshot)
+        path = await solver.shortest_path("medium", actor(1), actor(9))
+        assert ids(path) == [1, 101, 2, 99, 8, 108, 9]
+        assert path[0] == {"type": "actor", **actor(1)}
+        assert path[1]["title"] == "Movie 1"
+        assert path[3]["title"] == "Shortcut"
+
+    async def test_respects_difficulty_filters(self, snapshot):
+        solver = PathSolver(MagicMock(), snapshot)
+        path = await solver.shortest_path("easy", actor(1), actor(9))
+        # The shortcut movie is not an easy one.
+        assert "Shortcut" not in [step.get("title") for step in path]
+        assert len(path) == 2 * 8 + 1
+
+    async def test_memoizes_path_and_its_suffixes(self, snapshot):
+        solver = PathSolver(MagicMock(), snapshot)
+        path = await solver.shortest_path("medium", actor(1), actor(9))
+        assert await solver.shortest_path("medium", actor(1), actor(9)) == path
+        # Following the hint lands on the next actor, whose path is known.
+        assert await solver.shortest_path("medium", actor(2), actor(9)) == path[2:]
+        assert solver.searches == 1
+        await solver.shortest_path("hard", actor(2), actor(9))
+        assert solver.searches == 2
+
+    async def test_cache_is_bounded(self, snapshot):
+        solver = PathSolver(MagicMock(), snapshot, cache_size=2)
+        await solver.shortest_path("medium", actor(1), actor(9))
+        assert len(solver) == 2
+
+    async def test_no_path_within_hop_cap(self, snapshot):
+        solver = PathSolver(MagicMock(), snapshot, max_hops=2)
+        assert await solver.shortest_path("easy", actor(1), actor(9)) is None
+        assert await solver.shortest_path("easy", actor(1), actor(9)) is None
+        assert solver.searches == 1
+
+    async def test_search_cut_short_is_not_memoized(self, snapshot):
+        solver = PathSolver(MagicMock(), snapshot, max_frontier=0)
+        assert await solver.shortest_path("easy", actor(1), actor(9)) is None
+        assert await solver.shortest_path("easy", actor(1), actor(9)) is None
+        assert solver.searches == 2
+        assert len(solver) == 0
+
+
+class TestPathSolverOnTMDb:
+    @staticmethod
+    def make_tmdb(credits: dict[int, list[int]]):
+        tmdb = MagicMock()
+        tmdb.get_person_movies = AsyncMock(
+            side_effect=lambda pid, limit=20: [
+                MovieCreditRole(id=m, title=f"Movie {m}")
+                for m, cast in credits.items()
+                if pid in cast
+            ]
+        )
+        tmdb.get_movie_cast = AsyncMock(
+            side_effect=lambda mid: [
+                CastMember(id=a, name=f"Actor {a}") for a in credits[mid]
+            ]
+        )
+        return tmdb
+
+    @pytest.fixture(autouse=True)
+    def movie_filters(self):
+        """Medium accepts every movie except 30."""
+        movie_filter = MagicMock()
+        movie_filter.accepts = lambda movie: movie.id != 30
+        with patch(
+            "cinema_game_backend.path_solver.MOVIE_FILTERS", {"medium": movie_filter}
+        ):
+            yield
+
+    async def test_without_snapshot(self):
+        solver = PathSolver(self.make_tmdb({10: [1, 2], 20: [2, 3]}))
+        path = await solver.shortest_path("medium", actor(1), actor(3))
+        assert ids(path) == [1, 10, 2, 20, 3]
+        assert path[1]["title"] == "Movie 10"
+        assert path[2]["name"] == "Actor 2"
+
+    async def test_respects_difficulty_filters(self):
+        tmdb = self.make_tmdb({10: [1, 2], 20: [2, 3], 30: [1, 3]})
+        solver = PathSolver(tmdb)
+        path = await solver.shortest_path("medium", actor(1), actor(3))
+        assert ids(path) == [1, 10, 2, 20, 3]
+
+    async def test_actor_missing_from_snapshot(self, snapshot):
+        tmdb = self.make_tmdb({10: [500, 501]})
+        solver = PathSolver(tmdb, snapshot)
+        path = await solver.shortest_path("medium", actor(500), actor(501))
+        assert ids(path) == [500, 10, 501]
+        tmdb.get_person_movies.assert_awaited()
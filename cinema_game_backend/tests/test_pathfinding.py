@@ -0,0 +1,163 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from art_graph.cinema_data_providers.tmdb_models import CastMember, MovieCreditRole
+from cinema_game_backend.graph_snapshot import GraphSnapshot, write_snapshot
+from cinema_game_backend.pathfinding import (
+    ACTOR,
+    MOVIE,
+    SnapshotGraph,
+    TMDbGraph,
+    min_moves_between,
+    shortest_path,
+)
+
+
+@pytest.fixture
+def snapshot(tmp_path, chain_graph):
+    # Actors 1..11 in a chain, plus Movie 99 starring actors 2 and 8.
+    data = chain_graph()
+    data.movies[99] = {
+        "title": "Shortcut",
+        "year": "2000",
+        "popularity": 0.5,
+        "poster_url": None,
+        "backdrop_url": None,
+        "accepted": {"easy": False, "medium": True, "hard": True},
+    }
+    data.credits[99] = [2, 8]
+    write_snapshot(str(tmp_path / "graph"), data)
+    snapshot = GraphSnapshot(str(tmp_path / "graph"))
+    yield snapshot
+    snapshot.close()
+
+
+def tmdb_ids(graph, path):
+    return [(kind, graph.tmdb_id(kind, key)) for kind, key in path]
+
+
+class TestShortestPathOnSnapshot:
+    async def _search(self, snapshot, start, end, difficulty=None, **kwargs):
+        graph = SnapshotGraph(snapshot, difficulty)
+        result = await shortest_path(
+            graph, graph.actor_key(start), graph.actor_key(end), **kwargs
+        )
+        return graph, result
+
+    async def test_finds_shortest_path(self, snapshot):
+        graph, result = await self._search(snapshot, 1, 9)
+        # 1 -> 2 -> (Shortcut) -> 8 -> 9 instead of eight hops down the chain.
+        assert result.hops == 3
+        assert result.ruled_out_hops == 2
+        assert tmdb_ids(graph, result.path) == [
+            (ACTOR, 1),
+            (MOVIE, 101),
+            (ACTOR, 2),
+            (MOVIE, 99),
+            (ACTOR, 8),
+            (MOVIE, 108),
+            (ACTOR, 9),
+        ]
+
+    @pytest.mark.parametrize("start,end", [(9, 1), (1, 2), (3, 7)])
+    async def test_path_is_connected_in_either_direction(self, snapshot, start, end):
+        graph, result = await self._search(snapshot, start, end)
+        path = tmdb_ids(graph, result.path)
+        assert path[0] == (ACTOR, start)
+        assert path[-1] == (ACTOR, end)
+        for i in range(1, len(path), 2):
+            cast = snapshot.actor_ids[
+                snapshot.movie_cast(snapshot.movie_index(path[i][1]))
+            ].tolist()
+            assert path[i - 1][1] in cast
+            assert path[i + 1][1] in cast
+
+    async def test_same_actor(self, snapshot):
+        _, result = await self._search(snapshot, 4, 4)
+        assert result.hops == 0
+
+    async def test_hop_cap(self, snapshot):
+        _, result = await self._search(snapshot, 1, 11, max_hops=3)
+        assert result.path is None
+        assert result.ruled_out_hops == 3
+        assert result.complete
+        _, result = await self._search(snapshot, 1, 11, max_hops=5)
+        assert result.hops == 5
+
+    async def test_frontier_limit(self, snapshot):
+        # Both sides reach two movies after one step, and stop there.
+        _, result = await self._search(snapshot, 3, 9, max_frontier=1)
+        assert result.path is None
+        assert not result.complete
+        assert result.ruled_out_hops == 1
+
+    async def test_difficulty_mask(self, snapshot):
+        # Shortcut is not an "easy" movie, so easy searches take the long way.
+        _, result = await self._search(snapshot, 1, 9, difficulty="easy", max_hops=8)
+        assert result.hops == 8
+
+    async def test_disconnected(self, tmp_path, chain_graph):
+        data = chain_graph(length=2)
+        data.credits[102] = [3]
+        write_snapshot(str(tmp_path / "g"), data)
+        snapshot = GraphSnapshot(str(tmp_path / "g"))
+        _, result = await self._search(snapshot, 1, 3)
+        assert result.path is None
+        assert result.complete
+
+
+class TestShortestPathOnTMDb:
+    @staticmethod
+    def make_tmdb(credits: dict[int, list[int]]):
+        """credits maps movie id -> cast ids."""
+        tmdb = MagicMock()
+        tmdb.get_person_movies = AsyncMock(
+            side_effect=lambda pid, limit=20: [
+                MovieCreditRole(id=m, title=f"Movie {m}")
+                for m, cast in credits.items()
+                if pid in cast
+            ]
+        )
+        tmdb.get_movie_cast = AsyncMock(
+            side_effect=lambda mid: [
+                CastMember(id=a, name=f"Actor {a}") for a in credits[mid]
+            ]
+        )
+        return tmdb
+
+    async def test_finds_path(self):
+        tmdb = self.make_tmdb({10: [1, 2], 20: [2, 3], 30: [3, 4]})
+        result = await shortest_path(TMDbGraph(tmdb), 1, 4)
+        assert result.path == [
+            (ACTOR, 1),
+            (MOVIE, 10),
+            (ACTOR, 2),
+            (MOVIE, 20),
+            (ACTOR, 3),
+            (MOVIE, 30),
+            (ACTOR, 4),
+        ]
+
+    async def test_movie_filter(self):
+        tmdb = self.make_tmdb({10: [1, 2], 20: [2, 3], 30: [1, 3]})
+        assert (await shortest_path(TMDbGraph(tmdb), 1, 3)).hops == 1
+        movie_filter = MagicMock()
+        movie_filter.accepts = lambda movie: movie.id != 30
+        result = await shortest_path(TMDbGraph(tmdb, movie_filter), 1, 3)
+        assert result.hops == 2
+
+
+class TestMinMovesBetween:
+    async def test_exact_within_walk_length(self, snapshot):
+        graph = SnapshotGraph(snapshot)
+        key = graph.actor_key
+        assert await min_moves_between(graph, key(1), key(9), 8) == 3
+
+    async def test_walk_length_when_nothing_shorter(self, snapshot):
+        graph = SnapshotGraph(snapshot)
+        key = graph.actor_key
+        assert await min_moves_between(graph, key(1), key(4), 3) == 3
+
+    async def test_walk_length_beyond_hop_cap(self, snapshot):
+        graph = SnapshotGraph(snapshot)
+        key = graph.actor_key
+        assert await min_moves_between(graph, key(1), key(11), 6, max_hops=2) == 6
@@ -0,0 +1,39 @@
+from unittest.mock import patch
+from art_graph.cinema_data_providers.tmdb_models import Person
+from cinema_game_backend.popularity_cache import PopularityCache
+
+
+class TestPopularityCache:
+    def test_miss(self):
+        assert PopularityCache().get(1) is None
+
+    def test_put_and_get(self):
+        cache = PopularityCache()
+        cache.put(1, 12.5)
+        assert cache.get(1) == 12.5
+
+    def test_record_people(self):
+        cache = PopularityCache()
+        cache.record_people(
+            [Person(id=1, name="A", popularity=3.0), Person(id=2, name="B")]
+        )
+        assert cache.get(1) == 3.0
+        assert cache.get(2) == 0.0
+
+    def test_evicts_least_recently_used(self):
+        cache = PopularityCache(max_size=2)
+        cache.put(1, 1.0)
+        cache.put(2, 2.0)
+        cache.get(1)
+        cache.put(3, 3.0)
+        assert len(cache) == 2
+        assert cache.get(1) == 1.0
+        assert cache.get(2) is None
+
+    def test_entries_expire(self):
+        cache = PopularityCache(ttl_seconds=60)
+        with patch("time.monotonic", return_value=1000.0):
+            cache.put(1, 5.0)
+        with patch("time.monotonic", return_value=1061.0):
+            assert cache.get(1) is None
+        assert len(cache) == 0
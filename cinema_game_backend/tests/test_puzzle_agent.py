@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from datetime import date
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -12,6 +13,7 @@ from cinema_game_backend.agents.puzzle_agent import (
     _random_walk,
     generate_puzzle,
 )
+from cinema_game_backend.popularity_cache import PopularityCache
 
 
 def make_person(id=1, name="Test", popularity=10.0, profile_path=None):
@@ -132,6 +134,18 @@ class TestPickPopularActor:
 
         assert result.id == 1
 
+    async def test_records_page_in_popularity_cache(self):
+        people = [
+            make_person(id=1, name="Famous", popularity=20.0),
+            make_person(id=2, name="Unknown", popularity=1.0),
+        ]
+        tmdb = make_tmdb(get_popular_people=people)
+        popularity_cache = PopularityCache()
+        await _pick_popular_actor(tmdb, 10.0, popularity_cache)
+
+        assert popularity_cache.get(1) == 20.0
+        assert popularity_cache.get(2) == 1.0
+
 
 # --- _random_walk ---
 
@@ -274,6 +288,61 @@ class TestRandomWalk:
         assert movie_step["year"] == "2023"
         assert movie_step["id"] == 100
 
+    async def test_last_hop_fetches_popularity_concurrently(self):
+        start = make_person(id=1, name="Start")
+        movie = make_movie(id=100)
+        cast = [make_cast(id=i, name=f"Actor {i}") for i in range(2, 14)]
+        in_flight = 0
+        peak = 0
+
+        async def get_details(pid):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return make_person(id=pid, popularity=float(pid))
+
+        tmdb = make_tmdb(
+            get_person_movies=lambda pid, limit=20: [movie],
+            get_movie_cast=lambda mid: cast,
+            get_person_details=get_details,
+        )
+        with patch(
+            "cinema_game_backend.agents.puzzle_agent.END_ACTOR_DETAILS_CONCURRENCY", 4
+        ):
+            path = await _random_walk(tmdb, start, hops=1, min_popularity=100.0)
+
+        # Only the top ten billed are scored; the most popular of them wins.
+        assert tmdb.get_person_details.await_count == 10
+        assert peak == 4
+        assert path[-1]["id"] == 11
+
+    async def test_last_hop_uses_popularity_cache(self):
+        start = make_person(id=1, name="Start")
+        movie = make_movie(id=100)
+        cached = make_cast(id=2, name="Cached")
+        fetched = make_cast(id=3, name="Fetched")
+        popularity_cache = PopularityCache()
+        popularity_cache.put(2, 30.0)
+
+        tmdb = make_tmdb(
+            get_person_movies=lambda pid, limit=20: [movie],
+            get_movie_cast=lambda mid: [cached, fetched],
+            get_person_details=lambda pid: make_person(id=pid, popularity=1.0),
+        )
+        path = await _random_walk(
+            tmdb,
+            start,
+            hops=1,
+            min_popularity=10.0,
+            popularity_cache=popularity_cache,
+        )
+
+        assert path[-1]["id"] == 2
+        tmdb.get_person_details.assert_awaited_once_with(3)
+        assert popularity_cache.get(3) == 1.0
+
 
 # --- generate_puzzle ---
 
@@ -400,3 +469,171 @@ class TestGeneratePuzzle:
 
         movie_ids = [s["id"] for s in result["known_solution"] if s["type"] == "movie"]
         assert len(movie_ids) == len(set(movie_ids))
+
+
+class TestParallelAttempts:
+    @staticmethod
+    def _path(end_id):
+        return [
+            {"type": "actor", "name": "Start", "id": 1},
+            {"type": "movie", "title": "M", "id": 100},
+            {"type": "actor", "name": f"End {end_id}", "id": end_id},
+        ]
+
+    async def test_first_passing_walk_wins_and_rest_are_cancelled(self):
+        cancelled = 0
+        attempt = 0
+
+        async def mock_walk(*args, **kwargs):
+            nonlocal attempt, cancelled
+            attempt += 1
+            end_id = attempt
+            try:
+                # The second walk launched finishes first.
+                await asyncio.sleep(0.01 if end_id == 2 else 1)
+            except asyncio.CancelledError:
+                cancelled += 1
+                raise
+            return self._path(end_id)
+
+        tmdb = make_tmdb()
+        with (
+            patch(
+                "cinema_game_backend.agents.puzzle_agent._pick_popular_actor",
+                new_callable=AsyncMock,
+            ),
+            patch(
+                "cinema_game_backend.agents.puzzle_agent._random_walk",
+                side_effect=mock_walk,
+            ),
+            patch(
+                "cinema_game_backend.agents.puzzle_agent._has_short_path",
+                new_callable=AsyncMock,
+                return_value=False,
+            ),
+        ):
+            result = await generate_puzzle(tmdb, "hard", fanout=3)
+
+        assert result["end_actor"]["id"] == 2
+        assert attempt == 3
+        assert cancelled == 2
+
+    async def test_failed_walks_are_replaced_until_one_passes(self):
+        async def mock_short_path(tmdb, start_id, end_id, max_hops):
+            return end_id != 7
+
+        attempt = 0
+
+        async def mock_walk(*args, **kwargs):
+            nonlocal attempt
+            attempt += 1
+            return self._path(attempt)
+
+        with (
+            patch(
+                "cinema_game_backend.agents.puzzle_agent._pick_popular_actor",
+                new_callable=AsyncMock,
+            ),
+            patch(
+                "cinema_game_backend.agents.puzzle_agent._random_walk",
+                side_effect=mock_walk,
+            ),
+            patch(
+                "cinema_game_backend.agents.puzzle_agent._has_short_path",
+                side_effect=mock_short_path,
+            ),
+        ):
+            result = await generate_puzzle(make_tmdb(), "hard", fanout=4)
+
+        assert result["end_actor"]["id"] == 7
+
+    async def test_raises_after_max_attempts(self):
+        start = make_person(id=1, name="Start", popularity=10.0)
+        tmdb = make_tmdb(
+            get_popular_people=[start],
+            get_person_movies=lambda pid, limit=20: [],
+        )
+        with pytest.raises(RuntimeError, match="after 15 attempts"):
+            await generate_puzzle(tmdb, "medium", fanout=4)
+        assert tmdb.get_person_movies.await_count == 15
+
+    async def test_tmdb_calls_share_one_budget(self):
+        in_flight = 0
+        peak = 0
+
+        async def get_person_movies(pid, limit=20):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return []
+
+        tmdb = make_tmdb(
+            get_popular_people=[make_person(id=1, popularity=10.0)],
+            get_person_movies=get_person_movies,
+        )
+        with patch(
+            "cinema_game_backend.agents.puzzle_agent.PUZZLE_ATTEMPT_TMDB_CONCURRENCY",
+            2,
+        ):
+            with pytest.raises(RuntimeError):
+                await generate_puzzle(tmdb, "medium", fanout=5)
+        assert peak == 2
+
+
+class TestPathSearchOnTMDb:
+    @staticmethod
+    def _path(end_id, hops=3):
+        path = [{"type": "actor", "name": "Start", "id": 1}]
+        for hop in range(hops):
+            path.append({"type": "movie", "title": "M", "id": 100 + hop})
+            path.append({"type": "actor", "name": "A", "id": end_id})
+        return path
+
+    async def _generate(self, distances: dict[int, int], difficulty="medium"):
+        """Walks end at actors 2, 3, ...; distances maps end actor -> min moves."""
+        end_ids = iter(range(2, 100))
+
+        async def mock_walk(tmdb, start_actor, hops, *args, **kwargs):
+            return self._path(next(end_ids), hops)
+
+        async def mock_min_moves(graph, start, end, walk_hops, **kwargs):
+            return distances.get(end, walk_hops)
+
+        with (
+            patch("cinema_game_backend.agents.puzzle_agent.PATH_SEARCH_ON_TMDB", True),
+            patch(
+                "cinema_game_backend.agents.puzzle_agent._pick_popular_actor",
+                new_callable=AsyncMock,
+            ),
+            patch(
+                "cinema_game_backend.agents.puzzle_agent._random_walk",
+                side_effect=mock_walk,
+            ),
+            patch(
+                "cinema_game_backend.agents.puzzle_agent.min_moves_between",
+                side_effect=mock_min_moves,
+            ),
+            patch(
+                "cinema_game_backend.agents.puzzle_agent.random.randint",
+                return_value=5,
+            ),
+        ):
+            return await generate_puzzle(make_tmdb(), difficulty)
+
+    async def test_rejects_walks_below_the_floor(self):
+        result = await self._generate({2: 1, 3: 2, 4: 4})
+        assert result["end_actor"]["id"] == 4
+        assert result["min_moves"] == 4
+
+    async def test_falls_back_to_most_distant_walk(self):
+        distances = {end: 1 for end in range(2, 17)}
+        distances.update({6: 2, 9: 2})
+        result = await self._generate(distances)
+        assert result["end_actor"]["id"] == 6
+        assert result["min_moves"] == 2
+
+    async def test_never_falls_back_to_a_shared_movie(self):
+        with pytest.raises(RuntimeError, match="after 15 attempts"):
+            await self._generate({end: 1 for end in range(2, 17)})
@@ -0,0 +1,141 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from cinema_game_backend.database import add_pooled_puzzle, count_pooled_puzzles
+from cinema_game_backend.puzzle_pool import PuzzlePool
+from cinema_game_backend.tmdb_scheduler import TMDbPriority, _priority
+
+pytestmark = pytest.mark.usefixtures("use_in_memory_db")
+
+
+def _puzzle(difficulty="easy", start_id=1):
+    return {
+        "start_actor": {"name": "Start", "id": start_id, "profile_url": None},
+        "end_actor": {"name": "End", "id": 2, "profile_url": None},
+        "difficulty": difficulty,
+        "min_moves": 2,
+        "known_solution": [],
+    }
+
+
+def _make_pool(**kwargs):
+    kwargs.setdefault("size", 3)
+    kwargs.setdefault("low_water", 1)
+    kwargs.setdefault("concurrency", 2)
+    kwargs.setdefault("recheck_seconds", 60)
+    kwargs.setdefault("difficulties", ("easy",))
+    return PuzzlePool(MagicMock(), **kwargs)
+
+
+async def _wait_for(predicate, timeout=2.0):
+    async def poll():
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+class TestTake:
+    async def test_empty_pool_returns_none(self):
+        pool = _make_pool()
+        assert await pool.take("easy") is None
+        assert (await pool.stats())["difficulties"]["easy"]["misses"] == 1
+
+    async def test_returns_oldest_pooled_puzzle(self):
+        add_pooled_puzzle("easy", _puzzle(start_id=1))
+        add_pooled_puzzle("easy", _puzzle(start_id=2))
+        pool = _make_pool()
+
+        puzzle = await pool.take("easy")
+
+        assert puzzle["start_actor"]["id"] == 1
+        assert count_pooled_puzzles("easy") == 1
+        assert (await pool.stats())["difficulties"]["easy"]["hits"] == 1
+
+    async def test_difficulties_are_separate(self):
+        add_pooled_puzzle("hard", _puzzle("hard"))
+        pool = _make_pool(difficulties=("easy", "hard"))
+        assert await pool.take("easy") is None
+        assert (await pool.take("hard"))["difficulty"] == "hard"
+
+
+class TestRefill:
+    async def test_fills_up_to_size(self):
+        pool = _make_pool(size=3)
+        with patch(
+            "cinema_game_backend.puzzle_pool.generate_puzzle",
+            new_callable=AsyncMock,
+            side_effect=lambda tmdb, difficulty, **kwargs: _puzzle(difficulty),
+        ):
+            pool.start()
+            try:
+                await _wait_for(lambda: count_pooled_puzzles("easy") == 3)
+            finally:
+                await pool.stop()
+
+        stats = await pool.stats()
+        assert stats["difficulties"]["easy"]["generated"] == 3
+        assert stats["difficulties"]["easy"]["available"] == 3
+
+    async def test_refills_after_take_drops_to_low_water(self):
+        for _ in range(2):
+            add_pooled_puzzle("easy", _puzzle())
+        pool = _make_pool(size=2, low_water=1)
+        with patch(
+            "cinema_game_backend.puzzle_pool.generate_puzzle",
+            new_callable=AsyncMock,
+            side_effect=lambda tmdb, difficulty, **kwargs: _puzzle(difficulty),
+        ):
+            pool.start()
+            try:
+                await pool.take("easy")
+                await _wait_for(lambda: count_pooled_puzzles("easy") == 2)
+            finally:
+                await pool.stop()
+
+    async def test_generates_at_background_tmdb_priority(self):
+        priorities = []
+
+        def generate(tmdb, difficulty, **kwargs):
+            priorities.append(_priority.get())
+            return _puzzle(difficulty)
+
+        pool = _make_pool(size=1, low_water=0)
+        with patch(
+            "cinema_game_backend.puzzle_pool.generate_puzzle",
+            new_callable=AsyncMock,
+            side_effect=generate,
+        ):
+            pool.start()
+            try:
+                await _wait_for(lambda: count_pooled_puzzles("easy") == 1)
+            finally:
+                await pool.stop()
+
+        assert priorities == [TMDbPriority.BACKGROUND]
+
+    async def test_generation_failure_is_counted(self):
+        pool = _make_pool(size=1, low_water=0)
+        with patch(
+            "cinema_game_backend.puzzle_pool.generate_puzzle",
+            new_callable=AsyncMock,
+            side_effect=RuntimeError("TMDb down"),
+        ):
+            pool.start()
+            try:
+                await _wait_for(lambda: pool._counters["easy"].failed >= 1)
+            finally:
+                await pool.stop()
+
+        assert count_pooled_puzzles("easy") == 0
+
+
+class TestStats:
+    async def test_reports_configuration(self):
+        pool = _make_pool(size=5, low_water=2, concurrency=3)
+        stats = await pool.stats()
+        assert stats["enabled"] is True
+        assert stats["size"] == 5
+        assert stats["low_water"] == 2
+        assert stats["concurrency"] == 3
+        assert set(stats["difficulties"]) == {"easy"}
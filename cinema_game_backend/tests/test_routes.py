@@ -1,14 +1,22 @@
-import sqlite3
 import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
 from fastapi.testclient import TestClient
 from cinema_game_backend.main import app
-from cinema_game_backend.database import init_db
-from cinema_game_backend.dependencies import get_tmdb, get_llm, require_auth
+from cinema_game_backend.database import update_game_state
+from cinema_game_backend.dependencies import (
+    get_tmdb,
+    get_game_cache,
+    get_llm,
+    get_path_solver,
+    get_puzzle_pool,
+    require_auth,
+)
+from cinema_game_backend.game_cache import GameStateCache
 from cinema_game_backend.models.game import ValidationResult
-from art_graph.cinema_data_providers.tmdb_models import Person
 from cinema_game_backend.routes.game import _reached_end
 
+pytestmark = pytest.mark.usefixtures("use_in_memory_db")
+
 # --- Pure logic: _reached_end ---
 
 
@@ -57,17 +65,6 @@ class TestReachedEnd:
 # --- FastAPI integration tests ---
 
 
-class _NoCloseConnection:
-    def __init__(self, conn):
-        self._conn = conn
-
-    def close(self):
-        pass
-
-    def __getattr__(self, name):
-        return getattr(self._conn, name)
-
-
 def _mock_puzzle():
     return {
         "start_actor": {"name": "Brad Pitt", "id": 287, "profile_url": None},
@@ -86,22 +83,6 @@ def _mock_puzzle():
     }
 
 
-@pytest.fixture(autouse=True)
-def use_in_memory_db():
-    conn = sqlite3.connect(
-        "file::memory:?cache=shared", uri=True, check_same_thread=False
-    )
-    conn.row_factory = sqlite3.Row
-
-    def make_wrapper():
-        return _NoCloseConnection(conn)
-
-    with patch("cinema_game_backend.database.get_db", side_effect=make_wrapper):
-        init_db()
-        yield
-    conn.close()
-
-
 @pytest.fixture
 def mock_tmdb():
     mock = MagicMock()
@@ -166,6 +147,48 @@ class TestNewGame:
         assert res.status_code == 200
         assert res.json()["difficulty"] == "medium"
 
+    def test_serves_pooled_puzzle_without_generating(self, client):
+        pool = MagicMock()
+        pool.take = AsyncMock(return_value=_mock_puzzle())
+        app.dependency_overrides[get_puzzle_pool] = lambda: pool
+        try:
+            with patch(
+                "cinema_game_backend.routes.game.generate_puzzle",
+                new_callable=AsyncMock,
+            ) as mock_generate:
+                res = client.post("/game/new?difficulty=medium")
+        finally:
+            app.dependency_overrides.pop(get_puzzle_pool, None)
+
+        assert res.status_code == 200
+        assert res.json()["start_actor"]["name"] == "Brad Pitt"
+        pool.take.assert_awaited_once_with("medium")
+        mock_generate.assert_not_called()
+
+    def test_falls_back_to_live_generation_when_pool_empty(self, client):
+        pool = MagicMock()
+        pool.take = AsyncMock(return_value=None)
+        app.dependency_overrides[get_puzzle_pool] = lambda: pool
+        try:
+            with patch(
+                "cinema_game_backend.routes.game.generate_puzzle",
+                new_callable=AsyncMock,
+                return_value=_mock_puzzle(),
+            ) as mock_generate:
+                res = client.post("/game/new?difficulty=medium")
+        finally:
+            app.dependency_overrides.pop(get_puzzle_pool, None)
+
+        assert res.status_code == 200
+        mock_generate.assert_awaited_once()
+
+
+class TestPoolStats:
+    def test_disabled_pool(self, client):
+        res = client.get("/pool/stats")
+        assert res.status_code == 200
+        assert res.json()["enabled"] is False
+
 
 class TestGetGame:
     def test_get_existing_game(self, client):
@@ -185,6 +208,21 @@ class TestGetGame:
         assert data["moves"] == []
         assert data["current_actor"]["name"] == "Brad Pitt"
 
+    def test_min_moves_matches_new_game(self, client):
+        # The measured distance can be shorter than the puzzle's walk.
+        puzzle = {**_mock_puzzle(), "min_moves": 2}
+        with patch(
+            "cinema_game_backend.routes.game.generate_puzzle",
+            new_callable=AsyncMock,
+            return_value=puzzle,
+        ):
+            create_res = client.post("/game/new?difficulty=medium")
+        game_id = create_res.json()["game_id"]
+
+        res = client.get(f"/game/{game_id}")
+        assert create_res.json()["min_moves"] == 2
+        assert res.json()["min_moves"] == 2
+
     def test_get_nonexistent_game(self, client):
         res = client.get("/game/does-not-exist")
         assert res.status_code == 404
@@ -416,7 +454,10 @@ class TestUndoMove:
         ):
             res = client.post("/game/new?difficulty=medium")
         game_id = res.json()["game_id"]
+        self._move(client, game_id, "Michael Fassbender", 17288, "/fassbender.jpg")
+        return game_id
 
+    def _move(self, client, game_id, to_actor, to_actor_id, profile_url=None):
         mock_validation = ValidationResult(
             valid=True,
             explanation="Both appear in 12 Years a Slave.",
@@ -425,8 +466,9 @@ class TestUndoMove:
             movie_year="2013",
             from_actor_found=True,
             to_actor_found=True,
-            to_actor_name="Michael Fassbender",
-            to_actor_id=17288,
+            to_actor_name=to_actor,
+            to_actor_id=to_actor_id,
+            to_actor_profile_url=profile_url,
         )
 
         with patch(
@@ -434,18 +476,14 @@ class TestUndoMove:
             new_callable=AsyncMock,
             return_value=mock_validation,
         ):
-            client.post(
+            res = client.post(
                 f"/game/{game_id}/move",
-                json={"movie": "12 Years a Slave", "next_actor": "Michael Fassbender"},
+                json={"movie": "12 Years a Slave", "next_actor": to_actor},
             )
-
-        return game_id
+        assert res.json()["valid"]
 
     def test_undo_removes_last_move(self, client, mock_tmdb):
         game_id = self._create_game_with_move(client, mock_tmdb)
-        mock_tmdb.search_person = AsyncMock(
-            return_value=Person(name="Brad Pitt", id=287)
-        )
 
         res = client.delete(f"/game/{game_id}/move")
 
@@ -453,7 +491,56 @@ class TestUndoMove:
         data = res.json()
         assert data["moves"] == []
         assert data["current_actor"]["name"] == "Brad Pitt"
+        assert data["current_actor"]["id"] == 287
         assert data["game_status"] == "in_progress"
+        mock_tmdb.search_person.assert_not_called()
+
+    def test_moves_record_actor_profile_urls(self, client, mock_tmdb):
+        game_id = self._create_game_with_move(client, mock_tmdb)
+        self._move(client, game_id, "Judi Dench", 5309, "/dench.jpg")
+
+        moves = client.get(f"/game/{game_id}").json()["moves"]
+
+        assert moves[0]["to_actor_profile_url"] == "/fassbender.jpg"
+        assert moves[1]["from_actor_profile_url"] == "/fassbender.jpg"
+        assert moves[1]["to_actor_profile_url"] == "/dench.jpg"
+
+    def test_undo_restores_previous_actor_from_move_log(self, client, mock_tmdb):
+        game_id = self._create_game_with_move(client, mock_tmdb)
+        self._move(client, game_id, "Judi Dench", 5309, "/dench.jpg")
+
+        res = client.delete(f"/game/{game_id}/move")
+
+        assert res.status_code == 200
+        data = res.json()
+        assert data["current_actor"] == {
+            "name": "Michael Fassbender",
+            "id": 17288,
+            "profile_url": "/fassbender.jpg",
+        }
+        assert [m["to_actor"] for m in data["moves"]] == ["Michael Fassbender"]
+        mock_tmdb.search_person.assert_not_called()
+
+    def test_undo_steps_rolls_back_to_start(self, client, mock_tmdb):
+        game_id = self._create_game_with_move(client, mock_tmdb)
+        self._move(client, game_id, "Judi Dench", 5309, "/dench.jpg")
+
+        res = client.delete(f"/game/{game_id}/move?steps=2")
+
+        assert res.status_code == 200
+        data = res.json()
+        assert data["moves"] == []
+        assert data["current_actor"]["id"] == 287
+        state = client.get(f"/game/{game_id}").json()
+        assert state["moves"] == []
+        assert state["current_actor"]["id"] == 287
+
+    def test_undo_more_steps_than_moves_returns_400(self, client, mock_tmdb):
+        game_id = self._create_game_with_move(client, mock_tmdb)
+
+        assert client.delete(f"/game/{game_id}/move?steps=2").status_code == 400
+        assert client.delete(f"/game/{game_id}/move?steps=0").status_code == 400
+        assert len(client.get(f"/game/{game_id}").json()["moves"]) == 1
 
     def test_undo_no_moves_returns_400(self, client):
         with patch(
@@ -478,6 +565,324 @@ class TestUndoMove:
         assert res.status_code == 404
 
 
+class TestHint:
+    @pytest.fixture
+    def solver(self):
+        solver = MagicMock()
+        solver.shortest_path = AsyncMock(return_value=None)
+        app.dependency_overrides[get_path_solver] = lambda: solver
+        yield solver
+        app.dependency_overrides.pop(get_path_solver, None)
+
+    def _create_game(self, client):
+        with patch(
+            "cinema_game_backend.routes.game.generate_puzzle",
+            new_callable=AsyncMock,
+            return_value=_mock_puzzle(),
+        ):
+            return client.post("/game/new?difficulty=medium").json()["game_id"]
+
+    def test_next_step_on_shortest_path(self, client, solver):
+        game_id = self._create_game(client)
+        solver.shortest_path.return_value = [
+            {"type": "actor", "name": "Brad Pitt", "id": 287, "profile_url": None},
+            {"type": "movie", "title": "Fight Club", "id": 550, "year": "1999"},
+            {"type": "actor", "name": "Helena Bonham Carter", "id": 1283},
+            {"type": "movie", "title": "The King's Speech", "id": 45269},
+            {"type": "actor", "name": "Colin Firth", "id": 1891},
+        ]
+
+        res = client.get(f"/game/{game_id}/hint")
+
+        assert res.status_code == 200
+        data = res.json()
+        assert data["movie"]["title"] == "Fight Club"
+        assert data["next_actor"] == {
+            "name": "Helena Bonham Carter",
+            "id": 1283,
+            "profile_url": None,
+        }
+        assert data["moves_remaining"] == 2
+        assert data["source"] == "shortest_path"
+        difficulty, actor, target = solver.shortest_path.call_args.args
+        assert difficulty == "medium"
+        assert actor["id"] == 287
+        assert target["id"] == 1891
+
+    def test_falls_back_to_known_solution(self, client, solver):
+        game_id = self._create_game(client)
+
+        res = client.get(f"/game/{game_id}/hint")
+
+        assert res.status_code == 200
+        data = res.json()
+        assert data["movie"]["title"] == "12 Years a Slave"
+        assert data["next_actor"]["name"] == "Michael Fassbender"
+        assert data["moves_remaining"] == 3
+        assert data["source"] == "known_solution"
+
+    def test_tmdb_error_falls_back_to_known_solution(self, client, solver):
+        game_id = self._create_game(client)
+        solver.shortest_path.side_effect = RuntimeError("TMDb down")
+
+        res = client.get(f"/game/{game_id}/hint")
+
+        assert res.status_code == 200
+        assert res.json()["source"] == "known_solution"
+
+    def test_no_hint_off_the_known_solution(self, client, solver):
+        game_id = self._create_game(client)
+        with patch(
+            "cinema_game_backend.routes.game.validate_move",
+            new_callable=AsyncMock,
+            return_value=ValidationResult(
+                valid=True,
+                explanation="ok",
+                movie_title="Fight Club",
+                to_actor_name="Edward Norton",
+                to_actor_id=819,
+            ),
+        ):
+            client.post(
+                f"/game/{game_id}/move",
+                json={"movie": "Fight Club", "next_actor": "Edward Norton"},
+            )
+
+        res = client.get(f"/game/{game_id}/hint")
+
+        assert res.status_code == 404
+
+    def test_hint_for_nonexistent_game(self, client, solver):
+        res = client.get("/game/does-not-exist/hint")
+        assert res.status_code == 404
+
+
+class TestGameCache:
+    @pytest.fixture
+    def cache(self):
+        cache = GameStateCache()
+        app.dependency_overrides[get_game_cache] = lambda: cache
+        yield cache
+        app.dependency_overrides.pop(get_game_cache, None)
+
+    def _create_game(self, client):
+        with patch(
+            "cinema_game_backend.routes.game.generate_puzzle",
+            new_callable=AsyncMock,
+            return_value=_mock_puzzle(),
+        ):
+            return client.post("/game/new?difficulty=medium").json()["game_id"]
+
+    def test_polls_are_served_from_memory(self, client, cache):
+        game_id = self._create_game(client)
+        client.get(f"/game/{game_id}")
+        with patch(
+            "cinema_game_backend.routes.game.load_game",
+            side_effect=AssertionError("database read"),
+        ):
+            res = client.get(f"/game/{game_id}")
+        assert res.status_code == 200
+        assert res.json()["current_actor"]["name"] == "Brad Pitt"
+
+    def test_write_by_another_worker_is_seen(self, client, cache):
+        game_id = self._create_game(client)
+        client.get(f"/game/{game_id}")
+        # Another worker sharing the database records a strike.
+        actor = {"name": "Brad Pitt", "id": 287}
+        update_game_state(game_id, actor, "in_progress", 1, expected_version=0)
+
+        res = client.get(f"/game/{game_id}")
+        assert res.json()["strikes"] == 1
+        assert cache.get(game_id)["version"] == 1
+
+    def test_moves_write_through(self, client, cache):
+        game_id = self._create_game(client)
+        client.get(f"/game/{game_id}")
+        with patch(
+            "cinema_game_backend.routes.game.validate_move",
+            new_callable=AsyncMock,
+            return_value=ValidationResult(
+                valid=True,
+                explanation="ok",
+                movie_id=76203,
+                movie_title="12 Years a Slave",
+                to_actor_name="Michael Fassbender",
+                to_actor_id=17288,
+            ),
+        ):
+            client.post(
+                f"/game/{game_id}/move",
+                json={"movie": "12 Years a Slave", "next_actor": "Fassbender"},
+            )
+
+        cached = cache.get(game_id)
+        assert cached["version"] == 1
+        assert cached["current_actor"]["name"] == "Michael Fassbender"
+        assert [m["movie_id"] for m in cached["moves"]] == [76203]
+        # The cached copy matches what a fresh read from the database returns.
+        cache.invalidate(game_id)
+        assert client.get(f"/game/{game_id}").json()["moves"][0]["movie_id"] == 76203
+
+    def test_failed_move_writes_through_strikes(self, client, cache):
+        game_id = self._create_game(client)
+        with patch(
+            "cinema_game_backend.routes.game.validate_move",
+            new_callable=AsyncMock,
+            return_value=ValidationResult(valid=False, explanation="no"),
+        ):
+            client.post(f"/game/{game_id}/move", json={"movie": "X", "next_actor": "Y"})
+        assert cache.get(game_id)["strikes"] == 1
+        assert client.get(f"/game/{game_id}").json()["strikes"] == 1
+
+
+class TestConcurrentWrites:
+    def _create_game(self, client):
+        with patch(
+            "cinema_game_backend.routes.game.generate_puzzle",
+            new_callable=AsyncMock,
+            return_value=_mock_puzzle(),
+        ):
+            return client.post("/game/new?difficulty=medium").json()["game_id"]
+
+    def test_move_conflicting_with_another_write_is_rejected(self, client):
+        from cinema_game_backend.database import append_move, load_game
+
+        game_id = self._create_game(client)
+
+        async def racing_validate(*args, **kwargs):
+            # Another request lands a move while this one is being validated.
+            append_move(
+                game_id,
+                {"from_actor": "Brad Pitt", "movie": "Fight Club", "to_actor": "Ed"},
+                {"name": "Ed", "id": 819},
+                "in_progress",
+                0,
+            )
+            return ValidationResult(
+                valid=True,
+                explanation="ok",
+                movie_title="12 Years a Slave",
+                to_actor_name="Michael Fassbender",
+                to_actor_id=17288,
+            )
+
+        with patch(
+            "cinema_game_backend.routes.game.validate_move",
+            side_effect=racing_validate,
+        ):
+            res = client.post(
+                f"/game/{game_id}/move",
+                json={"movie": "12 Years a Slave", "next_actor": "Fassbender"},
+            )
+
+        assert res.status_code == 409
+        game = load_game(game_id)
+        assert [m["movie"] for m in game["moves"]] == ["Fight Club"]
+        assert game["current_actor"]["name"] == "Ed"
+
+    def test_move_already_in_flight_is_rejected(self, client):
+        from cinema_game_backend.routes import game as game_routes
+
+        game_id = self._create_game(client)
+        with (
+            patch.object(game_routes, "_moves_in_flight", {game_id}),
+            patch(
+                "cinema_game_backend.routes.game.validate_move",
+                new_callable=AsyncMock,
+            ) as validate,
+        ):
+            res = client.post(
+                f"/game/{game_id}/move", json={"movie": "X", "next_actor": "Y"}
+            )
+        assert res.status_code == 409
+        validate.assert_not_awaited()
+
+    def test_in_flight_marker_is_cleared(self, client):
+        from cinema_game_backend.routes import game as game_routes
+
+        game_id = self._create_game(client)
+        with patch(
+            "cinema_game_backend.routes.game.validate_move",
+            new_callable=AsyncMock,
+            side_effect=RuntimeError("TMDb down"),
+        ):
+            with pytest.raises(RuntimeError):
+                client.post(
+                    f"/game/{game_id}/move", json={"movie": "X", "next_actor": "Y"}
+                )
+        assert game_id not in game_routes._moves_in_flight
+
+
+class TestIdempotentMoves:
+    def _create_game(self, client):
+        with patch(
+            "cinema_game_backend.routes.game.generate_puzzle",
+            new_callable=AsyncMock,
+            return_value=_mock_puzzle(),
+        ):
+            return client.post("/game/new?difficulty=medium").json()["game_id"]
+
+    def _move(self, client, game_id, key, movie="X", validation=None):
+        with patch(
+            "cinema_game_backend.routes.game.validate_move",
+            new_callable=AsyncMock,
+            return_value=validation
+            or ValidationResult(valid=False, explanation="Not in that movie."),
+        ) as validate:
+            res = client.post(
+                f"/game/{game_id}/move",
+                json={"movie": movie, "next_actor": "Y"},
+                headers={"Idempotency-Key": key},
+            )
+        return res, validate
+
+    def test_retry_replays_response_without_revalidating(self, client):
+        game_id = self._create_game(client)
+        first, _ = self._move(client, game_id, "k1")
+        retry, validate = self._move(client, game_id, "k1")
+
+        assert retry.status_code == 200
+        assert retry.json() == first.json()
+        validate.assert_not_awaited()
+        # The strike was applied once.
+        assert client.get(f"/game/{game_id}").json()["strikes"] == 1
+
+    def test_retry_of_winning_move_after_game_ended(self, client):
+        game_id = self._create_game(client)
+        win = ValidationResult(
+            valid=True,
+            explanation="ok",
+            movie_title="The King's Speech",
+            to_actor_name="Colin Firth",
+            to_actor_id=1891,
+        )
+        first, _ = self._move(client, game_id, "k1", validation=win)
+        assert first.json()["game_status"] == "won"
+
+        retry, _ = self._move(client, game_id, "k1", validation=win)
+        assert retry.status_code == 200
+        assert retry.json() == first.json()
+
+    def test_new_key_is_a_new_move(self, client):
+        game_id = self._create_game(client)
+        self._move(client, game_id, "k1")
+        res, validate = self._move(client, game_id, "k2")
+        assert res.json()["strikes"] == 2
+        validate.assert_awaited_once()
+
+    def test_key_reused_for_a_different_move(self, client):
+        game_id = self._create_game(client)
+        self._move(client, game_id, "k1", movie="X")
+        res, validate = self._move(client, game_id, "k1", movie="Z")
+        assert res.status_code == 422
+        validate.assert_not_awaited()
+
+    def test_key_too_long(self, client):
+        game_id = self._create_game(client)
+        res, _ = self._move(client, game_id, "k" * 256)
+        assert res.status_code == 400
+
+
 class TestHealthEndpoint:
     def test_health(self, client):
         res = client.get("/health")
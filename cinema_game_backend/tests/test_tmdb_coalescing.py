@@ -0,0 +1,197 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from cinema_game_backend.tmdb_coalescing import CoalescingTMDbClient
+from cinema_game_backend.tmdb_scheduler import (
+    ScheduledTMDbClient,
+    TMDbPriority,
+    tmdb_priority,
+)
+
+
+def _slow_client(delay=0.01):
+    client = MagicMock()
+    calls = []
+
+    async def get_movie_cast(movie_id):
+        calls.append(movie_id)
+        await asyncio.sleep(delay)
+        return [f"cast of {movie_id}"]
+
+    async def get_person_movies(person_id, limit=20):
+        calls.append((person_id, limit))
+        await asyncio.sleep(delay)
+        return [f"movies of {person_id}"]
+
+    client.get_movie_cast = get_movie_cast
+    client.get_person_movies = get_person_movies
+    return client, calls
+
+
+class TestCoalescingTMDbClient:
+    async def test_concurrent_identical_calls_share_one_request(self):
+        inner, calls = _slow_client()
+        client = CoalescingTMDbClient(inner)
+
+        results = await asyncio.gather(*(client.get_movie_cast(1422) for _ in range(5)))
+
+        assert results == [["cast of 1422"]] * 5
+        assert calls == [1422]
+        assert client.upstream_calls["get_movie_cast"] == 1
+        assert client.coalesced["get_movie_cast"] == 4
+        assert client.in_flight == 0
+
+    async def test_different_arguments_are_separate_requests(self):
+        inner, calls = _slow_client()
+        client = CoalescingTMDbClient(inner)
+
+        await asyncio.gather(
+            client.get_person_movies(287, limit=15),
+            client.get_person_movies(287, limit=20),
+            client.get_person_movies(17288, limit=15),
+        )
+
+        assert len(calls) == 3
+        assert client.coalesced["get_person_movies"] == 0
+
+    async def test_sequential_calls_are_not_coalesced(self):
+        inner, calls = _slow_client(delay=0)
+        client = CoalescingTMDbClient(inner)
+
+        await client.get_movie_cast(1422)
+        await client.get_movie_cast(1422)
+
+        assert calls == [1422, 1422]
+
+    async def test_errors_reach_every_waiter(self):
+        inner = MagicMock()
+
+        async def get_movie_cast(movie_id):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        inner.get_movie_cast = get_movie_cast
+        client = CoalescingTMDbClient(inner)
+
+        results = await asyncio.gather(
+            client.get_movie_cast(1), client.get_movie_cast(1), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert client.in_flight == 0
+
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        inner, calls = _slow_client(delay=0.05)
+        client = CoalescingTMDbClient(inner)
+
+        first = asyncio.ensure_future(client.get_movie_cast(1422))
+        second = asyncio.ensure_future(client.get_movie_cast(1422))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == ["cast of 1422"]
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert calls == [1422]
+
+    async def test_upstream_call_cancelled_when_every_waiter_is(self):
+        started = asyncio.Event()
+        cancelled = False
+        inner = MagicMock()
+
+        async def get_movie_cast(movie_id):
+            nonlocal cancelled
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+
+        inner.get_movie_cast = get_movie_cast
+        client = CoalescingTMDbClient(inner)
+
+        waiters = [asyncio.ensure_future(client.get_movie_cast(1)) for _ in range(2)]
+        await started.wait()
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert cancelled
+        assert client.in_flight == 0
+
+    def test_other_attributes_pass_through(self):
+        inner = MagicMock()
+        inner.config = "config"
+        assert CoalescingTMDbClient(inner).config == "config"
+
+
+class TestCoalescingPriority:
+    async def test_less_urgent_call_joins_more_urgent_one(self):
+        inner, calls = _slow_client()
+        client = CoalescingTMDbClient(inner)
+
+        interactive = asyncio.ensure_future(client.get_movie_cast(1422))
+        await asyncio.sleep(0)
+        with tmdb_priority(TMDbPriority.BACKGROUND):
+            background = asyncio.ensure_future(client.get_movie_cast(1422))
+        await asyncio.gather(interactive, background)
+
+        assert calls == [1422]
+
+    async def test_more_urgent_call_does_not_join_background_one(self):
+        inner, calls = _slow_client()
+        client = CoalescingTMDbClient(inner)
+
+        with tmdb_priority(TMDbPriority.BACKGROUND):
+            background = asyncio.ensure_future(client.get_movie_cast(1422))
+        await asyncio.sleep(0)
+        interactive = [
+            asyncio.ensure_future(client.get_movie_cast(1422)) for _ in range(2)
+        ]
+        await asyncio.gather(background, *interactive)
+
+        # One background request, and one interactive request shared by both
+        # interactive callers.
+        assert calls == [1422, 1422]
+        assert client.coalesced["get_movie_cast"] == 1
+        assert client.in_flight == 0
+
+    async def test_interactive_call_is_not_queued_behind_background_work(self):
+        order = []
+        release = asyncio.Event()
+        inner = MagicMock()
+
+        async def get_movie_cast(movie_id):
+            order.append(movie_id)
+            if movie_id == "busy":
+                await release.wait()
+            return [movie_id]
+
+        inner.get_movie_cast = get_movie_cast
+        scheduled = ScheduledTMDbClient(
+            inner,
+            rate_per_second=1000.0,
+            burst=1000,
+            max_concurrency=1,
+            max_retries=0,
+            backoff_seconds=0.001,
+        )
+        client = CoalescingTMDbClient(scheduled)
+
+        busy = asyncio.ensure_future(client.get_movie_cast("busy"))
+        await asyncio.sleep(0)
+        with tmdb_priority(TMDbPriority.BACKGROUND):
+            other = asyncio.ensure_future(client.get_movie_cast("other"))
+            shared = asyncio.ensure_future(client.get_movie_cast(1422))
+        await asyncio.sleep(0)
+        interactive = asyncio.ensure_future(client.get_movie_cast(1422))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(busy, other, shared, interactive)
+
+        assert order[:2] == ["busy", 1422]
+        assert scheduled.requests["interactive"] == 2
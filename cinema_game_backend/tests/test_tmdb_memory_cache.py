@@ -0,0 +1,118 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from cinema_game_backend.tmdb_memory_cache import MemoryCachedTMDbClient
+
+_TTLS = {"get_movie_cast": 60, "search_movies": 10}
+
+
+def _client(**kwargs):
+    inner = MagicMock()
+    inner.get_movie_cast = AsyncMock(side_effect=lambda movie_id: [f"cast {movie_id}"])
+    inner.search_movies = AsyncMock(side_effect=lambda title: [title])
+    inner.get_popular_people = AsyncMock(return_value=["someone"])
+    options = {"ttl_seconds": _TTLS, "max_entries": 100, "max_bytes": 1_000_000}
+    options.update(kwargs)
+    return inner, MemoryCachedTMDbClient(inner, **options)
+
+
+class TestMemoryCachedTMDbClient:
+    async def test_hit_skips_inner_client(self):
+        inner, client = _client()
+
+        assert await client.get_movie_cast(1422) == ["cast 1422"]
+        assert await client.get_movie_cast(1422) == ["cast 1422"]
+
+        assert inner.get_movie_cast.await_count == 1
+        assert client.hits["get_movie_cast"] == 1
+        assert client.misses["get_movie_cast"] == 1
+
+    async def test_uncached_methods_pass_through(self):
+        inner, client = _client()
+
+        await client.get_popular_people(page=1)
+        await client.get_popular_people(page=1)
+
+        assert inner.get_popular_people.await_count == 2
+        assert len(client) == 0
+
+    async def test_per_method_ttl(self):
+        inner, client = _client()
+        with patch("time.monotonic", return_value=1000.0):
+            await client.search_movies("Heat")
+            await client.get_movie_cast(1422)
+        with patch("time.monotonic", return_value=1030.0):
+            await client.search_movies("Heat")
+            await client.get_movie_cast(1422)
+
+        assert inner.search_movies.await_count == 2
+        assert inner.get_movie_cast.await_count == 1
+
+    async def test_evicts_least_recently_used_by_count(self):
+        inner, client = _client(max_entries=2)
+
+        await client.get_movie_cast(1)
+        await client.get_movie_cast(2)
+        await client.get_movie_cast(1)
+        await client.get_movie_cast(3)
+
+        assert len(client) == 2
+        assert client.evictions == 1
+        await client.get_movie_cast(1)
+        assert inner.get_movie_cast.await_count == 3
+        await client.get_movie_cast(2)
+        assert inner.get_movie_cast.await_count == 4
+
+    async def test_evicts_by_bytes(self):
+        inner, client = _client()
+        await client.get_movie_cast(1)
+        one_entry = client.bytes
+        client.max_bytes = one_entry * 2 + 1
+
+        await client.get_movie_cast(2)
+        await client.get_movie_cast(3)
+
+        assert len(client) == 2
+        assert client.bytes <= client.max_bytes
+        assert client.evictions == 1
+
+    async def test_oversized_results_are_not_cached(self):
+        inner, client = _client(max_bytes=1)
+
+        await client.get_movie_cast(1)
+
+        assert len(client) == 0
+        assert client.bytes == 0
+
+    async def test_sizes_each_method_from_one_sample(self):
+        inner, client = _client()
+        with patch(
+            "cinema_game_backend.tmdb_memory_cache._pickled_size", return_value=100
+        ) as pickled_size:
+            await client.get_movie_cast(1)
+            await client.get_movie_cast(2)
+            await client.search_movies("Heat")
+
+        assert pickled_size.call_count == 2
+        assert client.bytes > 0
+
+    async def test_no_byte_cap_skips_sizing(self):
+        inner, client = _client(max_bytes=None)
+        with patch(
+            "cinema_game_backend.tmdb_memory_cache._pickled_size"
+        ) as pickled_size:
+            await client.get_movie_cast(1)
+
+        pickled_size.assert_not_called()
+        assert len(client) == 1
+        assert client.bytes == 0
+
+    async def test_errors_are_not_cached(self):
+        inner, client = _client()
+        inner.get_movie_cast.side_effect = [RuntimeError("down"), ["cast"]]
+
+        with pytest.raises(RuntimeError):
+            await client.get_movie_cast(1)
+
+        assert await client.get_movie_cast(1) == ["cast"]
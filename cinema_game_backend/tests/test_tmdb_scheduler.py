@@ -0,0 +1,200 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from cinema_game_backend.tmdb_scheduler import (
+    ScheduledTMDbClient,
+    TMDbPriority,
+    tmdb_priority,
+)
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = MagicMock(status_code=status_code, headers=headers or {})
+
+
+def _scheduled(inner, **kwargs):
+    options = {
+        "rate_per_second": 1000.0,
+        "burst": 1000,
+        "max_concurrency": 10,
+        "max_retries": 3,
+        "backoff_seconds": 0.001,
+    }
+    options.update(kwargs)
+    return ScheduledTMDbClient(inner, **options)
+
+
+class TestScheduledTMDbClient:
+    async def test_passes_calls_through(self):
+        inner = MagicMock()
+
+        async def get_movie_cast(movie_id):
+            return [movie_id]
+
+        inner.get_movie_cast = get_movie_cast
+        inner.config = "config"
+        client = _scheduled(inner)
+
+        assert await client.get_movie_cast(1422) == [1422]
+        assert client.config == "config"
+        assert client.requests["interactive"] == 1
+        assert client.active == 0
+
+    async def test_concurrency_cap(self):
+        running = 0
+        peak = 0
+        inner = MagicMock()
+
+        async def get_movie_cast(movie_id):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return []
+
+        inner.get_movie_cast = get_movie_cast
+        client = _scheduled(inner, max_concurrency=2)
+
+        await asyncio.gather(*(client.get_movie_cast(i) for i in range(6)))
+
+        assert peak == 2
+        assert client.active == 0
+
+    async def test_waiting_calls_are_admitted_by_priority(self):
+        order = []
+        release = asyncio.Event()
+        inner = MagicMock()
+
+        async def get_movie_cast(movie_id):
+            order.append(movie_id)
+            if movie_id == "first":
+                await release.wait()
+            return []
+
+        inner.get_movie_cast = get_movie_cast
+        client = _scheduled(inner, max_concurrency=1)
+
+        first = asyncio.ensure_future(client.get_movie_cast("first"))
+        await asyncio.sleep(0)
+        with tmdb_priority(TMDbPriority.BACKGROUND):
+            background = asyncio.ensure_future(client.get_movie_cast("background"))
+        with tmdb_priority(TMDbPriority.CREATION):
+            creation = asyncio.ensure_future(client.get_movie_cast("creation"))
+        interactive = asyncio.ensure_future(client.get_movie_cast("interactive"))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(first, background, creation, interactive)
+
+        assert order == ["first", "interactive", "creation", "background"]
+        assert client.queued == {"background": 1, "creation": 1, "interactive": 1}
+
+    async def test_token_bucket_limits_rate(self):
+        inner = MagicMock()
+
+        async def get_movie_cast(movie_id):
+            return []
+
+        inner.get_movie_cast = get_movie_cast
+        client = _scheduled(inner, rate_per_second=100.0, burst=2)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await asyncio.gather(*(client.get_movie_cast(i) for i in range(6)))
+
+        # Two calls ride the burst; the other four wait ~10ms each for tokens.
+        assert loop.time() - started >= 0.035
+
+    async def test_retries_429_and_5xx(self):
+        inner = MagicMock()
+        failures = [_HTTPError(429), _HTTPError(503)]
+
+        async def get_movie_cast(movie_id):
+            if failures:
+                raise failures.pop(0)
+            return ["cast"]
+
+        inner.get_movie_cast = get_movie_cast
+        client = _scheduled(inner)
+
+        assert await client.get_movie_cast(1) == ["cast"]
+        assert client.retries == 2
+        assert client.active == 0
+
+    async def test_honours_retry_after(self):
+        inner = MagicMock()
+        failures = [_HTTPError(429, {"Retry-After": "2"})]
+
+        async def get_movie_cast(movie_id):
+            if failures:
+                raise failures.pop(0)
+            return []
+
+        inner.get_movie_cast = get_movie_cast
+        client = _scheduled(inner)
+        with patch(
+            "cinema_game_backend.tmdb_scheduler.asyncio.sleep", new_callable=AsyncMock
+        ) as sleep:
+            await client.get_movie_cast(1)
+
+        sleep.assert_awaited_once_with(2.0)
+
+    async def test_does_not_retry_other_errors(self):
+        inner = MagicMock()
+        calls = 0
+
+        async def get_movie_cast(movie_id):
+            nonlocal calls
+            calls += 1
+            raise _HTTPError(404)
+
+        inner.get_movie_cast = get_movie_cast
+        client = _scheduled(inner)
+
+        with pytest.raises(_HTTPError):
+            await client.get_movie_cast(1)
+        assert calls == 1
+
+    async def test_gives_up_after_max_retries(self):
+        inner = MagicMock()
+        calls = 0
+
+        async def get_movie_cast(movie_id):
+            nonlocal calls
+            calls += 1
+            raise _HTTPError(500)
+
+        inner.get_movie_cast = get_movie_cast
+        client = _scheduled(inner, max_retries=2)
+
+        with pytest.raises(_HTTPError):
+            await client.get_movie_cast(1)
+        assert calls == 3
+        assert client.active == 0
+
+    async def test_cancelled_waiter_frees_its_place(self):
+        release = asyncio.Event()
+        inner = MagicMock()
+
+        async def get_movie_cast(movie_id):
+            await release.wait()
+            return [movie_id]
+
+        inner.get_movie_cast = get_movie_cast
+        client = _scheduled(inner, max_concurrency=1)
+
+        first = asyncio.ensure_future(client.get_movie_cast(1))
+        waiter = asyncio.ensure_future(client.get_movie_cast(2))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        release.set()
+
+        assert await first == [1]
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert await client.get_movie_cast(3) == [3]
+        assert client.active == 0
@@ -0,0 +1,74 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from art_graph.cinema_data_providers.tmdb_models import Movie, Person
+
+from cinema_game_backend.popularity_cache import PopularityCache
+from cinema_game_backend.tmdb_warmup import warm_tmdb_cache
+
+
+def _tmdb():
+    pages = {
+        1: [Person(name="A", id=1, popularity=10.0)],
+        2: [
+            Person(name="A", id=1, popularity=10.0),
+            Person(name="B", id=2, popularity=5.0),
+        ],
+    }
+    tmdb = MagicMock()
+    tmdb.get_popular_people = AsyncMock(side_effect=lambda page: pages[page])
+    tmdb.get_person_movies = AsyncMock(
+        side_effect=lambda pid, limit: (
+            [Movie(title=f"M{pid}-{i}", id=pid * 10 + i) for i in range(3)]
+            + [Movie(title="Shared", id=99)]
+        )
+    )
+    tmdb.get_movie_cast = AsyncMock(return_value=[])
+    return tmdb
+
+
+class TestWarmTmdbCache:
+    async def test_fetches_people_filmographies_and_casts(self):
+        tmdb = _tmdb()
+
+        stats = await warm_tmdb_cache(tmdb, pages=2, movies_per_person=2)
+
+        assert stats.people == 2
+        assert stats.filmographies == 2
+        assert stats.casts == 4
+        assert stats.failed == 0
+        fetched = sorted(c.args[0] for c in tmdb.get_movie_cast.await_args_list)
+        assert fetched == [10, 11, 20, 21]
+
+    async def test_uses_the_puzzle_walk_arguments(self):
+        tmdb = _tmdb()
+
+        await warm_tmdb_cache(tmdb, pages=1, movies_per_person=1)
+
+        tmdb.get_popular_people.assert_awaited_once_with(page=1)
+        tmdb.get_person_movies.assert_awaited_once_with(1, limit=20)
+
+    async def test_casts_are_fetched_once_per_movie(self):
+        tmdb = _tmdb()
+
+        await warm_tmdb_cache(tmdb, pages=2, movies_per_person=4)
+
+        fetched = [c.args[0] for c in tmdb.get_movie_cast.await_args_list]
+        assert fetched.count(99) == 1
+
+    async def test_failures_are_counted_not_raised(self):
+        tmdb = _tmdb()
+        tmdb.get_person_movies.side_effect = RuntimeError("TMDb down")
+
+        stats = await warm_tmdb_cache(tmdb, pages=2)
+
+        assert stats.people == 2
+        assert stats.filmographies == 0
+        assert stats.failed == 2
+        tmdb.get_movie_cast.assert_not_awaited()
+
+    async def test_records_popularity(self):
+        cache = PopularityCache()
+
+        await warm_tmdb_cache(_tmdb(), pages=2, popularity_cache=cache)
+
+        assert cache.get(2) == 5.0
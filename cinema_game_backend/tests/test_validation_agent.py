@@ -1,10 +1,14 @@
 """Tests for validate_move using a mocked TMDbClient."""
 
+import asyncio
+import time
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from art_graph.cinema_data_providers.tmdb_models import Movie, CastMember
 from cinema_game_backend.agents.validation_agent import validate_move
+from cinema_game_backend.name_match_cache import NameMatchCache
+from cinema_game_backend.tmdb_memory_cache import MemoryCachedTMDbClient
 
 
 def make_movie(
@@ -219,6 +223,255 @@ class TestLLMFallback:
         assert result.valid is True
         mock_llm.invoke_json.assert_not_called()
 
+    async def test_cached_match_skips_llm(self, apocalypse_now_tmdb, mock_llm):
+        name_cache = NameMatchCache(persistent=False)
+        for _ in range(2):
+            result = await validate_move(
+                apocalypse_now_tmdb,
+                "Marlon Brando",
+                "Apocalypse Now",
+                "Larry Fishburne",
+                from_actor_id=1,
+                llm=mock_llm,
+                name_cache=name_cache,
+            )
+            assert result.valid is True
+            assert result.to_actor_name == "Laurence Fishburne"
+        mock_llm.invoke_json.assert_called_once()
+
+    async def test_cached_no_match_skips_llm(self, apocalypse_now_tmdb):
+        llm = MagicMock()
+        llm.invoke_json.return_value = {"matched_name": None}
+        name_cache = NameMatchCache(persistent=False)
+        for _ in range(2):
+            result = await validate_move(
+                apocalypse_now_tmdb,
+                "Marlon Brando",
+                "Apocalypse Now",
+                "Larry Fishburne",
+                from_actor_id=1,
+                llm=llm,
+                name_cache=name_cache,
+            )
+            assert result.valid is False
+        llm.invoke_json.assert_called_once()
+
+    async def test_llm_failure_not_cached(self, apocalypse_now_tmdb, mock_llm):
+        name_cache = NameMatchCache(persistent=False)
+        failing = MagicMock()
+        failing.invoke_json.side_effect = RuntimeError("API timeout")
+        await validate_move(
+            apocalypse_now_tmdb,
+            "Marlon Brando",
+            "Apocalypse Now",
+            "Larry Fishburne",
+            from_actor_id=1,
+            llm=failing,
+            name_cache=name_cache,
+        )
+        result = await validate_move(
+            apocalypse_now_tmdb,
+            "Marlon Brando",
+            "Apocalypse Now",
+            "Larry Fishburne",
+            from_actor_id=1,
+            llm=mock_llm,
+            name_cache=name_cache,
+        )
+        assert result.valid is True
+        mock_llm.invoke_json.assert_called_once()
+
+
+class TestBatchedLLMFallback:
+    """When both actors miss fuzzy matching, one LLM call resolves both."""
+
+    @pytest.fixture
+    def apocalypse_now_tmdb(self):
+        tmdb = AsyncMock()
+        tmdb.search_movies.return_value = [
+            make_movie(title="Apocalypse Now", movie_id=28, release_date="1979-08-15")
+        ]
+        tmdb.get_movie_cast.return_value = make_cast(
+            "Marlon Brando", "Robert Duvall", "Laurence Fishburne"
+        )
+        return tmdb
+
+    async def test_both_names_resolved_in_one_call(self, apocalypse_now_tmdb):
+        llm = MagicMock()
+        llm.invoke_json.return_value = {
+            "matches": {"1": "Robert Duvall", "2": "Laurence Fishburne"}
+        }
+        result = await validate_move(
+            apocalypse_now_tmdb,
+            "Bobby Duvall",
+            "Apocalypse Now",
+            "Larry Fishburne",
+            from_actor_id=2,
+            llm=llm,
+        )
+        assert result.valid is True
+        assert result.from_actor_name == "Robert Duvall"
+        assert result.to_actor_name == "Laurence Fishburne"
+        llm.invoke_json.assert_called_once()
+        prompt = llm.invoke_json.call_args.args[0]
+        assert '1. "Bobby Duvall"' in prompt
+        assert '2. "Larry Fishburne"' in prompt
+
+    async def test_names_outside_cast_rejected(self, apocalypse_now_tmdb):
+        llm = MagicMock()
+        llm.invoke_json.return_value = {
+            "matches": {"1": "Robert Duvall", "2": "Lawrence Fishbourne"}
+        }
+        result = await validate_move(
+            apocalypse_now_tmdb,
+            "Bobby Duvall",
+            "Apocalypse Now",
+            "Larry Fishburne",
+            from_actor_id=2,
+            llm=llm,
+        )
+        assert result.valid is False
+        assert result.from_actor_found is True
+        assert result.to_actor_found is False
+
+    async def test_malformed_batch_answer_resolves_nothing(self, apocalypse_now_tmdb):
+        llm = MagicMock()
+        llm.invoke_json.return_value = {"matches": ["Robert Duvall"]}
+        result = await validate_move(
+            apocalypse_now_tmdb,
+            "Bobby Duvall",
+            "Apocalypse Now",
+            "Larry Fishburne",
+            from_actor_id=2,
+            llm=llm,
+        )
+        assert result.from_actor_found is False
+        assert result.to_actor_found is False
+
+    async def test_cached_name_left_out_of_prompt(self, apocalypse_now_tmdb):
+        name_cache = NameMatchCache(persistent=False)
+        name_cache.store(
+            "Bobby Duvall",
+            ["Marlon Brando", "Robert Duvall", "Laurence Fishburne"],
+            "Robert Duvall",
+        )
+        llm = MagicMock()
+        llm.invoke_json.return_value = {"matched_name": "Laurence Fishburne"}
+        result = await validate_move(
+            apocalypse_now_tmdb,
+            "Bobby Duvall",
+            "Apocalypse Now",
+            "Larry Fishburne",
+            from_actor_id=2,
+            llm=llm,
+            name_cache=name_cache,
+        )
+        assert result.valid is True
+        prompt = llm.invoke_json.call_args.args[0]
+        assert "Bobby Duvall" not in prompt
+        assert 'Player typed: "Larry Fishburne"' in prompt
+
+
+class TestAsyncLLM:
+    """The LLM fallback must not block the event loop and has a hard deadline."""
+
+    @pytest.fixture
+    def apocalypse_now_tmdb(self):
+        tmdb = AsyncMock()
+        tmdb.search_movies.return_value = [
+            make_movie(title="Apocalypse Now", movie_id=28, release_date="1979-08-15")
+        ]
+        tmdb.get_movie_cast.return_value = make_cast(
+            "Marlon Brando", "Martin Sheen", "Laurence Fishburne"
+        )
+        return tmdb
+
+    @staticmethod
+    def slow_llm(seconds):
+        def invoke_json(prompt):
+            time.sleep(seconds)
+            return {"matched_name": "Laurence Fishburne"}
+
+        llm = MagicMock()
+        llm.invoke_json.side_effect = invoke_json
+        return llm
+
+    async def test_event_loop_keeps_running_during_llm_call(self, apocalypse_now_tmdb):
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        try:
+            result = await validate_move(
+                apocalypse_now_tmdb,
+                "Marlon Brando",
+                "Apocalypse Now",
+                "Larry Fishburne",
+                from_actor_id=1,
+                llm=self.slow_llm(0.2),
+            )
+        finally:
+            task.cancel()
+        assert result.valid is True
+        assert ticks >= 5
+
+    async def test_slow_llm_is_abandoned_at_deadline(self, apocalypse_now_tmdb):
+        with patch(
+            "cinema_game_backend.agents.validation_agent.LLM_TIMEOUT_SECONDS", 0.05
+        ):
+            start = time.monotonic()
+            result = await validate_move(
+                apocalypse_now_tmdb,
+                "Marlon Brando",
+                "Apocalypse Now",
+                "Larry Fishburne",
+                from_actor_id=1,
+                llm=self.slow_llm(0.5),
+            )
+            elapsed = time.monotonic() - start
+        assert result.valid is False
+        assert result.to_actor_found is False
+        assert elapsed < 0.4
+
+    async def test_timed_out_answer_is_not_cached(self, apocalypse_now_tmdb):
+        name_cache = NameMatchCache(persistent=False)
+        with patch(
+            "cinema_game_backend.agents.validation_agent.LLM_TIMEOUT_SECONDS", 0.05
+        ):
+            await validate_move(
+                apocalypse_now_tmdb,
+                "Marlon Brando",
+                "Apocalypse Now",
+                "Larry Fishburne",
+                from_actor_id=1,
+                llm=self.slow_llm(0.5),
+                name_cache=name_cache,
+            )
+        cast = ["Marlon Brando", "Martin Sheen", "Laurence Fishburne"]
+        assert name_cache.lookup("Larry Fishburne", cast) is None
+
+    async def test_native_async_client_is_awaited(self, apocalypse_now_tmdb):
+        llm = MagicMock()
+        llm.ainvoke_json = AsyncMock(
+            return_value={"matched_name": "Laurence Fishburne"}
+        )
+        result = await validate_move(
+            apocalypse_now_tmdb,
+            "Marlon Brando",
+            "Apocalypse Now",
+            "Larry Fishburne",
+            from_actor_id=1,
+            llm=llm,
+        )
+        assert result.valid is True
+        llm.ainvoke_json.assert_awaited_once()
+        llm.invoke_json.assert_not_called()
+
 
 class TestMovieMetadata:
     async def test_result_includes_movie_metadata(self, mock_tmdb):
@@ -328,6 +581,119 @@ class TestAmbiguousTitle:
         assert tmdb.get_movie_cast.call_count == 2
 
 
+class TestConcurrentCandidateFetch:
+    """The concurrent walk must pick the same winner as the serial walk."""
+
+    @staticmethod
+    def _tmdb(movie_ids, get_movie_cast):
+        tmdb = AsyncMock()
+        tmdb.search_movies.return_value = [
+            make_movie(title="Dune", movie_id=mid, release_date=f"{1980 + mid}-01-01")
+            for mid in movie_ids
+        ]
+        tmdb.get_movie_cast.side_effect = get_movie_cast
+        return tmdb
+
+    async def test_matches_serial_result(self):
+        casts = {
+            1: make_cast("Nobody Relevant"),
+            2: make_cast("Kyle MacLachlan", "Sean Young"),
+        }
+
+        async def get_movie_cast(movie_id):
+            return casts[movie_id]
+
+        tmdb = self._tmdb([1, 2], get_movie_cast)
+        result = await validate_move(
+            tmdb,
+            "Kyle MacLachlan",
+            "Dune",
+            "Sean Young",
+            from_actor_id=1,
+            concurrent_candidates=True,
+        )
+        assert result.valid is True
+        assert result.movie_id == 2
+
+    async def test_first_match_in_rank_order_wins(self):
+        async def get_movie_cast(movie_id):
+            if movie_id == 2:
+                # Ranked ahead of 3 but slower to arrive.
+                await asyncio.sleep(0.05)
+            if movie_id == 1:
+                return make_cast("Nobody Relevant")
+            return make_cast("Kyle MacLachlan", "Sean Young")
+
+        tmdb = self._tmdb([1, 2, 3], get_movie_cast)
+        result = await validate_move(
+            tmdb,
+            "Kyle MacLachlan",
+            "Dune",
+            "Sean Young",
+            from_actor_id=1,
+            concurrent_candidates=True,
+        )
+        assert result.movie_id == 2
+
+    async def test_outstanding_fetches_cancelled_after_match(self):
+        cancelled = asyncio.Event()
+
+        async def get_movie_cast(movie_id):
+            if movie_id == 3:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+            if movie_id == 1:
+                return make_cast("Nobody Relevant")
+            return make_cast("Kyle MacLachlan", "Sean Young")
+
+        tmdb = self._tmdb([1, 2, 3], get_movie_cast)
+        result = await asyncio.wait_for(
+            validate_move(
+                tmdb,
+                "Kyle MacLachlan",
+                "Dune",
+                "Sean Young",
+                from_actor_id=1,
+                concurrent_candidates=True,
+            ),
+            timeout=1,
+        )
+        assert result.movie_id == 2
+        assert cancelled.is_set()
+
+    async def test_in_flight_fetches_are_bounded(self, monkeypatch):
+        monkeypatch.setattr(
+            "cinema_game_backend.agents.validation_agent.CANDIDATE_CAST_CONCURRENCY",
+            2,
+        )
+        in_flight = 0
+        peak = 0
+
+        async def get_movie_cast(movie_id):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return make_cast("Nobody Relevant")
+
+        tmdb = self._tmdb(range(1, 7), get_movie_cast)
+        result = await validate_move(
+            tmdb,
+            "Kyle MacLachlan",
+            "Dune",
+            "Sean Young",
+            from_actor_id=1,
+            concurrent_candidates=True,
+        )
+        assert result.valid is False
+        assert result.movie_id == 1
+        assert peak == 2
+
+
 class TestActorIdentityAnchor:
     """Regression tests for the bug where the chain is anchored by actor
     name rather than TMDb id, so a cast member who merely shares a name
@@ -362,3 +728,100 @@ class TestActorIdentityAnchor:
 
         assert result.valid is True
         assert result.to_actor_id == 2
+
+
+class TestFilmographyFirst:
+    @pytest.fixture
+    def tmdb(self, thor_cast):
+        tmdb = AsyncMock()
+        tmdb.get_person_movies.return_value = [
+            make_movie(title="Thor", movie_id=10195),
+            make_movie(title="Rush", movie_id=96721),
+        ]
+        tmdb.get_movie_cast.return_value = thor_cast
+        tmdb.search_movies.return_value = [make_movie()]
+        return tmdb
+
+    async def test_filmography_match_skips_search(self, tmdb):
+        result = await validate_move(
+            tmdb, "Chris Hemsworth", "thor", "Natalie Portman", from_actor_id=1
+        )
+
+        assert result.valid is True
+        assert result.movie_id == 10195
+        tmdb.search_movies.assert_not_awaited()
+        tmdb.get_movie_cast.assert_awaited_once_with(10195)
+
+    async def test_failed_filmography_match_falls_back_to_search(self, tmdb):
+        tmdb.search_movies.return_value = [
+            make_movie(title="Thor", movie_id=10195),
+            make_movie(title="Thor", movie_id=999),
+        ]
+
+        result = await validate_move(
+            tmdb, "Chris Hemsworth", "Thor", "Leonardo DiCaprio", from_actor_id=1
+        )
+
+        assert result.valid is False
+        assert result.movie_id == 10195
+        # The filmography film isn't checked a second time.
+        checked = [c.args[0] for c in tmdb.get_movie_cast.await_args_list]
+        assert checked == [10195, 999]
+
+    async def test_search_candidates_in_filmography_go_first(self, tmdb):
+        tmdb.get_person_movies.return_value = [
+            make_movie(title="Batman Returns", movie_id=364)
+        ]
+        tmdb.search_movies.return_value = [
+            make_movie(title="Batman", movie_id=268),
+            make_movie(title="Batman Returns", movie_id=364),
+        ]
+
+        result = await validate_move(
+            tmdb, "Chris Hemsworth", "Batman", "Natalie Portman", from_actor_id=1
+        )
+
+        assert result.movie_id == 364
+        tmdb.get_movie_cast.assert_awaited_once_with(364)
+
+    async def test_filmography_lookup_failure_falls_back_to_search(self, tmdb):
+        tmdb.get_person_movies.side_effect = RuntimeError("TMDb down")
+
+        result = await validate_move(
+            tmdb, "Chris Hemsworth", "Thor", "Natalie Portman", from_actor_id=1
+        )
+
+        assert result.valid is True
+        tmdb.search_movies.assert_awaited_once()
+
+    async def test_disabled(self, tmdb):
+        with patch(
+            "cinema_game_backend.agents.validation_agent.FILMOGRAPHY_MATCH_MOVIES", 0
+        ):
+            await validate_move(
+                tmdb, "Chris Hemsworth", "Thor", "Natalie Portman", from_actor_id=1
+            )
+
+        tmdb.get_person_movies.assert_not_awaited()
+        tmdb.search_movies.assert_awaited_once()
+
+    async def test_cached_search_result_not_reordered(self, tmdb):
+        tmdb.get_person_movies.return_value = [
+            make_movie(title="Batman Returns", movie_id=364)
+        ]
+        tmdb.search_movies.return_value = [
+            make_movie(title="Batman", movie_id=268),
+            make_movie(title="Batman Returns", movie_id=364),
+        ]
+        cached = MemoryCachedTMDbClient(
+            tmdb,
+            ttl_seconds={"search_movies": 60},
+            max_entries=10,
+            max_bytes=1 << 20,
+        )
+
+        await validate_move(
+            cached, "Chris Hemsworth", "Batman", "Natalie Portman", from_actor_id=1
+        )
+
+        assert [m.id for m in await cached.search_movies("Batman")] == [268, 364]
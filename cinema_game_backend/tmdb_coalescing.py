@@ -0,0 +1,102 @@
+"""Single-flight request coalescing for the TMDb client.
+
+When several callers ask for the same TMDb lookup at once (players starting
+the same pooled puzzle, concurrent puzzle walks through a popular actor),
+only the first call goes upstream; the rest await its result. Neither
+TMDbClient nor CachedTMDbClient does this on its own, so on a cold cache
+each caller would otherwise issue its own identical request.
+
+Callers that join an in-flight call receive the same result object, so
+results must be treated as read-only (they already are throughout the app).
+
+A shared call is cancelled once every caller waiting on it has been, so
+callers that abandon lookups (a candidate walk that found its movie, losing
+puzzle walks) don't leave them running upstream.
+
+A call only joins one made at the same or a more urgent tmdb_priority. An
+interactive lookup never waits in the queue behind a background request for
+the same data; it sends its own, which later callers then join.
+"""
+
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+
+from art_graph.cinema_data_providers.tmdb.client import TMDbClient
+
+from .tmdb_scheduler import TMDbPriority, current_tmdb_priority
+
+# TMDbClient methods whose calls are coalesced; anything else passes through.
+COALESCED_METHODS = (
+    "search_person",
+    "search_movies",
+    "get_movie_cast",
+    "get_person_movies",
+    "get_person_details",
+    "get_popular_people",
+)
+
+
+@dataclass
+class _Flight:
+    """One upstream call and the callers waiting on it."""
+
+    task: asyncio.Task
+    priority: TMDbPriority
+    waiters: int = 0
+
+
+class CoalescingTMDbClient:
+    def __init__(self, client: TMDbClient):
+        self._client = client
+        # (method, args, kwargs) -> the call new callers for it join
+        self._in_flight: dict[tuple, _Flight] = {}
+        # Per method: calls sent upstream, and calls that joined one instead.
+        self.upstream_calls: Counter[str] = Counter()
+        self.coalesced: Counter[str] = Counter()
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name not in COALESCED_METHODS:
+            return attr
+
+        async def call(*args, **kwargs):
+            return await self._call(name, attr, args, kwargs)
+
+        return call
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    async def _call(self, name: str, method, args: tuple, kwargs: dict):
+        key = (name, args, tuple(sorted(kwargs.items())))
+        priority = current_tmdb_priority()
+        flight = self._in_flight.get(key)
+        if flight is None or flight.priority > priority:
+            self.upstream_calls[name] += 1
+            flight = _Flight(asyncio.ensure_future(method(*args, **kwargs)), priority)
+            self._in_flight[key] = flight
+            flight.task.add_done_callback(lambda _: self._finished(key, flight))
+        else:
+            self.coalesced[name] += 1
+        flight.waiters += 1
+        try:
+            # Shielded so one caller giving up doesn't cancel the call for the
+            # others still waiting on it.
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1:
+                flight.task.cancel()
+                self._finished(key, flight)
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _finished(self, key: tuple, flight: _Flight):
+        if not flight.task.cancelled() and flight.task.done():
+            # Mark a failure nobody is left to await as retrieved.
+            flight.task.exception()
+        # A more urgent call for the same key may have taken its place.
+        if self._in_flight.get(key) is flight:
+            del self._in_flight[key]
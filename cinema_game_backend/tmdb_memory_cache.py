@@ -0,0 +1,121 @@
+"""In-process LRU tier in front of the persistent TMDb cache.
+
+A CachedTMDbClient hit still costs a SQL query and deserializing the rows,
+and the hottest lookups (the casts of well-known films, the filmographies of
+popular start actors) are repeated thousands of times a day. This tier keeps
+recent results in memory so those lookups never reach the database.
+
+Entries are bounded by count, and optionally by an estimate of their size,
+and expire after a per-method TTL. Results are shared between callers, so
+they must be treated as read-only.
+
+Sizes are estimated without serializing each result: the first result of
+each method is sampled once (the pickled size of a few of its items), and
+later results of that method are costed at that per-item size times their
+length.
+"""
+
+import pickle
+import sys
+import time
+from collections import Counter, OrderedDict
+
+from art_graph.cinema_data_providers.tmdb.client import TMDbClient
+
+# Items of a method's first result pickled to learn its per-item size.
+_SAMPLE_ITEMS = 8
+
+
+def _pickled_size(value) -> int:
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class MemoryCachedTMDbClient:
+    def __init__(
+        self,
+        client: TMDbClient,
+        *,
+        ttl_seconds: dict[str, float],
+        max_entries: int,
+        max_bytes: int | None,
+    ):
+        """ttl_seconds maps each cached method name to its TTL; calls to
+        methods not listed pass straight through. With max_bytes None,
+        entries are bounded by count alone and never sized."""
+        self._client = client
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # (method, args, kwargs) -> (result, estimated size, expires at)
+        self._entries: OrderedDict[tuple, tuple[object, int, float]] = OrderedDict()
+        self.bytes = 0
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+        self.evictions = 0
+        # method -> estimated bytes per result item
+        self._item_bytes: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name not in self.ttl_seconds:
+            return attr
+
+        async def call(*args, **kwargs):
+            return await self._call(name, attr, args, kwargs)
+
+        return call
+
+    async def _call(self, name: str, method, args: tuple, kwargs: dict):
+        key = (name, args, tuple(sorted(kwargs.items())))
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[2] > time.monotonic():
+                self.hits[name] += 1
+                self._entries.move_to_end(key)
+                return entry[0]
+            self._discard(key)
+        self.misses[name] += 1
+        value = await method(*args, **kwargs)
+        self._store(key, value, time.monotonic() + self.ttl_seconds[name])
+        return value
+
+    def _estimate_size(self, name: str, value) -> int:
+        if self.max_bytes is None:
+            return 0
+        if value is None:
+            items = []
+        elif isinstance(value, (list, tuple)):
+            items = value
+        else:
+            items = [value]
+        if name not in self._item_bytes and items:
+            sample = items[:_SAMPLE_ITEMS]
+            self._item_bytes[name] = max(
+                1, sum(_pickled_size(item) for item in sample) // len(sample)
+            )
+        return sys.getsizeof(items) + len(items) * self._item_bytes.get(name, 0)
+
+    def _store(self, key: tuple, value, expires_at: float):
+        size = self._estimate_size(key[0], value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._discard(key)
+        self._entries[key] = (value, size, expires_at)
+        self.bytes += size
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self.bytes > self.max_bytes
+        ):
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def _discard(self, key: tuple):
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
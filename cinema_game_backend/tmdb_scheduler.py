@@ -0,0 +1,211 @@
+"""Shared, priority-aware budget for TMDb requests.
+
+Move validation, puzzle generation and background work (the puzzle pool, the
+cache warm-up) all call TMDb through one client. Without a shared budget a
+burst of puzzle walks can use up TMDb's rate limit and push the validation
+calls a player is waiting on into 429s. ScheduledTMDbClient admits calls
+through a token bucket and a concurrency cap, and when calls have to wait,
+admits them in priority order: interactive, then game creation, then
+background.
+
+The priority of a call comes from the context it runs in (see tmdb_priority),
+so it follows tasks started from that context and needs no extra argument at
+each call site. Calls made outside any tmdb_priority block are interactive.
+
+Calls that fail with a 429 or 5xx response are retried with jittered
+exponential backoff (or after Retry-After, when TMDb sends one).
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import random
+import time
+from collections import Counter
+from contextlib import contextmanager
+from enum import IntEnum
+
+from art_graph.cinema_data_providers.tmdb.client import TMDbClient
+
+# TMDbClient methods that go through the scheduler; anything else passes
+# through.
+SCHEDULED_METHODS = (
+    "search_person",
+    "search_movies",
+    "get_movie_cast",
+    "get_person_movies",
+    "get_person_details",
+    "get_popular_people",
+)
+
+
+class TMDbPriority(IntEnum):
+    """Lower values are admitted first."""
+
+    INTERACTIVE = 0
+    CREATION = 1
+    BACKGROUND = 2
+
+
+_priority: contextvars.ContextVar[TMDbPriority] = contextvars.ContextVar(
+    "tmdb_priority", default=TMDbPriority.INTERACTIVE
+)
+
+
+@contextmanager
+def tmdb_priority(priority: TMDbPriority):
+    """Run the TMDb calls made in this block (and tasks it starts) at priority."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_tmdb_priority() -> TMDbPriority:
+    """The priority TMDb calls made from the current context run at."""
+    return _priority.get()
+
+
+def _status_code(exc: BaseException) -> int | None:
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    return status if status is not None else getattr(exc, "status", None)
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class ScheduledTMDbClient:
+    def __init__(
+        self,
+        client: TMDbClient,
+        *,
+        rate_per_second: float,
+        burst: int,
+        max_concurrency: int,
+        max_retries: int,
+        backoff_seconds: float,
+        max_backoff_seconds: float = 30.0,
+    ):
+        self._client = client
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._active = 0
+        # (priority, arrival order, future) for calls waiting to be admitted
+        self._waiting: list[tuple[int, int, asyncio.Future]] = []
+        self._arrivals = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        # Per priority name: attempts made, and attempts that had to queue.
+        self.requests: Counter[str] = Counter()
+        self.queued: Counter[str] = Counter()
+        self.retries = 0
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name not in SCHEDULED_METHODS:
+            return attr
+
+        async def call(*args, **kwargs):
+            return await self._call(attr, args, kwargs)
+
+        return call
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiting)
+
+    async def _call(self, method, args: tuple, kwargs: dict):
+        priority = _priority.get()
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(priority)
+            try:
+                return await method(*args, **kwargs)
+            except Exception as exc:
+                status = _status_code(exc)
+                retryable = status == 429 or (status is not None and status >= 500)
+                if not retryable or attempt == self.max_retries:
+                    raise
+                delay = _retry_after(exc)
+                if delay is None:
+                    delay = random.uniform(0, self.backoff_seconds * 2**attempt)
+                delay = min(delay, self.max_backoff_seconds)
+                self.retries += 1
+            finally:
+                self._release()
+            await asyncio.sleep(delay)
+
+    async def _acquire(self, priority: TMDbPriority):
+        self.requests[priority.name.lower()] += 1
+        if not self._waiting and self._try_take():
+            return
+        self.queued[priority.name.lower()] += 1
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._arrivals), future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Admitted just as the caller gave up: hand the slot back.
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    def _release(self):
+        self._active -= 1
+        self._dispatch()
+
+    def _try_take(self) -> bool:
+        """Take a concurrency slot and a token if both are free right now."""
+        if self._active >= self.max_concurrency:
+            return False
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._refilled_at) * self.rate_per_second
+        )
+        self._refilled_at = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        self._active += 1
+        return True
+
+    def _dispatch(self):
+        """Admit waiting calls, highest priority first, while budget allows."""
+        while self._waiting:
+            future = self._waiting[0][2]
+            if future.done():  # cancelled while queued
+                heapq.heappop(self._waiting)
+                continue
+            if not self._try_take():
+                break
+            heapq.heappop(self._waiting)
+            future.set_result(None)
+        if (
+            self._waiting
+            and self._timer is None
+            and self._active < self.max_concurrency
+        ):
+            # Out of tokens: look again once the next one has accrued.
+            wait = (1 - self._tokens) / self.rate_per_second
+            self._timer = asyncio.get_running_loop().call_later(wait, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._dispatch()
@@ -0,0 +1,111 @@
+"""Preload the TMDb cache with what the first puzzles after startup need.
+
+Every live puzzle starts from one of TMDb's popular-people pages, then reads
+that actor's filmography and the casts of its films. On a fresh process (and
+an empty memory tier) the first few hundred puzzles would each pay for those
+lookups; warm_tmdb_cache fetches them once up front, in the background, with
+the same arguments the puzzle walk uses so they land on the same cache keys.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from art_graph.cinema_data_providers.tmdb.client import TMDbClient
+
+from .config import (
+    POPULAR_PEOPLE_PAGES,
+    PUZZLE_WALK_MOVIES_PER_ACTOR,
+    TMDB_WARMUP_CONCURRENCY,
+    TMDB_WARMUP_MOVIES_PER_PERSON,
+)
+from .popularity_cache import PopularityCache
+from .tmdb_scheduler import TMDbPriority, tmdb_priority
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmupStats:
+    """What a warm-up run fetched."""
+
+    people: int = 0
+    filmographies: int = 0
+    casts: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+
+
+async def warm_tmdb_cache(
+    tmdb: TMDbClient,
+    *,
+    pages: int = POPULAR_PEOPLE_PAGES,
+    movies_per_person: int = TMDB_WARMUP_MOVIES_PER_PERSON,
+    concurrency: int = TMDB_WARMUP_CONCURRENCY,
+    popularity_cache: PopularityCache | None = None,
+) -> WarmupStats:
+    """Fetch the popular-people pages, their filmographies and top casts.
+
+    Failed lookups are counted and skipped; the warm-up never raises for
+    them, since everything it fetches would otherwise be fetched on demand.
+    """
+    started = time.monotonic()
+    stats = WarmupStats()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(method, *args, **kwargs):
+        async with semaphore:
+            try:
+                with tmdb_priority(TMDbPriority.BACKGROUND):
+                    return await method(*args, **kwargs)
+            except Exception:
+                stats.failed += 1
+                logger.debug("TMDb warm-up lookup failed", exc_info=True)
+                return None
+
+    people = {}
+    for page in await asyncio.gather(
+        *(fetch(tmdb.get_popular_people, page=p) for p in range(1, pages + 1))
+    ):
+        for person in page or []:
+            people.setdefault(person.id, person)
+    if popularity_cache is not None:
+        popularity_cache.record_people(people.values())
+    stats.people = len(people)
+    logger.info("TMDb warm-up: %d popular people from %d pages", len(people), pages)
+
+    filmographies = await asyncio.gather(
+        *(
+            fetch(tmdb.get_person_movies, pid, limit=PUZZLE_WALK_MOVIES_PER_ACTOR)
+            for pid in people
+        )
+    )
+    movie_ids = {}
+    for movies in filmographies:
+        if movies is None:
+            continue
+        stats.filmographies += 1
+        for movie in movies[:movies_per_person]:
+            movie_ids.setdefault(movie.id, None)
+    logger.info(
+        "TMDb warm-up: %d filmographies, fetching %d casts",
+        stats.filmographies,
+        len(movie_ids),
+    )
+
+    casts = await asyncio.gather(
+        *(fetch(tmdb.get_movie_cast, movie_id) for movie_id in movie_ids)
+    )
+    stats.casts = sum(cast is not None for cast in casts)
+    stats.seconds = time.monotonic() - started
+    logger.info(
+        "TMDb warm-up done in %.1fs: %d people, %d filmographies, %d casts, "
+        "%d failed lookups",
+        stats.seconds,
+        stats.people,
+        stats.filmographies,
+        stats.casts,
+        stats.failed,
+    )
+    return stats
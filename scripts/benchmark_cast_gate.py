@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Compare the scalar and batched Levenshtein gates in matching.CastIndex.
+
+Usage:
+  poetry run python scripts/benchmark_cast_gate.py
+  poetry run python scripts/benchmark_cast_gate.py --sizes 20,100,500 --repeat 200
+"""
+
+import argparse
+import random
+import timeit
+
+from cinema_game_backend.matching import CastIndex
+
+_SYLLABLES = ["an", "bel", "cor", "da", "el", "fin", "gar", "ho", "is", "jo", "ka"]
+
+
+def synthetic_cast(size: int, rng: random.Random) -> list[str]:
+    def word():
+        return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(1, 3)))
+
+    return [
+        " ".join(word().title() for _ in range(rng.choice([1, 2, 2, 2, 3])))
+        for _ in range(size)
+    ]
+
+
+def queries_for(cast: list[str], rng: random.Random) -> list[tuple[str, list[str]]]:
+    """A mix of typo'd full names, last-name-only and abbreviated first names."""
+    queries = []
+    for name in rng.sample(cast, min(len(cast), 10)):
+        parts = name.lower().split()
+        queries.append(" ".join(parts)[:-1])
+        queries.append(parts[-1])
+        queries.append(" ".join([parts[0][:2], *parts[1:]]))
+    return [(q, q.split()) for q in queries]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="20,100,500")
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--max-distance", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'cast':>6} {'scalar (us)':>12} {'batched (us)':>13} {'speedup':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        index = CastIndex(synthetic_cast(size, rng))
+        queries = queries_for(index.names, rng)
+
+        for query, parts in queries:
+            scalar = index.gate_scalar(query, parts, args.max_distance)
+            batched = index.gate_batched(query, parts, args.max_distance)
+            assert scalar == batched, (query, scalar, batched)
+
+        def run(gate):
+            for query, parts in queries:
+                gate(query, parts, args.max_distance)
+
+        per_query = 1e6 / (args.repeat * len(queries))
+        scalar_us = timeit.timeit(lambda: run(index.gate_scalar), number=args.repeat)
+        batched_us = timeit.timeit(lambda: run(index.gate_batched), number=args.repeat)
+        scalar_us *= per_query
+        batched_us *= per_query
+        print(
+            f"{size:>6} {scalar_us:>12.1f} {batched_us:>13.1f} "
+            f"{scalar_us / batched_us:>7.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
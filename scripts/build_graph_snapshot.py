@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Build (or refresh) the local actor–movie graph snapshot from TMDb.
+
+Crawls outward from TMDb's popular people through the configured TMDb client,
+so with TMDB_CACHE_PATH set, a rebuild mostly reads the cache.
+
+Usage:
+  poetry run python scripts/build_graph_snapshot.py --out data/graph
+  poetry run python scripts/build_graph_snapshot.py --max-actors 5000
+"""
+
+import argparse
+import asyncio
+import time
+
+from cinema_game_backend.config import GRAPH_SNAPSHOT_PATH, create_tmdb_client
+from cinema_game_backend.graph_snapshot import (
+    GraphSnapshot,
+    crawl_tmdb,
+    write_snapshot,
+)
+
+
+async def build(args) -> None:
+    tmdb = create_tmdb_client()
+    started = time.monotonic()
+    data = await crawl_tmdb(
+        tmdb,
+        seed_pages=args.seed_pages,
+        max_actors=args.max_actors,
+        concurrency=args.concurrency,
+    )
+    write_snapshot(args.out, data)
+    snapshot = GraphSnapshot(args.out)
+    print(
+        f"Wrote {args.out}: {snapshot.n_actors} actors, {snapshot.n_movies} movies "
+        f"in {time.monotonic() - started:.1f}s"
+    )
+    snapshot.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--out",
+        default=GRAPH_SNAPSHOT_PATH,
+        required=GRAPH_SNAPSHOT_PATH is None,
+        help="Snapshot directory (defaults to GRAPH_SNAPSHOT_PATH)",
+    )
+    parser.add_argument("--seed-pages", type=int, default=5)
+    parser.add_argument("--max-actors", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    asyncio.run(build(parser.parse_args()))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Export games from the database as RecordedGame JSON Lines.
+
+Games are streamed from the database, so corpora of any size export in
+constant memory. An output path ending in .gz is gzipped.
+
+Usage:
+  poetry run python scripts/export_recorded_games.py --out corpus.jsonl.gz
+  poetry run python scripts/export_recorded_games.py --out won.jsonl \
+      --status won --difficulty hard --since 2025-01-01 --min-played-moves 3
+"""
+
+import argparse
+import time
+
+from cinema_game_backend.database import init_db
+from cinema_game_backend.experiments.export import export_games, write_jsonl
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", required=True, help="Output .jsonl or .jsonl.gz")
+    parser.add_argument("--status", choices=("in_progress", "won", "lost"))
+    parser.add_argument("--difficulty", choices=("easy", "medium", "hard"))
+    parser.add_argument("--since", help="Earliest created_at, e.g. 2025-01-01")
+    parser.add_argument("--until", help="created_at upper bound (exclusive)")
+    parser.add_argument(
+        "--min-played-moves", type=int, default=None, help="Fewest moves played"
+    )
+    args = parser.parse_args()
+
+    init_db()
+    started = time.monotonic()
+    count = write_jsonl(
+        export_games(
+            status=args.status,
+            difficulty=args.difficulty,
+            since=args.since,
+            until=args.until,
+            min_moves_played=args.min_played_moves,
+        ),
+        args.out,
+    )
+    print(f"Wrote {count} games to {args.out} in {time.monotonic() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())